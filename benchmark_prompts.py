@@ -6,6 +6,7 @@ from service_invocations import invoke_speech_recognition as isr
 from service_invocations import invoke_language_translation as ilt
 from service_invocations import invoke_emotion_detection as ied
 from service_invocations.core import run_context as rc
+from service_invocations.core.batch_jobs import run_batched
 from service_invocations.core.cost_tracker import session_tracker
 from service_invocations.core.oracle_utils import (
     is_fresh_run_requested,
@@ -171,8 +172,13 @@ def _benchmark_speech(edacc_df, service_results):
 
     for prompt in _list_prompts(prompts_root, "oracle", "speech_recognition"):
         print(f"=== [speech] oracle prompt: {prompt} ===")
-        oracle_results = speech_oracle.generate_oracle_transcripts(
-            edacc_df, prompt_name=prompt, results_dir=rc.task_results_dir("speech_recognition"),
+        oracle_results = run_batched(
+            f"speech-oracle-{prompt}",
+            lambda fresh_run: speech_oracle.generate_oracle_transcripts(
+                edacc_df, prompt_name=prompt, results_dir=rc.task_results_dir("speech_recognition"),
+                batch_size=isr.ORACLE_BATCH_SIZE,
+                fresh_run=fresh_run,
+            ),
         )
         if not service_results or oracle_results is None:
             continue
@@ -186,22 +192,34 @@ def _benchmark_speech(edacc_df, service_results):
     if service_results:
         for prompt in _list_prompts(prompts_root, "judge", "speech_recognition"):
             print(f"=== [speech] judge prompt: {prompt} ===")
-            speech_judge.judge_transcripts(
-                service_results, edacc_df, prompt_name=prompt, results_dir=rc.task_results_dir("speech_recognition"),
+            run_batched(
+                f"speech-judge-{prompt}",
+                lambda fresh_run: speech_judge.judge_transcripts(
+                    service_results, edacc_df, prompt_name=prompt, results_dir=rc.task_results_dir("speech_recognition"),
+                    fresh_run=fresh_run,
+                ),
             )
 
         for prompt in _list_prompts(prompts_root, "human-loop", "speech_recognition"):
             print(f"=== [speech] human-loop prompt: {prompt} ===")
-            speech_human_loop.human_loop_transcripts(
-                service_results, edacc_df, prompt_name=prompt, results_dir=rc.task_results_dir("speech_recognition"),
+            run_batched(
+                f"speech-human-loop-{prompt}",
+                lambda fresh_run: speech_human_loop.human_loop_transcripts(
+                    service_results, edacc_df, prompt_name=prompt, results_dir=rc.task_results_dir("speech_recognition"),
+                    fresh_run=fresh_run,
+                ),
             )
 
         for prompt in _list_prompts(prompts_root, "human-loop-no-threshold", "speech_recognition"):
             print(f"=== [speech] human-loop-no-threshold prompt: {prompt} ===")
-            speech_human_loop.human_loop_transcripts(
-                service_results, edacc_df, prompt_name=prompt,
-                paradigm="human-loop-no-threshold",
-                results_dir=rc.task_results_dir("speech_recognition"),
+            run_batched(
+                f"speech-human-loop-no-threshold-{prompt}",
+                lambda fresh_run: speech_human_loop.human_loop_transcripts(
+                    service_results, edacc_df, prompt_name=prompt,
+                    paradigm="human-loop-no-threshold",
+                    results_dir=rc.task_results_dir("speech_recognition"),
+                    fresh_run=fresh_run,
+                ),
             )
 
 
@@ -213,8 +231,13 @@ def _benchmark_language(europarl_df, service_results):
 
     for prompt in _list_prompts(prompts_root, "oracle", "language_translation"):
         print(f"=== [language] oracle prompt: {prompt} ===")
-        oracle_results = language_oracle.generate_oracle_translations(
-            europarl_df, prompt_name=prompt, results_dir=rc.task_results_dir("language_translation"),
+        oracle_results = run_batched(
+            f"language-oracle-{prompt}",
+            lambda fresh_run: language_oracle.generate_oracle_translations(
+                europarl_df, prompt_name=prompt, results_dir=rc.task_results_dir("language_translation"),
+                pack_size=ilt.ORACLE_PACK_SIZE,
+                fresh_run=fresh_run,
+            ),
         )
         if not service_results or oracle_results is None:
             continue
@@ -228,22 +251,34 @@ def _benchmark_language(europarl_df, service_results):
     if service_results:
         for prompt in _list_prompts(prompts_root, "judge", "language_translation"):
             print(f"=== [language] judge prompt: {prompt} ===")
-            language_judge.judge_translations(
-                service_results, europarl_df, prompt_name=prompt, results_dir=rc.task_results_dir("language_translation"),
+            run_batched(
+                f"language-judge-{prompt}",
+                lambda fresh_run: language_judge.judge_translations(
+                    service_results, europarl_df, prompt_name=prompt, results_dir=rc.task_results_dir("language_translation"),
+                    fresh_run=fresh_run,
+                ),
             )
 
         for prompt in _list_prompts(prompts_root, "human-loop", "language_translation"):
             print(f"=== [language] human-loop prompt: {prompt} ===")
-            language_human_loop.human_loop_translations(
-                service_results, europarl_df, prompt_name=prompt, results_dir=rc.task_results_dir("language_translation"),
+            run_batched(
+                f"language-human-loop-{prompt}",
+                lambda fresh_run: language_human_loop.human_loop_translations(
+                    service_results, europarl_df, prompt_name=prompt, results_dir=rc.task_results_dir("language_translation"),
+                    fresh_run=fresh_run,
+                ),
             )
 
         for prompt in _list_prompts(prompts_root, "human-loop-no-threshold", "language_translation"):
             print(f"=== [language] human-loop-no-threshold prompt: {prompt} ===")
-            language_human_loop.human_loop_translations(
-                service_results, europarl_df, prompt_name=prompt,
-                paradigm="human-loop-no-threshold",
-                results_dir=rc.task_results_dir("language_translation"),
+            run_batched(
+                f"language-human-loop-no-threshold-{prompt}",
+                lambda fresh_run: language_human_loop.human_loop_translations(
+                    service_results, europarl_df, prompt_name=prompt,
+                    paradigm="human-loop-no-threshold",
+                    results_dir=rc.task_results_dir("language_translation"),
+                    fresh_run=fresh_run,
+                ),
             )
 
 
@@ -255,8 +290,13 @@ def _benchmark_emotion(affectnet_df, service_results):
 
     for prompt in _list_prompts(prompts_root, "oracle", "emotion_detection"):
         print(f"=== [emotion] oracle prompt: {prompt} ===")
-        oracle_results = emotion_oracle.generate_oracle_emotions(
-            affectnet_df, prompt_name=prompt, results_dir=rc.task_results_dir("emotion_detection"),
+        oracle_results = run_batched(
+            f"emotion-oracle-{prompt}",
+            lambda fresh_run: emotion_oracle.generate_oracle_emotions(
+                affectnet_df, prompt_name=prompt, results_dir=rc.task_results_dir("emotion_detection"),
+                grid_size=ied.ORACLE_GRID_SIZE,
+                fresh_run=fresh_run,
+            ),
         )
         if not service_results or oracle_results is None:
             continue
@@ -271,22 +311,34 @@ def _benchmark_emotion(affectnet_df, service_results):
     if service_results:
         for prompt in _list_prompts(prompts_root, "judge", "emotion_detection"):
             print(f"=== [emotion] judge prompt: {prompt} ===")
-            emotion_judge.judge_emotions(
-                service_results, affectnet_df, prompt_name=prompt, results_dir=rc.task_results_dir("emotion_detection"),
+            run_batched(
+                f"emotion-judge-{prompt}",
+                lambda fresh_run: emotion_judge.judge_emotions(
+                    service_results, affectnet_df, prompt_name=prompt, results_dir=rc.task_results_dir("emotion_detection"),
+                    fresh_run=fresh_run,
+                ),
             )
 
         for prompt in _list_prompts(prompts_root, "human-loop", "emotion_detection"):
             print(f"=== [emotion] human-loop prompt: {prompt} ===")
-            emotion_human_loop.human_loop_emotions(
-                service_results, affectnet_df, prompt_name=prompt, results_dir=rc.task_results_dir("emotion_detection"),
+            run_batched(
+                f"emotion-human-loop-{prompt}",
+                lambda fresh_run: emotion_human_loop.human_loop_emotions(
+                    service_results, affectnet_df, prompt_name=prompt, results_dir=rc.task_results_dir("emotion_detection"),
+                    fresh_run=fresh_run,
+                ),
             )
 
         for prompt in _list_prompts(prompts_root, "human-loop-no-threshold", "emotion_detection"):
             print(f"=== [emotion] human-loop-no-threshold prompt: {prompt} ===")
-            emotion_human_loop.human_loop_emotions(
-                service_results, affectnet_df, prompt_name=prompt,
-                paradigm="human-loop-no-threshold",
-                results_dir=rc.task_results_dir("emotion_detection"),
+            run_batched(
+                f"emotion-human-loop-no-threshold-{prompt}",
+                lambda fresh_run: emotion_human_loop.human_loop_emotions(
+                    service_results, affectnet_df, prompt_name=prompt,
+                    paradigm="human-loop-no-threshold",
+                    results_dir=rc.task_results_dir("emotion_detection"),
+                    fresh_run=fresh_run,
+                ),
             )
 
 
@@ -0,0 +1,156 @@
+"""Adaptive (AIMD) per-model concurrency limits fed by retry signals.
+
+Used by generators of models.yaml entries with ``adaptive_concurrency: true``:
+each success raises the limit by ``1 / limit``, each throttling retry cuts it
+by ``LLM_AIMD_DECREASE``, between 1 and the model's ``max_in_flight``.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict
+
+# A throttling retry multiplies the limit by this. A burst of 429s from one
+# overload counts as one cut: further cuts wait out the interval (or a longer
+# Retry-After).
+_DECREASE_FACTOR = float(os.getenv("LLM_AIMD_DECREASE", "0.5"))
+_CUT_INTERVAL = float(os.getenv("LLM_AIMD_CUT_INTERVAL", "5.0"))
+# Async waiters poll the gate; the gate is shared with worker threads, so an
+# asyncio primitive alone can't guard it.
+_ASYNC_POLL_SECONDS = 0.05
+
+
+class AdaptiveConcurrency:
+    """A counting gate whose capacity follows an AIMD control law."""
+
+    def __init__(self, model_name: str, ceiling: int) -> None:
+        self.model_name = model_name
+        self.ceiling = max(1, int(ceiling))
+        self._limit = max(1.0, self.ceiling / 2.0)
+        self._in_flight = 0
+        self._increases = 0
+        self._decreases = 0
+        self._last_cut = 0.0
+        self._cut_hold = 0.0
+        self._last_adjustment: Dict[str, Any] | None = None
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return max(1, int(self._limit))
+
+    def _try_enter(self) -> bool:
+        if self._in_flight < self.limit:
+            self._in_flight += 1
+            return True
+        return False
+
+    def acquire(self) -> None:
+        with self._cond:
+            while not self._try_enter():
+                self._cond.wait()
+
+    async def aacquire(self) -> None:
+        while True:
+            with self._cond:
+                if self._try_enter():
+                    return
+            await asyncio.sleep(_ASYNC_POLL_SECONDS)
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._cond.notify_all()
+
+    def on_success(self) -> None:
+        with self._cond:
+            before = self.limit
+            self._limit = min(float(self.ceiling), self._limit + 1.0 / self._limit)
+            changed = self.limit != before
+            if changed:
+                self._increases += 1
+                self._note("increase", before)
+            self._cond.notify_all()
+        if changed:
+            self._publish()
+
+    def on_retry(self, exc: BaseException, is_throttle: bool, retry_after: float | None) -> None:
+        """``observe_retries`` callback: cut the limit on throttling signals."""
+        if not is_throttle:
+            return
+        now = time.monotonic()
+        with self._cond:
+            if now - self._last_cut < self._cut_hold:
+                return
+            before = self.limit
+            self._limit = max(1.0, self._limit * _DECREASE_FACTOR)
+            self._last_cut = now
+            self._cut_hold = max(_CUT_INTERVAL, retry_after or 0.0)
+            self._decreases += 1
+            self._note("decrease", before, reason=f"{type(exc).__name__}: {exc}"[:200])
+        self._publish()
+
+    def _note(self, kind: str, before: int, reason: str | None = None) -> None:
+        self._last_adjustment = {
+            "kind": kind,
+            "from": before,
+            "to": self.limit,
+            "at": datetime.now().isoformat(timespec="seconds"),
+        }
+        if reason:
+            self._last_adjustment["reason"] = reason
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "ceiling": self.ceiling,
+                "in_flight": self._in_flight,
+                "increases": self._increases,
+                "decreases": self._decreases,
+                "last_adjustment": self._last_adjustment,
+            }
+
+    def _publish(self) -> None:
+        try:
+            from service_invocations.core import run_context as rc
+
+            rc.record_concurrency(self.model_name, self.snapshot())
+        except Exception:
+            pass
+
+
+_CONTROLLERS: Dict[str, AdaptiveConcurrency] = {}
+_CONTROLLERS_LOCK = threading.Lock()
+
+
+def get_concurrency_controller(model_name: str, ceiling: int) -> AdaptiveConcurrency:
+    """Process-wide controller for ``model_name`` (shared by every paradigm)."""
+    with _CONTROLLERS_LOCK:
+        controller = _CONTROLLERS.get(model_name)
+        if controller is None:
+            controller = AdaptiveConcurrency(model_name, ceiling)
+            _CONTROLLERS[model_name] = controller
+        return controller
+
+
+def reset_concurrency_controllers() -> None:
+    with _CONTROLLERS_LOCK:
+        _CONTROLLERS.clear()
+
+
+def concurrency_snapshots() -> Dict[str, Dict[str, Any]]:
+    with _CONTROLLERS_LOCK:
+        controllers = list(_CONTROLLERS.values())
+    return {c.model_name: c.snapshot() for c in controllers}
+
+
+__all__ = [
+    "AdaptiveConcurrency",
+    "get_concurrency_controller",
+    "reset_concurrency_controllers",
+    "concurrency_snapshots",
+]
@@ -0,0 +1,499 @@
+"""Provider batch jobs for non-interactive benchmark sweeps.
+
+Inside :func:`run_batched`, calls to models with ``batch_mode: true`` are
+written to a job file instead of being sent, submitted at the batch price, and
+answered from the job's results when the slice is replayed.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, IO, Iterator, List, Optional, Tuple, TypeVar
+from urllib import error as url_error
+from urllib import request as url_request
+
+from service_invocations.core import run_context as rc
+from service_invocations.core.credential_pool import env_list
+from service_invocations.core.llm_adapters import (
+    LLMResponse,
+    UnsupportedProviderError,
+    get_llm_adapter,
+)
+from service_invocations.core.oracle_utils import is_fresh_run_requested
+from service_invocations.core.response_cache import get_response_cache
+
+T = TypeVar("T")
+
+# Job polling cadence and deadline, and how many job rounds a slice gets
+# before whatever is left goes to the interactive endpoint.
+_POLL_INTERVAL = float(os.getenv("LLM_BATCH_POLL_INTERVAL", "30"))
+_MAX_WAIT = float(os.getenv("LLM_BATCH_MAX_WAIT", str(24 * 3600)))
+_MAX_ROUNDS = int(os.getenv("LLM_BATCH_MAX_ROUNDS", "3"))
+_HTTP_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "120.0"))
+_HTTP_ENDPOINT = "/v1/chat/completions"
+_UNSAFE_PATH_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+# Terminal job states of both backends; anything else is still in progress.
+_SUCCEEDED = {
+    "completed", "JOB_STATE_SUCCEEDED", "JOB_STATE_PARTIALLY_SUCCEEDED", "BATCH_STATE_SUCCEEDED",
+}
+_FAILED = {
+    "failed", "expired", "cancelled",
+    "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED",
+    "BATCH_STATE_FAILED", "BATCH_STATE_CANCELLED", "BATCH_STATE_EXPIRED",
+}
+
+
+class BatchRequestQueued(Exception):
+    """Raised by a generator whose request went into a batch job file.
+
+    The failover runner treats the sample as queued for a later round: no row,
+    no cost entry and no deferral.
+    """
+
+
+class BatchJobError(RuntimeError):
+    """A batch backend refused a submit, poll or download."""
+
+
+@dataclass(frozen=True)
+class BatchTarget:
+    """Where a batch-mode model's requests go, from its models.yaml entry."""
+
+    model_name: str
+    provider: str
+    model_id: str
+    # Base URL of an OpenAI-compatible batch API; ``None`` uses the
+    # provider's own batch API (Gemini).
+    endpoint: Optional[str] = None
+
+
+def _multipart(boundary: str, fields: Dict[str, str], file_field: str,
+               filename: str, content: bytes) -> bytes:
+    parts: List[bytes] = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'
+            f"{value}\r\n".encode("utf-8")
+        )
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; '
+        f'filename="{filename}"\r\nContent-Type: application/jsonl\r\n\r\n'.encode("utf-8")
+        + content + b"\r\n"
+    )
+    parts.append(f"--{boundary}--\r\n".encode("utf-8"))
+    return b"".join(parts)
+
+
+class HttpBatchBackend:
+    """OpenAI-compatible batch API under ``base_url``.
+
+    ``POST /files`` uploads the job file, ``POST /batches`` starts it,
+    ``GET /batches/{id}`` polls it and ``GET /files/{id}/content`` downloads
+    the output and error files. The key is ``LLM_BATCH_API_KEY`` (falling back
+    to ``MICROSOFT_PHI_KEY``, then the first of ``MICROSOFT_PHI_KEYS``), sent
+    both as a bearer token and as Azure's ``api-key`` header.
+    """
+
+    def __init__(self, base_url: str) -> None:
+        self._base = base_url.rstrip("/")
+        key = (
+            os.getenv("LLM_BATCH_API_KEY")
+            or os.getenv("MICROSOFT_PHI_KEY")
+            or next(iter(env_list("MICROSOFT_PHI_KEYS")), None)
+        )
+        self._auth = {"Authorization": f"Bearer {key}", "api-key": key} if key else {}
+
+    @staticmethod
+    def request_line(custom_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        return {"custom_id": custom_id, "method": "POST", "url": _HTTP_ENDPOINT, "body": body}
+
+    def _request(self, method: str, path: str, body: bytes | None = None,
+                 content_type: str = "application/json") -> bytes:
+        headers = dict(self._auth)
+        if body is not None:
+            headers["Content-Type"] = content_type
+        req = url_request.Request(self._base + path, data=body, method=method, headers=headers)
+        try:
+            with url_request.urlopen(req, timeout=_HTTP_TIMEOUT) as resp:
+                return resp.read()
+        except url_error.HTTPError as exc:
+            detail = exc.read().decode("utf-8", errors="replace")
+            raise BatchJobError(
+                f"{method} {path} failed: HTTP {exc.code} {exc.reason} - {detail}"
+            ) from exc
+        except OSError as exc:
+            raise BatchJobError(f"{method} {path} failed: {exc}") from exc
+
+    def _json(self, method: str, path: str, payload: Dict[str, Any] | None = None) -> Dict[str, Any]:
+        body = None if payload is None else json.dumps(payload).encode("utf-8")
+        return json.loads(self._request(method, path, body))
+
+    def submit(self, path: Path, model_id: str, display_name: str) -> str:
+        boundary = uuid.uuid4().hex
+        uploaded = json.loads(self._request(
+            "POST", "/files",
+            _multipart(boundary, {"purpose": "batch"}, "file", path.name, path.read_bytes()),
+            f"multipart/form-data; boundary={boundary}",
+        ))
+        job = self._json("POST", "/batches", {
+            "input_file_id": uploaded["id"],
+            "endpoint": _HTTP_ENDPOINT,
+            "completion_window": "24h",
+            "metadata": {"display_name": display_name, "model": model_id},
+        })
+        return str(job["id"])
+
+    def state(self, job_id: str) -> str:
+        return str(self._json("GET", f"/batches/{job_id}").get("status"))
+
+    def results(self, job_id: str) -> Iterator[Tuple[str, Dict[str, Any] | None, str | None]]:
+        job = self._json("GET", f"/batches/{job_id}")
+        for file_id in (job.get("output_file_id"), job.get("error_file_id")):
+            if not file_id:
+                continue
+            content = self._request("GET", f"/files/{file_id}/content")
+            for line in content.decode("utf-8").splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                response = record.get("response") or {}
+                body = response.get("body")
+                if record.get("error") or int(response.get("status_code") or 200) >= 400 or not body:
+                    yield str(record.get("custom_id")), None, json.dumps(
+                        record.get("error") or body or "no response"
+                    )
+                else:
+                    yield str(record.get("custom_id")), body, None
+
+
+class GeminiBatchBackend:
+    """Gemini's own batch API, driven through the adapter's google-genai client."""
+
+    def __init__(self, adapter: Any) -> None:
+        self._adapter = adapter
+
+    @staticmethod
+    def request_line(custom_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        return {"key": custom_id, "request": body}
+
+    def submit(self, path: Path, model_id: str, display_name: str) -> str:
+        return self._adapter.submit_batch_job(model_id, path, display_name)
+
+    def state(self, job_id: str) -> str:
+        return self._adapter.batch_job_state(job_id)
+
+    def results(self, job_id: str) -> Iterator[Tuple[str, Dict[str, Any] | None, str | None]]:
+        return self._adapter.batch_job_results(job_id)
+
+
+def _backend_for(target: BatchTarget) -> Any:
+    if target.endpoint:
+        return HttpBatchBackend(target.endpoint)
+    adapter = get_llm_adapter(target.provider)
+    if not hasattr(adapter, "submit_batch_job"):
+        raise UnsupportedProviderError(
+            f"models.yaml entry for '{target.model_name}' sets batch_mode, but provider "
+            f"'{target.provider}' has no batch API; set batch_endpoint."
+        )
+    return GeminiBatchBackend(adapter)
+
+
+@dataclass
+class _Job:
+    """One model's job file for one round, and its provider-side job."""
+
+    target: BatchTarget
+    backend: Any
+    path: Path
+    handle: IO[str]
+    # custom_id -> (request key, ordinal)
+    requests: Dict[str, Tuple[str, int]] = field(default_factory=dict)
+    job_id: Optional[str] = None
+    state: str = "collected"
+    submitted_at: float = 0.0
+
+
+class BatchSession:
+    """Collects one slice's batch-mode requests and serves the job results.
+
+    Ordinals restart every round, so a replayed run claims the same
+    ``(key, ordinal)`` slots the collecting run queued. The response cache's
+    own ordinal counters are rewound the same way.
+    """
+
+    def __init__(self, label: str, job_dir: Path) -> None:
+        self.label = label
+        self._dir = job_dir
+        self._lock = threading.Lock()
+        self._round = 0
+        self._collecting = False
+        self._ordinals: Dict[str, int] = {}
+        self._results: Dict[Tuple[str, int], LLMResponse] = {}
+        self._served: set[Tuple[str, int]] = set()
+        self._jobs: Dict[str, _Job] = {}
+        self._backends: Dict[BatchTarget, Any] = {}
+        # Models whose backend refused a job; later rounds call them live.
+        self._disabled: set[str] = set()
+        self._cache = get_response_cache()
+        self._cache_ordinals: Optional[Dict[str, int]] = None
+
+    def begin_round(self, collecting: bool) -> None:
+        with self._lock:
+            self._round += 1
+            self._collecting = collecting
+            self._ordinals = {}
+            self._jobs = {}
+        if self._cache is not None:
+            self._cache_ordinals = self._cache.ordinals()
+
+    def resolve(
+        self,
+        target: BatchTarget,
+        key: str,
+        prompt: str,
+        inputs: Dict[str, Any],
+        temperature: float,
+        response_schema: Dict[str, Any] | None,
+    ) -> Optional[LLMResponse]:
+        """The job result for this request, if any.
+
+        While collecting, a request without one is written to the model's job
+        file and :class:`BatchRequestQueued` is raised. Otherwise ``None``
+        tells the generator to call the interactive endpoint.
+        """
+        with self._lock:
+            ordinal = self._ordinals.get(key, 0)
+            self._ordinals[key] = ordinal + 1
+            slot = (key, ordinal)
+            response = self._results.get(slot)
+            if response is not None:
+                if slot in self._served:
+                    return replace(response, cached=True)
+                self._served.add(slot)
+                return response
+            if not self._collecting or target.model_name in self._disabled:
+                return None
+            backend = self._backends.get(target)
+        if backend is None:
+            backend = _backend_for(target)
+        body = get_llm_adapter(target.provider).batch_request(
+            target.model_id, prompt, inputs, temperature, response_schema,
+        )
+        custom_id = f"{key}-{ordinal}"
+        line = json.dumps(backend.request_line(custom_id, body), ensure_ascii=False)
+        with self._lock:
+            self._backends.setdefault(target, backend)
+            job = self._jobs.get(target.model_name)
+            if job is None:
+                path = self._dir / f"round{self._round}" / f"{target.model_name}.jsonl"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                job = _Job(target, backend, path, path.open("w", encoding="utf-8"))
+                self._jobs[target.model_name] = job
+            job.handle.write(line + "\n")
+            job.requests[custom_id] = slot
+        raise BatchRequestQueued(
+            f"{target.model_name}: request queued for batch round {self._round}."
+        )
+
+    def end_round(self) -> int:
+        """Close this round's job files; return how many requests they hold."""
+        with self._lock:
+            self._collecting = False
+            for job in self._jobs.values():
+                job.handle.close()
+            queued = sum(len(job.requests) for job in self._jobs.values())
+        if queued and self._cache is not None and self._cache_ordinals is not None:
+            self._cache.restore_ordinals(self._cache_ordinals)
+        return queued
+
+    def close(self) -> None:
+        with self._lock:
+            for job in self._jobs.values():
+                if not job.handle.closed:
+                    job.handle.close()
+
+    def _job_name(self, job: _Job) -> str:
+        return f"{self.label}/round{self._round}/{job.target.model_name}"
+
+    def _record(self, job: _Job, **info: Any) -> None:
+        rc.record_batch_job(self._job_name(job), {
+            "model": job.target.model_name,
+            "job_id": job.job_id,
+            "state": job.state,
+            "requests": len(job.requests),
+            "file": str(job.path),
+            **info,
+        })
+
+    def _submit(self, job: _Job) -> bool:
+        try:
+            job.job_id = job.backend.submit(
+                job.path, job.target.model_id, _UNSAFE_PATH_RE.sub("_", self._job_name(job)),
+            )
+        except Exception as exc:
+            self._disabled.add(job.target.model_name)
+            job.state = "submit_failed"
+            self._record(job, error=str(exc))
+            print(
+                f"[batch] {job.target.model_name}: submitting {len(job.requests)} "
+                f"request(s) failed ({type(exc).__name__}: {exc}). "
+                f"Calling it interactively instead.",
+                file=sys.stderr,
+                flush=True,
+            )
+            return False
+        job.submitted_at = time.monotonic()
+        job.state = "submitted"
+        self._record(job)
+        print(
+            f"[batch] {job.target.model_name}: submitted {len(job.requests)} "
+            f"request(s) as job {job.job_id}.",
+            file=sys.stderr,
+            flush=True,
+        )
+        return True
+
+    def _collect(self, job: _Job) -> None:
+        """Download a finished job's results into the session."""
+        adapter = get_llm_adapter(job.target.provider)
+        latency_ms = (time.monotonic() - job.submitted_at) * 1000.0
+        answered = errors = 0
+        try:
+            for custom_id, body, error in job.backend.results(job.job_id):
+                slot = job.requests.get(custom_id)
+                if slot is None:
+                    continue
+                if body is None:
+                    errors += 1
+                    continue
+                with self._lock:
+                    self._results[slot] = adapter.batch_response(body, latency_ms)
+                answered += 1
+        except Exception as exc:
+            print(
+                f"[batch] {job.target.model_name}: reading results of job "
+                f"{job.job_id} failed ({type(exc).__name__}: {exc}).",
+                file=sys.stderr,
+                flush=True,
+            )
+        self._record(job, answered=answered, errors=errors)
+        print(
+            f"[batch] {job.target.model_name}: job {job.job_id} {job.state} — "
+            f"{answered}/{len(job.requests)} answered"
+            + (f", {errors} error(s)" if errors else "")
+            + f" after {latency_ms / 1000.0:.0f}s.",
+            file=sys.stderr,
+            flush=True,
+        )
+
+    def submit_and_wait(self) -> None:
+        """Submit every job of the round and poll until each one finishes."""
+        pending = [job for job in self._jobs.values() if job.requests and self._submit(job)]
+        deadline = time.monotonic() + _MAX_WAIT
+        while pending:
+            time.sleep(min(_POLL_INTERVAL, max(0.0, deadline - time.monotonic())))
+            for job in list(pending):
+                try:
+                    state = job.backend.state(job.job_id)
+                except Exception as exc:
+                    print(
+                        f"[batch] {job.target.model_name}: polling job {job.job_id} "
+                        f"failed ({type(exc).__name__}: {exc}). Retrying next poll.",
+                        file=sys.stderr,
+                        flush=True,
+                    )
+                    continue
+                if state != job.state:
+                    job.state = state
+                    self._record(job)
+                if state in _SUCCEEDED or state in _FAILED:
+                    # Failed and expired jobs may still hold partial output.
+                    self._collect(job)
+                    pending.remove(job)
+            if pending and time.monotonic() >= deadline:
+                for job in pending:
+                    print(
+                        f"[batch] {job.target.model_name}: job {job.job_id} still "
+                        f"'{job.state}' after {_MAX_WAIT:.0f}s; its requests will "
+                        f"be retried.",
+                        file=sys.stderr,
+                        flush=True,
+                    )
+                break
+
+
+_ACTIVE: Optional[BatchSession] = None
+_ACTIVE_LOCK = threading.Lock()
+
+
+def active_batch_session() -> Optional[BatchSession]:
+    """The session collecting or replaying the current slice, if any."""
+    return _ACTIVE
+
+
+def _job_dir(label: str) -> Path:
+    root = rc.active_run_dir() or rc.results_root()
+    return root / "batch_jobs" / _UNSAFE_PATH_RE.sub("_", label)
+
+
+def run_batched(label: str, run: Callable[[Optional[bool]], T]) -> T:
+    """Run one paradigm slice through provider batch jobs; return its result.
+
+    ``run(fresh_run)`` is the slice itself (e.g. a ``generate_oracle_*``
+    call, passing ``fresh_run`` on) and must resume from the rows it has
+    already written, as every paradigm does unless a fresh run is requested.
+    The first round gets the run's fresh-run setting (``LLM_FRESH_RUN``); the
+    replay rounds get ``False`` so they keep what the earlier rounds wrote.
+    Without any ``batch_mode`` model nothing is queued and ``run`` executes
+    once.
+    """
+    global _ACTIVE
+    with _ACTIVE_LOCK:
+        nested = _ACTIVE is not None
+        if not nested:
+            session = BatchSession(label, _job_dir(label))
+            _ACTIVE = session
+    if nested:
+        return run(None)
+    fresh_run = is_fresh_run_requested()
+    try:
+        for _ in range(_MAX_ROUNDS):
+            session.begin_round(collecting=True)
+            result = run(fresh_run)
+            queued = session.end_round()
+            if not queued:
+                return result
+            fresh_run = False
+            session.submit_and_wait()
+        session.begin_round(collecting=False)
+        print(
+            f"[batch] {label}: {_MAX_ROUNDS} batch round(s) done; "
+            f"sending what is left interactively.",
+            file=sys.stderr,
+            flush=True,
+        )
+        return run(False)
+    finally:
+        session.close()
+        with _ACTIVE_LOCK:
+            _ACTIVE = None
+
+
+__all__ = [
+    "BatchJobError",
+    "BatchRequestQueued",
+    "BatchSession",
+    "BatchTarget",
+    "GeminiBatchBackend",
+    "HttpBatchBackend",
+    "active_batch_session",
+    "run_batched",
+]
@@ -0,0 +1,243 @@
+"""Local stand-in for an OpenAI-compatible batch API (see ``core.batch_jobs``).
+
+Run ``python -m service_invocations.core.batch_standin [port] [validate_delay]
+[run_delay]``, or use :class:`StandInBatchServer` as a context manager.
+"""
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+Responder = Callable[[Dict[str, Any]], str]
+
+
+def _empty_answer(body: Dict[str, Any]) -> str:
+    return "{}"
+
+
+def _tokens(value: Any) -> int:
+    return max(1, len(json.dumps(value, ensure_ascii=False)) // 4)
+
+
+def _wrap(body: Dict[str, Any], text: str) -> Dict[str, Any]:
+    """``text`` as the response shape the request body expects."""
+    prompt_tokens, output_tokens = _tokens(body), _tokens(text)
+    if "contents" in body:
+        return {
+            "candidates": [{
+                "content": {"role": "model", "parts": [{"text": text}]},
+                "finishReason": "STOP",
+            }],
+            "usageMetadata": {
+                "promptTokenCount": prompt_tokens,
+                "candidatesTokenCount": output_tokens,
+                "totalTokenCount": prompt_tokens + output_tokens,
+            },
+        }
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": text},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": output_tokens,
+            "total_tokens": prompt_tokens + output_tokens,
+        },
+    }
+
+
+def _parse_multipart(content_type: str, data: bytes) -> Dict[str, bytes]:
+    boundary = content_type.split("boundary=", 1)[1].strip().strip('"').encode("utf-8")
+    fields: Dict[str, bytes] = {}
+    for part in data.split(b"--" + boundary):
+        head, sep, value = part.partition(b"\r\n\r\n")
+        if not sep or b'name="' not in head:
+            continue
+        name = head.split(b'name="', 1)[1].split(b'"', 1)[0].decode("utf-8")
+        fields[name] = value[:-2] if value.endswith(b"\r\n") else value
+    return fields
+
+
+class StandInBatchServer:
+    """Threaded HTTP server simulating ``/files`` + ``/batches``.
+
+    ``jobs`` and ``files`` are kept in memory; every path is matched on its
+    suffix, so any base path (``/v1``, ``/openai``...) works.
+    """
+
+    def __init__(
+        self,
+        responder: Optional[Responder] = None,
+        *,
+        validate_delay: float = 1.0,
+        run_delay: float = 2.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.responder = responder or _empty_answer
+        self.validate_delay = validate_delay
+        self.run_delay = run_delay
+        self.files: Dict[str, bytes] = {}
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "StandInBatchServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="batch-standin", daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StandInBatchServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _store(self, content: bytes) -> str:
+        file_id = f"file-{uuid.uuid4().hex[:12]}"
+        self.files[file_id] = content
+        return file_id
+
+    def _run(self, job: Dict[str, Any]) -> None:
+        """Answer every line of the job's input file and finish it."""
+        outputs: List[str] = []
+        errors: List[str] = []
+        for line in self.files[job["input_file_id"]].decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            try:
+                text = self.responder(request["body"])
+            except Exception as exc:
+                errors.append(json.dumps({
+                    "custom_id": request["custom_id"],
+                    "response": None,
+                    "error": {"code": "responder_error", "message": str(exc)},
+                }))
+                continue
+            outputs.append(json.dumps({
+                "custom_id": request["custom_id"],
+                "response": {"status_code": 200, "body": _wrap(request["body"], text)},
+                "error": None,
+            }))
+        job["output_file_id"] = self._store(("\n".join(outputs) + "\n").encode("utf-8"))
+        if errors:
+            job["error_file_id"] = self._store(("\n".join(errors) + "\n").encode("utf-8"))
+        job["request_counts"] = {
+            "total": len(outputs) + len(errors),
+            "completed": len(outputs),
+            "failed": len(errors),
+        }
+
+    def _advance(self, job: Dict[str, Any]) -> None:
+        """Move ``job`` along its lifecycle by wall-clock time since creation."""
+        elapsed = time.time() - job["created_at"]
+        if job["status"] == "validating" and elapsed >= self.validate_delay:
+            job["status"] = "in_progress"
+            job["in_progress_at"] = int(time.time())
+        if job["status"] == "in_progress" and elapsed >= self.validate_delay + self.run_delay:
+            self._run(job)
+            job["status"] = "completed"
+            job["completed_at"] = int(time.time())
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _reply(self, status: int, payload: Any, raw: bool = False) -> None:
+                data = payload if raw else json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header(
+                    "Content-Type", "application/octet-stream" if raw else "application/json",
+                )
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _body(self) -> bytes:
+                return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+            def do_POST(self) -> None:
+                path = self.path.rstrip("/")
+                with server._lock:
+                    if path.endswith("/files"):
+                        fields = _parse_multipart(self.headers["Content-Type"], self._body())
+                        if "file" not in fields:
+                            return self._reply(400, {"error": {"message": "missing file"}})
+                        file_id = server._store(fields["file"])
+                        return self._reply(200, {"id": file_id, "object": "file", "purpose": "batch"})
+                    if path.endswith("/batches"):
+                        request = json.loads(self._body() or b"{}")
+                        if request.get("input_file_id") not in server.files:
+                            return self._reply(404, {"error": {"message": "unknown input_file_id"}})
+                        job = {
+                            "id": f"batch_{uuid.uuid4().hex[:12]}",
+                            "object": "batch",
+                            "endpoint": request.get("endpoint"),
+                            "input_file_id": request["input_file_id"],
+                            "completion_window": request.get("completion_window", "24h"),
+                            "metadata": request.get("metadata") or {},
+                            "status": "validating",
+                            "created_at": time.time(),
+                            "output_file_id": None,
+                            "error_file_id": None,
+                        }
+                        server.jobs[job["id"]] = job
+                        return self._reply(200, job)
+                self._reply(404, {"error": {"message": f"no route for POST {self.path}"}})
+
+            def do_GET(self) -> None:
+                parts = self.path.rstrip("/").split("/")
+                with server._lock:
+                    if len(parts) >= 2 and parts[-2] == "batches":
+                        job = server.jobs.get(parts[-1])
+                        if job is None:
+                            return self._reply(404, {"error": {"message": "unknown batch"}})
+                        server._advance(job)
+                        return self._reply(200, job)
+                    if len(parts) >= 3 and parts[-1] == "content" and parts[-3] == "files":
+                        content = server.files.get(parts[-2])
+                        if content is None:
+                            return self._reply(404, {"error": {"message": "unknown file"}})
+                        return self._reply(200, content, raw=True)
+                self._reply(404, {"error": {"message": f"no route for GET {self.path}"}})
+
+        return Handler
+
+
+if __name__ == "__main__":
+    cli_args = sys.argv[1:]
+    standin = StandInBatchServer(
+        port=int(cli_args[0]) if cli_args else 8089,
+        validate_delay=float(cli_args[1]) if len(cli_args) > 1 else 1.0,
+        run_delay=float(cli_args[2]) if len(cli_args) > 2 else 2.0,
+    )
+    print(f"Stand-in batch API at {standin.url} (Ctrl+C to stop)")
+    try:
+        standin._server.serve_forever()
+    except KeyboardInterrupt:
+        standin.stop()
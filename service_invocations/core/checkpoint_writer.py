@@ -0,0 +1,167 @@
+"""Write-behind thread for the failover runner's mid-pass checkpoints.
+
+Pending checkpoints are coalesced per slice and model and written on a row/time
+cadence; :meth:`CheckpointWriter.flush` writes a key's pending rows inline.
+"""
+from __future__ import annotations
+
+import atexit
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from service_invocations.core import run_context as rc
+
+# A pending checkpoint is written once it holds this many rows or has waited
+# this long, whichever comes first.
+_FLUSH_ROWS = int(os.getenv("LLM_CHECKPOINT_FLUSH_ROWS", "50"))
+_FLUSH_SECONDS = float(os.getenv("LLM_CHECKPOINT_FLUSH_SECONDS", "2.0"))
+_PUBLISH_SECONDS = 5.0
+
+
+def write_behind_enabled() -> bool:
+    return os.getenv("LLM_CHECKPOINT_WRITE_BEHIND", "1").strip().lower() not in {
+        "0", "false", "no", "off",
+    }
+
+
+@dataclass
+class _Pending:
+    write: Callable[[List[Any]], None]
+    rows: List[Any]
+    since: float
+
+
+class CheckpointWriter:
+    """One daemon thread writing coalesced checkpoints per key."""
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._pending: Dict[Hashable, _Pending] = {}
+        self._running: set[Hashable] = set()
+        self._thread: Optional[threading.Thread] = None
+        self._writes = 0
+        self._coalesced = 0
+        self._latency_total_ms = 0.0
+        self._latency_max_ms = 0.0
+        self._max_depth = 0
+        self._published = 0.0
+
+    def submit(
+        self, key: Hashable, rows: List[Any], write: Callable[[List[Any]], None]
+    ) -> None:
+        """Queue ``rows`` for ``key``; ``write(rows)`` later gets every row
+        queued for it since its last write, in submission order."""
+        with self._cond:
+            previous = self._pending.get(key)
+            if previous is not None:
+                self._coalesced += 1
+                previous.rows.extend(rows)
+                previous.write = write
+            else:
+                self._pending[key] = _Pending(write, list(rows), time.monotonic())
+            self._max_depth = max(self._max_depth, len(self._pending))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._loop, name="checkpoint-writer", daemon=True,
+                )
+                self._thread.start()
+            self._cond.notify_all()
+
+    def _due(self, now: float) -> Optional[Hashable]:
+        """A pending key whose cadence says write now, if any."""
+        for key, pending in self._pending.items():
+            if key in self._running:
+                continue
+            if len(pending.rows) >= _FLUSH_ROWS or now - pending.since >= _FLUSH_SECONDS:
+                return key
+        return None
+
+    def _next_deadline(self, now: float) -> float:
+        waits = [
+            _FLUSH_SECONDS - (now - p.since)
+            for key, p in self._pending.items() if key not in self._running
+        ]
+        return max(0.05, min(waits)) if waits else _FLUSH_SECONDS
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                key = self._due(time.monotonic())
+                while key is None:
+                    self._cond.wait(self._next_deadline(time.monotonic()))
+                    key = self._due(time.monotonic())
+                pending = self._pending.pop(key)
+                self._running.add(key)
+            self._run(key, pending)
+
+    def _run(self, key: Hashable, pending: _Pending) -> None:
+        """Write ``pending`` (caller marked ``key`` running) and record it."""
+        start = time.perf_counter()
+        try:
+            pending.write(pending.rows)
+        except Exception as exc:
+            print(
+                f"[checkpoint-writer] checkpoint for {key!r} raised "
+                f"{type(exc).__name__}: {exc}. Continuing.",
+                file=sys.stderr,
+                flush=True,
+            )
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        with self._cond:
+            self._running.discard(key)
+            self._writes += 1
+            self._latency_total_ms += elapsed_ms
+            self._latency_max_ms = max(self._latency_max_ms, elapsed_ms)
+            publish = time.monotonic() - self._published >= _PUBLISH_SECONDS
+            if publish:
+                self._published = time.monotonic()
+            self._cond.notify_all()
+        if publish:
+            rc.record_checkpoint_writer(self.snapshot())
+
+    def flush(self, key: Hashable) -> None:
+        """Write ``key``'s pending checkpoint now, on this thread, in order."""
+        with self._cond:
+            while key in self._running:
+                self._cond.wait()
+            pending = self._pending.pop(key, None)
+            if pending is None:
+                return
+            self._running.add(key)
+        self._run(key, pending)
+
+    def drain(self) -> None:
+        """Write every pending checkpoint now (and wait for running ones)."""
+        with self._cond:
+            keys = list(self._pending) + list(self._running)
+        for key in keys:
+            self.flush(key)
+        rc.record_checkpoint_writer(self.snapshot())
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "queue_depth": len(self._pending),
+                "max_queue_depth": self._max_depth,
+                "writes": self._writes,
+                "coalesced": self._coalesced,
+                "mean_write_ms": round(self._latency_total_ms / self._writes, 2)
+                if self._writes else None,
+                "max_write_ms": round(self._latency_max_ms, 2),
+            }
+
+
+_WRITER = CheckpointWriter()
+atexit.register(_WRITER.drain)
+
+
+def checkpoint_writer() -> CheckpointWriter:
+    """The process-wide writer."""
+    return _WRITER
+
+
+__all__ = ["CheckpointWriter", "checkpoint_writer", "write_behind_enabled"]
@@ -0,0 +1,143 @@
+"""Process-wide per-model circuit breakers shared by every paradigm.
+
+A ``ModelUnavailableError`` opens a model's breaker, for the rest of the run if
+fatal, else for its failover cooldown; a single probe then decides whether it
+closes. Breakers are keyed by the active run folder as well as the model.
+"""
+from __future__ import annotations
+
+import math
+import sys
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from service_invocations.core import run_context as rc
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Closed / open / half-open state machine for one model."""
+
+    def __init__(self, model_name: str) -> None:
+        self.model_name = model_name
+        self._state = CLOSED
+        self._open_until = 0.0
+        self._fatal = False
+        self._probing = False
+        self._reason: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    @property
+    def fatal(self) -> bool:
+        with self._lock:
+            return self._fatal
+
+    @property
+    def reason(self) -> Optional[str]:
+        with self._lock:
+            return self._reason
+
+    def retry_in(self) -> float:
+        """Seconds until the breaker admits a probe (``inf`` once fatal)."""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self._open_until - time.monotonic())
+
+    def allow(self) -> bool:
+        """May the caller send work now?
+
+        When an open breaker's cooldown has elapsed it moves to half-open and
+        the *first* caller is admitted as the probe; everyone else is refused
+        until that probe reports back through :meth:`record_success` or
+        :meth:`trip` (or hands the slot back with :meth:`release_probe`).
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                if time.monotonic() < self._open_until:
+                    return False
+                self._state = HALF_OPEN
+                self._probing = False
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state == CLOSED:
+                return
+            self._state = CLOSED
+            self._probing = False
+            self._reason = None
+        print(
+            f"[circuit] '{self.model_name}' probe succeeded; circuit closed.",
+            file=sys.stderr,
+            flush=True,
+        )
+
+    def release_probe(self) -> None:
+        """Hand back the half-open probe without a result (nothing was sent)."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probing = False
+
+    def trip(self, exc: BaseException, cooldown: float) -> None:
+        """Open the breaker after a ``ModelUnavailableError``."""
+        fatal = bool(getattr(exc, "fatal", False))
+        with self._lock:
+            if self._fatal:
+                return
+            self._state = OPEN
+            self._probing = False
+            self._fatal = fatal
+            self._open_until = math.inf if fatal else time.monotonic() + max(0.0, cooldown)
+            self._reason = f"{type(exc).__name__}: {exc}"[:300]
+        window = "for the rest of the run" if fatal else f"for {cooldown:.0f}s"
+        print(
+            f"[circuit] '{self.model_name}' circuit opened {window}.",
+            file=sys.stderr,
+            flush=True,
+        )
+
+
+_BREAKERS: Dict[Tuple[str, str], CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def get_circuit_breaker(model_name: str) -> CircuitBreaker:
+    """The breaker for ``model_name`` in the active run (shared by paradigms)."""
+    run_dir = rc.active_run_dir()
+    key = (str(run_dir) if run_dir is not None else "", model_name)
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(model_name)
+            _BREAKERS[key] = breaker
+        return breaker
+
+
+def reset_circuit_breakers() -> None:
+    with _BREAKERS_LOCK:
+        _BREAKERS.clear()
+
+
+__all__ = [
+    "CLOSED",
+    "OPEN",
+    "HALF_OPEN",
+    "CircuitBreaker",
+    "get_circuit_breaker",
+    "reset_circuit_breakers",
+]
@@ -7,11 +7,11 @@ recorded as NaN so the row can still be joined back to the labelling result.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
 from pathlib import Path
 from threading import Lock
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Sequence
 
 import pandas as pd
 import yaml
@@ -20,6 +20,8 @@ from service_invocations.core import run_context as rc
 
 
 _PRICING_CACHE: Dict[Path, Dict[str, Dict[str, float]]] = {}
+# Gemini and OpenAI-compatible batch APIs both bill at half the list price.
+_DEFAULT_BATCH_PRICE_FACTOR = 0.5
 _LOCK = Lock()
 
 
@@ -53,6 +55,9 @@ def _load_pricing(models_path: Path) -> Dict[str, Dict[str, float]]:
             "audio_input_per_million_usd": float(
                 audio_price if audio_price is not None else (input_price or 0.0)
             ),
+            "batch_price_factor": float(
+                entry.get("batch_price_factor", _DEFAULT_BATCH_PRICE_FACTOR)
+            ),
         }
     _PRICING_CACHE[resolved] = pricing
     return pricing
@@ -64,6 +69,7 @@ def compute_cost(
     output_tokens: int | None,
     models_path: Path | None = None,
     audio_input_tokens: int | None = None,
+    batched: bool = False,
 ) -> float | None:
     """Return the USD cost for a single LLM call, or None if pricing/tokens missing.
 
@@ -71,6 +77,9 @@ def compute_cost(
     ``audio_input_tokens``, when provided, is the audio subset of those prompt
     tokens; it is billed at ``audio_input_per_million_usd`` while the remaining
     (text) prompt tokens are billed at ``input_per_million_usd``.
+
+    ``batched`` calls (answered by a provider batch job) are scaled by the
+    model's ``batch_price_factor`` (default 0.5).
     """
     if models_path is None:
         models_path = rc.config_path("models.yaml")
@@ -88,9 +97,66 @@ def compute_cost(
         + audio_tokens * pricing["audio_input_per_million_usd"] / 1_000_000.0
         + out_tokens * pricing["output_per_million_usd"] / 1_000_000.0
     )
+    if batched:
+        cost *= pricing["batch_price_factor"]
     return round(cost, 6)
 
 
+def _apportion(total: int | None, weights: Sequence[float]) -> List[int | None]:
+    """Split an integer count by ``weights`` so the shares sum to ``total``."""
+    if total is None:
+        return [None] * len(weights)
+    weight_sum = float(sum(weights))
+    if weight_sum <= 0:
+        weights, weight_sum = [1.0] * len(weights), float(len(weights))
+    raw = [total * w / weight_sum for w in weights]
+    shares = [int(x) for x in raw]
+    # Largest remainders get the leftover units.
+    by_remainder = sorted(range(len(raw)), key=lambda i: raw[i] - shares[i], reverse=True)
+    for i in by_remainder[: total - sum(shares)]:
+        shares[i] += 1
+    return shares
+
+
+def split_response(
+    response: Any,
+    weights: Sequence[float],
+    *,
+    audio_weights: Sequence[float] | None = None,
+) -> List[Any]:
+    """Divide one billed response into per-sample shares for cost attribution.
+
+    Used when several samples were packed into one request: each share is a
+    copy of ``response`` carrying its slice of the token counts, so feeding the
+    shares to the samples' attempt recorders writes one cost.csv row per sample
+    that together add up to the real call. Input and output tokens are split by
+    ``weights``; audio input tokens by ``audio_weights`` when given (e.g. clip
+    durations), else by ``weights``. Latency is the whole call's for every
+    share, and any losing hedges stay on the first share so they are billed
+    once.
+    """
+    input_total = getattr(response, "input_tokens", None)
+    audio_total = getattr(response, "audio_input_tokens", None)
+    outputs = _apportion(getattr(response, "output_tokens", None), weights)
+    audio = _apportion(audio_total, audio_weights if audio_weights is not None else weights)
+    if input_total is None:
+        inputs: List[int | None] = [None] * len(weights)
+    else:
+        # The text and audio parts of the prompt follow their own weights.
+        text = _apportion(max(0, input_total - (audio_total or 0)), weights)
+        inputs = [t + (a or 0) for t, a in zip(text, audio)]
+    shares = []
+    for idx in range(len(weights)):
+        shares.append(replace(
+            response,
+            input_tokens=inputs[idx],
+            output_tokens=outputs[idx],
+            audio_input_tokens=audio[idx],
+            hedges=getattr(response, "hedges", ()) if idx == 0 else (),
+        ))
+    return shares
+
+
 def make_attempt_recorder(
     tracker: "CostTracker",
     *,
@@ -114,12 +180,12 @@ def make_attempt_recorder(
     per-sample labelling row so it reconciles with cost.csv.
     """
     costs: List[float] = []
+    attempts = [0]
 
     def _response_of(result: Any) -> Any:
         return result[0] if isinstance(result, (tuple, list)) else result
 
-    def on_attempt(result: Any, ok: bool) -> None:
-        resp = _response_of(result)
+    def _record(resp: Any, status: str, attempt: int) -> None:
         audio_in = getattr(resp, "audio_input_tokens", None)
         cost = compute_cost(
             model,
@@ -127,11 +193,8 @@ def make_attempt_recorder(
             getattr(resp, "output_tokens", None),
             models_path,
             audio_input_tokens=audio_in,
+            batched=bool(getattr(resp, "batched", False)),
         )
-        try:
-            status = "success" if usable(result) else "failed"
-        except Exception:
-            status = "failed"
         tracker.record(
             task=task,
             paradigm=paradigm,
@@ -143,10 +206,34 @@ def make_attempt_recorder(
             status=status,
             latency_ms=getattr(resp, "latency_ms", None),
             audio_input_tokens=audio_in,
+            cached=bool(getattr(resp, "cached", False)),
+            attempt=attempt,
         )
-        if cost is not None:
+        # A cache replay carries the original call's cost for reconciliation
+        # but was not billed again, so it stays out of the sample total.
+        if cost is not None and not getattr(resp, "cached", False):
             costs.append(cost)
 
+    def on_attempt(result: Any, ok: bool) -> None:
+        attempts[0] += 1
+        attempt = attempts[0]
+        resp = _response_of(result)
+        try:
+            status = "success" if usable(result) else "failed"
+        except Exception:
+            status = "failed"
+        _record(resp, status, attempt)
+        # Losing duplicates of a hedged call were billed too; record them now
+        # so they are part of this sample's total as well as cost.csv.
+        hedges = getattr(resp, "hedges", ()) or ()
+        if hedges:
+            from service_invocations.core.hedging import hedge_bill
+
+            for future in hedges:
+                loser = hedge_bill(future, resp)
+                if loser is not None:
+                    _record(loser, "hedged", attempt)
+
     def total_cost() -> float | None:
         return round(sum(costs), 6) if costs else None
 
@@ -169,12 +256,21 @@ class CostEntry:
     # "success"  -> the call produced a usable label for the paradigm
     # "failed"   -> the LLM responded (and was billed) but the output was
     #               unusable (null transcript / no winner / all scores -1).
+    # "hedged"   -> a duplicate request that lost a hedged race (see
+    #               core.hedging); billed, but its output was not used.
     # Note: calls that never returned a response (e.g. Gemini 503 /
     # ModelUnavailableError) are not recorded at all, so they never appear here.
     status: str = "success"
     # Subset of ``input_tokens`` attributed to audio parts of the prompt, when
     # the provider reports it. None for providers that don't break this out.
     audio_input_tokens: int | None = None
+    # True when the response was replayed from the LLM response cache. Token
+    # counts and cost_usd are the original call's, so replayed sweeps reconcile
+    # with the run they replay, but nothing was billed this time.
+    cached: bool = False
+    # 1-based attempt number within the sample's retry_until_valid loop, so
+    # invalid-output retries per model can be read straight off the ledger.
+    attempt: int | None = None
 
 
 @dataclass
@@ -193,6 +289,8 @@ class CostTracker:
         status: str = "success",
         latency_ms: float | None = None,
         audio_input_tokens: int | None = None,
+        cached: bool = False,
+        attempt: int | None = None,
     ) -> None:
         with _LOCK:
             self.entries.append(
@@ -208,6 +306,8 @@ class CostTracker:
                     latency_ms=latency_ms,
                     status=status,
                     audio_input_tokens=audio_input_tokens,
+                    cached=cached,
+                    attempt=attempt,
                 )
             )
 
@@ -217,19 +317,27 @@ class CostTracker:
                 columns=[
                     "timestamp", "task", "paradigm", "model", "sample_id",
                     "input_tokens", "output_tokens", "cost_usd", "latency_ms",
-                    "status", "audio_input_tokens",
+                    "status", "audio_input_tokens", "cached", "attempt",
                 ]
             )
         return pd.DataFrame([e.__dict__ for e in self.entries])
 
     def total_usd(self) -> float:
-        """USD across every billed call (both successful and failed outputs)."""
-        return float(sum((e.cost_usd or 0.0) for e in self.entries))
+        """USD across every billed call (both successful and failed outputs).
+
+        Cache replays are excluded: they carry the original call's cost for
+        reconciliation but were not billed again.
+        """
+        return float(sum((e.cost_usd or 0.0) for e in self.entries if not e.cached))
 
     def successful_usd(self) -> float:
         """USD spent only on calls that produced a usable label."""
         return float(
-            sum((e.cost_usd or 0.0) for e in self.entries if e.status == "success")
+            sum(
+                (e.cost_usd or 0.0)
+                for e in self.entries
+                if e.status == "success" and not e.cached
+            )
         )
 
     def summary(self) -> pd.DataFrame:
@@ -240,6 +348,8 @@ class CostTracker:
             df = df.assign(status="success")
         if "audio_input_tokens" not in df.columns:
             df = df.assign(audio_input_tokens=pd.NA)
+        if "attempt" not in df.columns:
+            df = df.assign(attempt=pd.NA)
         grouped = (
             df.groupby(["task", "paradigm", "model", "status"], dropna=False)
             .agg(
@@ -249,6 +359,8 @@ class CostTracker:
                 output_tokens=("output_tokens", "sum"),
                 cost_usd=("cost_usd", "sum"),
                 avg_latency_ms=("latency_ms", "mean"),
+                # Calls beyond a sample's first attempt (invalid-output retries).
+                retries=("attempt", lambda a: int((pd.to_numeric(a, errors="coerce") > 1).sum())),
             )
             .reset_index()
         )
@@ -335,6 +447,8 @@ class CostTracker:
                         latency_ms=_opt_float(row.get("latency_ms")) if "latency_ms" in cols else None,
                         status=status,
                         audio_input_tokens=_opt_int(row.get("audio_input_tokens")) if "audio_input_tokens" in cols else None,
+                        cached="cached" in cols and str(row["cached"]).strip().lower() == "true",
+                        attempt=_opt_int(row.get("attempt")) if "attempt" in cols else None,
                     )
                 )
         return int(len(df))
@@ -355,6 +469,7 @@ def reset_session() -> None:
 __all__ = [
     "compute_cost",
     "make_attempt_recorder",
+    "split_response",
     "CostTracker",
     "CostEntry",
     "session_tracker",
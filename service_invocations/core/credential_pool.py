@@ -0,0 +1,243 @@
+"""Pools of API keys / endpoints per provider, to spread a run over quotas.
+
+Each attempt goes to the least-loaded (or next round-robin) member; a throttled
+member is quarantined, a fatal one disabled, and the attempt moves on to the
+next. Member labels never contain a full secret.
+"""
+from __future__ import annotations
+
+import itertools
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from service_invocations.core import run_context as rc
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+LEAST_LOADED = "least_loaded"
+ROUND_ROBIN = "round_robin"
+_STRATEGIES = {LEAST_LOADED, ROUND_ROBIN}
+
+# Bench time for a throttled member when the provider suggests none, and how
+# often (in calls) the stats go to run_status.json.
+_QUARANTINE_SECONDS = float(os.getenv("LLM_KEY_QUARANTINE_SECONDS", "60"))
+_PUBLISH_EVERY = int(os.getenv("LLM_KEY_POOL_PUBLISH_EVERY", "25"))
+
+# What ``classify(exc)`` reports for a failed call.
+THROTTLED = "throttled"
+FATAL = "fatal"
+FAILED = "failed"
+
+
+def pool_strategy() -> str:
+    strategy = os.getenv("LLM_KEY_POOL_STRATEGY", LEAST_LOADED).strip().lower() or LEAST_LOADED
+    if strategy not in _STRATEGIES:
+        raise ValueError(
+            f"LLM_KEY_POOL_STRATEGY must be one of {sorted(_STRATEGIES)}, got '{strategy}'."
+        )
+    return strategy
+
+
+def env_list(name: str) -> List[str]:
+    """Comma/whitespace-separated values of env var ``name`` (empty if unset)."""
+    raw = os.getenv(name) or ""
+    return [item for item in raw.replace(",", " ").split() if item]
+
+
+def mask_secret(secret: str) -> str:
+    return f"…{secret[-4:]}" if len(secret) > 8 else "…"
+
+
+@dataclass
+class _Member(Generic[T]):
+    label: str
+    value: T
+    in_flight: int = 0
+    requests: int = 0
+    successes: int = 0
+    throttled: int = 0
+    errors: int = 0
+    quarantined_until: float = 0.0
+    fatal: bool = False
+    last_acquired: float = 0.0
+
+    def available(self, now: float) -> bool:
+        return not self.fatal and now >= self.quarantined_until
+
+
+class CredentialPool(Generic[T]):
+    """Thread-safe pool of one provider's credentials (or endpoints).
+
+    ``classify(exc)`` maps a failed call's exception to :data:`THROTTLED`,
+    :data:`FATAL` or :data:`FAILED`; ``retry_after(exc)`` returns the
+    provider's suggested delay, if any.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        members: Sequence[Tuple[str, T]],
+        *,
+        classify: Callable[[BaseException], str],
+        retry_after: Callable[[BaseException], Optional[float]] = lambda exc: None,
+        strategy: Optional[str] = None,
+    ) -> None:
+        if not members:
+            raise ValueError(f"{provider} credential pool needs at least one member.")
+        self.provider = provider
+        self._members: List[_Member[T]] = [_Member(label, value) for label, value in members]
+        self._classify = classify
+        self._retry_after = retry_after
+        self._strategy = strategy or pool_strategy()
+        self._cursor = itertools.count()
+        self._calls = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    @property
+    def values(self) -> List[T]:
+        return [member.value for member in self._members]
+
+    def _pick(self, exclude: set[int]) -> _Member[T]:
+        """The member to use next; never waits.
+
+        With none available, the one whose quarantine ends soonest is returned
+        at once; the caller's retry backoff is the only wait.
+        """
+        now = time.monotonic()
+        candidates = [
+            m for i, m in enumerate(self._members) if i not in exclude and m.available(now)
+        ]
+        if candidates:
+            if self._strategy == ROUND_ROBIN:
+                return candidates[next(self._cursor) % len(candidates)]
+            return min(candidates, key=lambda m: (m.in_flight, m.last_acquired))
+        # Everything is benched: use the member that recovers soonest rather
+        # than failing, and a fatal one only when nothing else is left (its
+        # error then marks the model unavailable).
+        pool = [m for i, m in enumerate(self._members) if i not in exclude] or self._members
+        return min(pool, key=lambda m: (m.fatal, m.quarantined_until))
+
+    def _acquire(self, exclude: set[int]) -> Tuple[int, _Member[T]]:
+        with self._lock:
+            member = self._pick(exclude)
+            member.in_flight += 1
+            member.requests += 1
+            member.last_acquired = time.monotonic()
+            return self._members.index(member), member
+
+    def _release(self, member: _Member[T], exc: Optional[BaseException]) -> bool:
+        """Record the outcome; True when another member should be tried now."""
+        publish = False
+        rotate = False
+        with self._lock:
+            member.in_flight -= 1
+            self._calls += 1
+            if exc is None:
+                member.successes += 1
+            else:
+                outcome = self._classify(exc)
+                if outcome == THROTTLED:
+                    member.throttled += 1
+                    delay = self._retry_after(exc)
+                    until = time.monotonic() + (delay if delay else _QUARANTINE_SECONDS)
+                    if until > member.quarantined_until:
+                        member.quarantined_until = until
+                        publish = True
+                    rotate = True
+                elif outcome == FATAL:
+                    member.errors += 1
+                    publish = not member.fatal
+                    member.fatal = True
+                    rotate = True
+                else:
+                    member.errors += 1
+            publish = publish or self._calls % _PUBLISH_EVERY == 0
+        if exc is not None and rotate and publish and len(self._members) > 1:
+            print(
+                f"[key-pool] {self.provider} {member.label} "
+                + ("disabled for the run" if member.fatal else
+                   f"quarantined for {member.quarantined_until - time.monotonic():.0f}s")
+                + f" ({type(exc).__name__}: {str(exc)[:160]}).",
+                file=sys.stderr,
+                flush=True,
+            )
+        if publish:
+            rc.record_key_pool(self.provider, self.snapshot())
+        return rotate
+
+    def _has_other(self, tried: set[int]) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            return any(
+                i not in tried and m.available(now) for i, m in enumerate(self._members)
+            )
+
+    def call(self, func: Callable[[T], R]) -> R:
+        """``func(member)`` on a selected member, rotating on throttle/fatal."""
+        tried: set[int] = set()
+        while True:
+            index, member = self._acquire(tried)
+            try:
+                result = func(member.value)
+            except Exception as exc:
+                tried.add(index)
+                if self._release(member, exc) and self._has_other(tried):
+                    continue
+                raise
+            self._release(member, None)
+            return result
+
+    async def acall(self, func: Callable[[T], Awaitable[R]]) -> R:
+        """Coroutine twin of :meth:`call`."""
+        tried: set[int] = set()
+        while True:
+            index, member = self._acquire(tried)
+            try:
+                result = await func(member.value)
+            except Exception as exc:
+                tried.add(index)
+                if self._release(member, exc) and self._has_other(tried):
+                    continue
+                raise
+            self._release(member, None)
+            return result
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                m.label: {
+                    "requests": m.requests,
+                    "successes": m.successes,
+                    "throttled": m.throttled,
+                    "errors": m.errors,
+                    "in_flight": m.in_flight,
+                    "state": (
+                        "disabled" if m.fatal
+                        else "quarantined" if now < m.quarantined_until
+                        else "active"
+                    ),
+                }
+                for m in self._members
+            }
+
+
+__all__ = [
+    "CredentialPool",
+    "FAILED",
+    "FATAL",
+    "LEAST_LOADED",
+    "ROUND_ROBIN",
+    "THROTTLED",
+    "env_list",
+    "mask_secret",
+    "pool_strategy",
+]
@@ -0,0 +1,228 @@
+"""Hedged LLM requests: send one duplicate of a call that outlives a latency percentile.
+
+Used by generators of models.yaml entries that set ``hedge_after_percentile``.
+The losing attempt is not cancelled; it is handed back on the winner as
+``LLMResponse.hedges`` so the attempt recorder can bill it.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import replace
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from service_invocations.core.llm_adapters import LLMResponse
+
+_WINDOW = int(os.getenv("LLM_HEDGE_WINDOW", "200"))
+_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+
+# ``call(on_start)`` must invoke ``on_start()`` right before the request goes
+# to the provider, so time spent queued (executor, rate limiter, concurrency
+# gate) neither counts toward the hedge threshold nor skews the latencies.
+HedgeableCall = Callable[[Callable[[], None]], LLMResponse]
+AsyncHedgeableCall = Callable[[Callable[[], None]], Awaitable[LLMResponse]]
+
+
+class LatencyTracker:
+    """Sliding window of call latencies (seconds) for one model."""
+
+    def __init__(self, window: int = _WINDOW) -> None:
+        self._samples: Deque[float] = deque(maxlen=max(1, window))
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(float(seconds))
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """The ``pct``-th percentile, or ``None`` until enough calls were seen."""
+        with self._lock:
+            if len(self._samples) < _MIN_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        rank = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+        return ordered[rank]
+
+
+_TRACKERS: Dict[str, LatencyTracker] = {}
+_EXECUTORS: Dict[str, ThreadPoolExecutor] = {}
+_TRACKERS_LOCK = threading.Lock()
+
+
+def get_latency_tracker(model_name: str) -> LatencyTracker:
+    with _TRACKERS_LOCK:
+        tracker = _TRACKERS.get(model_name)
+        if tracker is None:
+            tracker = LatencyTracker()
+            _TRACKERS[model_name] = tracker
+        return tracker
+
+
+def get_hedge_executor(model_name: str, max_in_flight: int) -> ThreadPoolExecutor:
+    """The model's attempt pool: a primary and a hedge per in-flight sample."""
+    with _TRACKERS_LOCK:
+        executor = _EXECUTORS.get(model_name)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=2 * max(1, max_in_flight),
+                thread_name_prefix=f"hedge-{model_name}",
+            )
+            _EXECUTORS[model_name] = executor
+        return executor
+
+
+class _Attempt:
+    """One attempt's start signal and start time."""
+
+    def __init__(self) -> None:
+        self.started = threading.Event()
+        self.started_at: Optional[float] = None
+
+    def mark_started(self) -> None:
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+        self.started.set()
+
+    def remaining(self, threshold: float) -> float:
+        return max(0.0, threshold - (time.monotonic() - (self.started_at or time.monotonic())))
+
+    def observe(self, tracker: LatencyTracker) -> None:
+        if self.started_at is not None:
+            tracker.observe(time.monotonic() - self.started_at)
+
+
+def _with_hedges(response: LLMResponse, losers: list) -> LLMResponse:
+    return replace(response, hedges=tuple(losers)) if losers else response
+
+
+def _pick(
+    attempts: list, done: set, accept: Optional[Callable[[LLMResponse], bool]], state: dict
+) -> Optional[LLMResponse]:
+    """Winner among the finished ``attempts``, if one is acceptable.
+
+    A response ``accept`` rejects is kept in ``state`` as the fallback, used
+    only when no attempt produces an acceptable one.
+    """
+    for attempt in attempts:
+        if attempt not in done or attempt in state["seen"]:
+            continue
+        state["seen"].add(attempt)
+        exc = attempt.exception()
+        if exc is not None:
+            state["error"] = state["error"] or exc
+            continue
+        if accept is None or accept(attempt.result()):
+            return _with_hedges(attempt.result(), [a for a in attempts if a is not attempt])
+        if state["fallback"] is None:
+            state["fallback"] = attempt
+    return None
+
+
+def _settle(attempts: list, state: dict) -> LLMResponse:
+    fallback = state["fallback"]
+    if fallback is None:
+        assert state["error"] is not None
+        raise state["error"]
+    return _with_hedges(fallback.result(), [a for a in attempts if a is not fallback])
+
+
+def hedged_call(
+    call: HedgeableCall,
+    tracker: LatencyTracker,
+    percentile: float,
+    executor: ThreadPoolExecutor,
+    accept: Optional[Callable[[LLMResponse], bool]] = None,
+) -> LLMResponse:
+    """Run ``call``; send one duplicate if it outlives the latency percentile.
+
+    Once both are out, the first response ``accept`` approves wins; if
+    neither does, the first successful one is returned.
+    """
+    threshold = tracker.percentile(percentile)
+    primary_attempt = _Attempt()
+
+    def _run(attempt: _Attempt) -> LLMResponse:
+        response = call(attempt.mark_started)
+        attempt.observe(tracker)
+        return response
+
+    if threshold is None:
+        return _run(primary_attempt)
+    primary = executor.submit(_run, primary_attempt)
+    primary.add_done_callback(lambda _: primary_attempt.started.set())
+    primary_attempt.started.wait()
+    done, _ = wait([primary], timeout=primary_attempt.remaining(threshold))
+    if done:
+        return primary.result()
+    attempts = [primary, executor.submit(_run, _Attempt())]
+    state: dict = {"seen": set(), "error": None, "fallback": None}
+    pending = set(attempts)
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        winner = _pick(attempts, done | {a for a in attempts if a.done()}, accept, state)
+        if winner is not None:
+            return winner
+    return _settle(attempts, state)
+
+
+async def ahedged_call(
+    call: AsyncHedgeableCall,
+    tracker: LatencyTracker,
+    percentile: float,
+    accept: Optional[Callable[[LLMResponse], bool]] = None,
+) -> LLMResponse:
+    """Coroutine twin of :func:`hedged_call` (attempts run as tasks)."""
+
+    async def _run(attempt: _Attempt) -> LLMResponse:
+        response = await call(attempt.mark_started)
+        attempt.observe(tracker)
+        return response
+
+    threshold = tracker.percentile(percentile)
+    primary_attempt = _Attempt()
+    if threshold is None:
+        return await _run(primary_attempt)
+    primary = asyncio.ensure_future(_run(primary_attempt))
+    while not primary_attempt.started.is_set() and not primary.done():
+        await asyncio.wait({primary}, timeout=0.01)
+    done, _ = await asyncio.wait({primary}, timeout=primary_attempt.remaining(threshold))
+    if done:
+        return primary.result()
+    attempts = [primary, asyncio.ensure_future(_run(_Attempt()))]
+    state: dict = {"seen": set(), "error": None, "fallback": None}
+    pending = set(attempts)
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        winner = _pick(attempts, done | {a for a in attempts if a.done()}, accept, state)
+        if winner is not None:
+            return winner
+    return _settle(attempts, state)
+
+
+def hedge_bill(future: Any, winner: LLMResponse) -> Optional[LLMResponse]:
+    """What to bill for a losing attempt when the winner is recorded.
+
+    A finished loser is billed as it answered (nothing if it failed). One
+    still running is an identical request, billed at the winner's token
+    counts, so the sample's ``cost_usd`` and cost.csv agree without waiting
+    for it.
+    """
+    if future.done():
+        if future.cancelled() or future.exception() is not None:
+            return None
+        return future.result()
+    return replace(winner, hedges=())
+
+
+__all__ = [
+    "LatencyTracker",
+    "ahedged_call",
+    "get_hedge_executor",
+    "get_latency_tracker",
+    "hedge_bill",
+    "hedged_call",
+]
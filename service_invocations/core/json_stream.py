@@ -0,0 +1,89 @@
+"""Incremental scanner that spots when a streamed JSON answer is complete.
+
+Lets the streaming adapters stop once the top-level object closes, or once
+every ``stop_keys`` field has a complete value. Only an answer that opens
+with the object (after whitespace or a code fence) is cut short; one that
+starts with prose is read to the end, since an object in the prose may be an
+example rather than the answer.
+"""
+from __future__ import annotations
+
+import json
+import re
+from typing import Iterable, Optional
+
+# What may precede the answer object: whitespace and an opening code fence.
+_LEAD_IN = re.compile(r"\s*(?:```[\w-]*\s*)?\Z")
+
+
+class JsonStopScanner:
+    """Tracks string/escape state and nesting depth across streamed chunks."""
+
+    def __init__(self, stop_keys: Optional[Iterable[str]] = None) -> None:
+        self.stop_keys = tuple(stop_keys or ())
+        self._buffer = ""
+        self._pos = 0
+        self._start: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._prose = False
+        self.result: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        """Everything received so far."""
+        return self._buffer
+
+    def feed(self, chunk: str) -> Optional[str]:
+        """Consume ``chunk``; return the JSON text once the answer is complete."""
+        if self.result is not None or not chunk:
+            return self.result
+        self._buffer += chunk
+        if self._prose:
+            return None
+        buf = self._buffer
+        for i in range(self._pos, len(buf)):
+            ch = buf[i]
+            if self._start is None:
+                if ch == "{":
+                    if not _LEAD_IN.match(buf, 0, i):
+                        self._prose = True
+                        return None
+                    self._start = i
+                    self._depth = 1
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.result = buf[self._start:i + 1]
+                    return self.result
+            elif ch == "," and self._depth == 1 and self.stop_keys:
+                candidate = buf[self._start:i] + "}"
+                if self._has_stop_keys(candidate):
+                    self.result = candidate
+                    return self.result
+        self._pos = len(buf)
+        return None
+
+    def _has_stop_keys(self, candidate: str) -> bool:
+        try:
+            payload = json.loads(candidate)
+        except json.JSONDecodeError:
+            return False
+        return isinstance(payload, dict) and all(k in payload for k in self.stop_keys)
+
+
+__all__ = ["JsonStopScanner"]
@@ -1,20 +1,45 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+import atexit
+from contextlib import contextmanager
+import http.client
+import inspect
+import io
+import queue
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
+import hashlib
 import json
-import base64
+import math
 import os
 import random
+import re
 import socket
 import sys
+import threading
 from pathlib import Path
 import time
-from typing import Any, Callable, Dict, List, Tuple
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Tuple
+import weakref
 from urllib import error as url_error
-from urllib import request as url_request
+from urllib import parse as url_parse
 
 from dotenv import load_dotenv
 
+from service_invocations.core.credential_pool import (
+    FAILED,
+    FATAL,
+    THROTTLED,
+    CredentialPool,
+    env_list,
+    mask_secret,
+)
+from service_invocations.core.json_stream import JsonStopScanner
+from service_invocations.core.media_cache import media_b64, read_media
+from service_invocations.core.rate_limiter import estimate_tokens
+from service_invocations.core.response_schemas import to_json_schema
+
 load_dotenv()
 
 
@@ -72,6 +97,15 @@ _DEFAULT_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "6"))
 _DEFAULT_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "2.0"))
 _DEFAULT_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "60.0"))
 _DEFAULT_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "120.0"))
+# Idle keep-alive connections kept per Phi endpoint (and the async client's
+# keep-alive limit). Busier moments open extra connections, which are closed
+# instead of pooled once the pool is full.
+_PHI_POOL_SIZE = max(1, int(os.getenv("PHI_POOL_SIZE", "8")))
+# Gemini context caching (models.yaml ``context_cache``): lifetime of each
+# cached prompt prefix, and the estimated size below which a prefix is sent
+# inline instead (Gemini refuses to cache small contents).
+_CONTEXT_CACHE_TTL = int(os.getenv("LLM_CONTEXT_CACHE_TTL", "3600"))
+_CONTEXT_CACHE_MIN_TOKENS = int(os.getenv("LLM_CONTEXT_CACHE_MIN_TOKENS", "1024"))
 
 
 def _parse_retry_after(value: Any) -> float | None:
@@ -168,6 +202,186 @@ def _is_fatal_model_error(exc: BaseException) -> bool:
     return any(keyword in message for keyword in _FATAL_KEYWORDS)
 
 
+def _is_credential_error(exc: BaseException) -> bool:
+    """Fatal errors that belong to the key/endpoint rather than the model.
+
+    A 404 names a model or deployment that does not exist, which every other
+    key would report too, so it is left out: benching keys over it would take
+    the whole provider down for one bad model id.
+    """
+    if not _is_fatal_model_error(exc):
+        return False
+    status_code = (
+        getattr(exc, "code", None)
+        or getattr(exc, "status_code", None)
+        or getattr(exc, "status", None)
+        or getattr(exc, "http_status", None)
+    )
+    if isinstance(status_code, int) and status_code == 404:
+        return False
+    message = str(exc).lower()
+    return not any(keyword in message for keyword in ("http 404", "404 not found"))
+
+
+def _pool_outcome(exc: BaseException) -> str:
+    """``CredentialPool`` classifier: throttle, dead credential, or other."""
+    retryable, suggested = _classify_exception(exc)
+    if retryable:
+        return THROTTLED if _is_throttle_signal(exc, suggested) else FAILED
+    return FATAL if _is_credential_error(exc) else FAILED
+
+
+def _pool_retry_after(exc: BaseException) -> float | None:
+    return _classify_exception(exc)[1]
+
+
+def _credential_pool(provider: str, members: List[Tuple[str, Any]]) -> CredentialPool:
+    return CredentialPool(
+        provider, members, classify=_pool_outcome, retry_after=_pool_retry_after,
+    )
+
+
+# Throttling responses: the provider is telling us to send less, not that the
+# request was bad. Used to feed adaptive concurrency control.
+_THROTTLE_STATUS_CODES = {429, 503, 529}
+_THROTTLE_KEYWORDS = (
+    "429",
+    "503",
+    "rate limit",
+    "rate-limit",
+    "resource exhausted",
+    "overloaded",
+    "too many requests",
+)
+
+# Optional per-call observer of retry decisions. Set by the generator layer
+# (see ``observe_retries``) so callers can react to what ``_retry_call`` sees
+# without the adapters knowing about them. Context-local, so each worker thread
+# or asyncio task observes only its own calls.
+_RETRY_OBSERVER: ContextVar[Callable[[BaseException, bool, float | None], None] | None] = (
+    ContextVar("llm_retry_observer", default=None)
+)
+
+
+@contextmanager
+def observe_retries(
+    observer: Callable[[BaseException, bool, float | None], None],
+) -> Iterator[None]:
+    """Report every failed attempt inside the block to ``observer``.
+
+    ``observer(exc, is_throttle, retry_after)`` is called once per failed
+    attempt, before the retry/raise decision is acted on. ``is_throttle`` is
+    True for 429/503-style responses or when the provider sent ``Retry-After``.
+    Observer errors are swallowed — bookkeeping must never break a call.
+    """
+    token = _RETRY_OBSERVER.set(observer)
+    try:
+        yield
+    finally:
+        _RETRY_OBSERVER.reset(token)
+
+
+# Optional per-call hook run before every attempt ``_retry_call`` makes (see
+# ``before_each_attempt``), so per-request budgets are taken per attempt
+# rather than once per logical call. Context-local like the observer.
+_ATTEMPT_HOOK: ContextVar[Callable[[int], Any] | None] = (
+    ContextVar("llm_attempt_hook", default=None)
+)
+
+
+@contextmanager
+def before_each_attempt(hook: Callable[[int], Any]) -> Iterator[None]:
+    """Call ``hook(attempt)`` before every attempt inside the block.
+
+    ``attempt`` counts from 0. Under ``_aretry_call`` an awaitable returned
+    by the hook is awaited before the attempt is made.
+    """
+    token = _ATTEMPT_HOOK.set(hook)
+    try:
+        yield
+    finally:
+        _ATTEMPT_HOOK.reset(token)
+
+
+def _is_throttle_signal(exc: BaseException, retry_after: float | None) -> bool:
+    if retry_after is not None:
+        return True
+    status_code = (
+        getattr(exc, "code", None)
+        or getattr(exc, "status_code", None)
+        or getattr(exc, "status", None)
+        or getattr(exc, "http_status", None)
+    )
+    if isinstance(status_code, int) and status_code in _THROTTLE_STATUS_CODES:
+        return True
+    message = str(exc).lower()
+    return any(keyword in message for keyword in _THROTTLE_KEYWORDS)
+
+
+def _notify_retry_observer(exc: BaseException, retryable: bool, suggested: float | None) -> None:
+    observer = _RETRY_OBSERVER.get()
+    if observer is None:
+        return
+    try:
+        observer(exc, retryable and _is_throttle_signal(exc, suggested), suggested)
+    except Exception:
+        pass
+
+
+def _next_retry_delay(
+    exc: Exception,
+    *,
+    attempt: int,
+    description: str,
+    model_id: str,
+    max_retries: int,
+    base_delay: float,
+    max_delay: float,
+) -> float:
+    """Decide what to do after ``exc`` failed attempt number ``attempt``.
+
+    Returns the (jittered) delay before the next attempt, or raises: the
+    original exception when it is not retryable, or ``ModelUnavailableError``
+    when it is fatal or the retries are exhausted. Shared by the blocking and
+    asyncio retry loops so both classify errors identically.
+    """
+    retryable, suggested = _classify_exception(exc)
+    _notify_retry_observer(exc, retryable, suggested)
+    if not retryable:
+        if _is_fatal_model_error(exc):
+            print(
+                f"[llm-retry] {description} hit a fatal auth/permission "
+                f"error ({type(exc).__name__}: {exc}); marking model "
+                f"unavailable and skipping (no retry).",
+                file=sys.stderr,
+                flush=True,
+            )
+            raise ModelUnavailableError(model_id, exc, fatal=True) from exc
+        raise exc
+    if attempt >= max_retries:
+        print(
+            f"[llm-retry] {description} exhausted {max_retries + 1} attempts; "
+            f"marking model unavailable. Last error: "
+            f"{type(exc).__name__}: {exc}.",
+            file=sys.stderr,
+            flush=True,
+        )
+        raise ModelUnavailableError(model_id, exc) from exc
+    if suggested is not None and suggested > 0:
+        delay = min(suggested, max_delay)
+    else:
+        delay = min(base_delay * (2 ** attempt), max_delay)
+    delay += random.uniform(0, max(0.25, delay * 0.25))
+    print(
+        f"[llm-retry] {description} failed "
+        f"(attempt {attempt + 1}/{max_retries + 1}): "
+        f"{type(exc).__name__}: {exc}. Retrying in {delay:.1f}s.",
+        file=sys.stderr,
+        flush=True,
+    )
+    return delay
+
+
 def _retry_call(
     func: Callable[[], Any],
     *,
@@ -178,47 +392,60 @@ def _retry_call(
     max_delay: float = _DEFAULT_MAX_DELAY,
 ) -> Any:
     attempt = 0
+    hook = _ATTEMPT_HOOK.get()
     while True:
+        if hook is not None:
+            hook(attempt)
         try:
             return func()
         except Exception as exc:
-            retryable, suggested = _classify_exception(exc)
-            if not retryable:
-                if _is_fatal_model_error(exc):
-                    print(
-                        f"[llm-retry] {description} hit a fatal auth/permission "
-                        f"error ({type(exc).__name__}: {exc}); marking model "
-                        f"unavailable and skipping (no retry).",
-                        file=sys.stderr,
-                        flush=True,
-                    )
-                    raise ModelUnavailableError(model_id, exc, fatal=True) from exc
-                raise
-            if attempt >= max_retries:
-                print(
-                    f"[llm-retry] {description} exhausted {max_retries + 1} attempts; "
-                    f"marking model unavailable. Last error: "
-                    f"{type(exc).__name__}: {exc}.",
-                    file=sys.stderr,
-                    flush=True,
-                )
-                raise ModelUnavailableError(model_id, exc) from exc
-            if suggested is not None and suggested > 0:
-                delay = min(suggested, max_delay)
-            else:
-                delay = min(base_delay * (2 ** attempt), max_delay)
-            delay += random.uniform(0, max(0.25, delay * 0.25))
-            print(
-                f"[llm-retry] {description} failed "
-                f"(attempt {attempt + 1}/{max_retries + 1}): "
-                f"{type(exc).__name__}: {exc}. Retrying in {delay:.1f}s.",
-                file=sys.stderr,
-                flush=True,
+            delay = _next_retry_delay(
+                exc,
+                attempt=attempt,
+                description=description,
+                model_id=model_id,
+                max_retries=max_retries,
+                base_delay=base_delay,
+                max_delay=max_delay,
             )
             time.sleep(delay)
             attempt += 1
 
 
+async def _aretry_call(
+    func: Callable[[], Awaitable[Any]],
+    *,
+    description: str,
+    model_id: str,
+    max_retries: int = _DEFAULT_MAX_RETRIES,
+    base_delay: float = _DEFAULT_BASE_DELAY,
+    max_delay: float = _DEFAULT_MAX_DELAY,
+) -> Any:
+    """Asyncio twin of :func:`_retry_call` — backs off with ``asyncio.sleep``
+    so a waiting call never blocks the event loop's other requests."""
+    attempt = 0
+    hook = _ATTEMPT_HOOK.get()
+    while True:
+        if hook is not None:
+            pending = hook(attempt)
+            if inspect.isawaitable(pending):
+                await pending
+        try:
+            return await func()
+        except Exception as exc:
+            delay = _next_retry_delay(
+                exc,
+                attempt=attempt,
+                description=description,
+                model_id=model_id,
+                max_retries=max_retries,
+                base_delay=base_delay,
+                max_delay=max_delay,
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
 @dataclass(frozen=True)
 class LLMResponse:
     content: str
@@ -229,16 +456,21 @@ class LLMResponse:
     # the provider reports it (e.g. Gemini ``prompt_tokens_details``). Used so
     # the cost tracker can bill audio at a different per-million rate than text.
     audio_input_tokens: int | None = None
+    # True when the response was replayed from the on-disk response cache
+    # (see ``core.response_cache``) instead of being billed by the provider.
+    cached: bool = False
+    # Still-running duplicate attempts that lost a hedged race (see
+    # ``core.hedging``). The attempt recorder bills them with this response.
+    hedges: Tuple[Any, ...] = field(default=(), repr=False, compare=False)
+    # True when the answer came back from a provider batch job (see
+    # ``core.batch_jobs``), which is billed at the model's batch price.
+    batched: bool = False
 
 
 def _read_bytes(value: Any) -> bytes:
-    if isinstance(value, (bytes, bytearray)):
-        return bytes(value)
-    if isinstance(value, Path):
-        return value.read_bytes()
-    if isinstance(value, str):
-        return Path(value).read_bytes()
-    raise TypeError("input must be bytes or a filesystem path.")
+    # Served from the shared media cache: the same clip is sent once per
+    # model x prompt x paradigm x retry, so re-reading it every time adds up.
+    return read_media(value)
 
 
 def _infer_format(path_value: Any, default: str) -> str:
@@ -272,12 +504,11 @@ def _build_phi_messages(prompt: str, inputs: Dict[str, Any]) -> List[Dict[str, A
     audio_parts: List[Dict[str, Any]] = []
     audio_input = inputs.get("audio")
     if audio_input is not None:
-        audio_bytes = _read_bytes(audio_input)
         audio_format = inputs.get("audio_format") or _infer_format(audio_input, "wav")
         audio_parts.append({
             "type": "input_audio",
             "input_audio": {
-                "data": base64.b64encode(audio_bytes).decode("utf-8"),
+                "data": media_b64(audio_input),
                 "format": audio_format,
             },
         })
@@ -285,9 +516,8 @@ def _build_phi_messages(prompt: str, inputs: Dict[str, Any]) -> List[Dict[str, A
     image_parts: List[Dict[str, Any]] = []
     image_input = inputs.get("image")
     if image_input is not None:
-        image_bytes = _read_bytes(image_input)
         image_format = inputs.get("image_format") or _infer_format(image_input, "png")
-        image_b64 = base64.b64encode(image_bytes).decode("utf-8")
+        image_b64 = media_b64(image_input)
         image_parts.append({
             "type": "image_url",
             "image_url": {
@@ -344,13 +574,52 @@ def _extract_realtime_text(response: Dict[str, Any] | None) -> str:
     return "".join(chunks).strip()
 
 
+def _streamed_llm_response(
+    scanner: JsonStopScanner,
+    start_time: float,
+    input_tokens: int | None,
+    output_tokens: int | None,
+    audio_input_tokens: int | None,
+    prompt: str,
+    inputs: Dict[str, Any],
+) -> LLMResponse:
+    """Build the response for a (possibly cancelled) streamed generation.
+
+    A stream cut short usually ends before the provider's final usage chunk.
+    Rather than drop those calls from the cost ledger, fall back to the same
+    rough estimates the rate limiter uses: the prompt for input, and ~4
+    characters per token of what was actually streamed for output.
+    """
+    if input_tokens is None:
+        input_tokens = estimate_tokens(prompt, inputs)
+    if output_tokens is None:
+        output_tokens = len(scanner.text) // 4
+    content = scanner.result if scanner.result is not None else scanner.text
+    latency_ms = (time.perf_counter() - start_time) * 1000.0
+    return LLMResponse(
+        content=content,
+        latency_ms=round(latency_ms, 2),
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        audio_input_tokens=audio_input_tokens,
+    )
+
+
 class GeminiAdapter:
+    # Accepts ``static_prefix`` (see ``_with_context_cache``).
+    supports_context_cache = True
+
     def __init__(self) -> None:
-        api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
-        if not api_key:
+        # ``GEMINI_API_KEYS`` (comma-separated) spreads calls over several
+        # projects' quotas; see ``core.credential_pool``.
+        api_keys = env_list("GEMINI_API_KEYS") or [
+            key for key in (os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY"),) if key
+        ]
+        if not api_keys:
             raise UnsupportedProviderError(
-                "Gemini adapter requires GEMINI_API_KEY or GOOGLE_API_KEY."
+                "Gemini adapter requires GEMINI_API_KEYS, GEMINI_API_KEY or GOOGLE_API_KEY."
             )
+        api_key = api_keys[0]
 
         try:
             from google import genai  # type: ignore
@@ -361,8 +630,20 @@ class GeminiAdapter:
 
         if genai is not None and genai_types is not None:
             self._mode = "genai"
-            self._client = genai.Client(api_key=api_key)
+            self._pool = _credential_pool("gemini", [
+                (f"key{index}{mask_secret(key)}", genai.Client(api_key=key))
+                for index, key in enumerate(api_keys, start=1)
+            ])
+            # Batch jobs live in one project; they use the first key.
+            self._client = self._pool.values[0]
             self._types = genai_types
+            # (client id, model, prefix digest) -> (cached content name or
+            # None, refresh deadline). Cached contents belong to the project
+            # that created them, so each key registers its own. ``None`` marks
+            # a prefix that is sent inline for good.
+            self._context_caches: Dict[Tuple[int, str, str], Tuple[str | None, float]] = {}
+            self._context_caches_lock = threading.Lock()
+            atexit.register(self._delete_context_caches)
             return
 
         try:
@@ -372,96 +653,482 @@ class GeminiAdapter:
                 "Gemini adapter requires `google-genai` or `google-generativeai`."
             ) from exc
 
+        # The legacy SDK configures one process-global key, so it cannot pool.
         genai_legacy.configure(api_key=api_key)
         self._mode = "generativeai"
         self._client = genai_legacy
+        # One GenerativeModel per model name, reused by every call.
+        self._legacy_models: Dict[str, Any] = {}
+        self._legacy_models_lock = threading.Lock()
+
+    def _legacy_model(self, model: str) -> Any:
+        with self._legacy_models_lock:
+            model_client = self._legacy_models.get(model)
+            if model_client is None:
+                model_client = self._client.GenerativeModel(model)
+                self._legacy_models[model] = model_client
+            return model_client
+
+    def _genai_config(self, temperature: float,
+                      response_schema: Dict[str, Any] | None,
+                      cached_content: str | None = None) -> Any:
+        config: Dict[str, Any] = {"temperature": temperature}
+        if response_schema is not None:
+            config["response_mime_type"] = "application/json"
+            config["response_schema"] = response_schema
+        if cached_content is not None:
+            config["cached_content"] = cached_content
+        return self._types.GenerateContentConfig(**config)
+
+    def _context_cache_name(self, client: Any, model: str,
+                            static_prefix: str | None) -> str | None:
+        """Name of ``client``'s cached content holding ``static_prefix``, if any.
+
+        Registered once per (key, model, prefix) and reused until shortly before
+        its TTL runs out. Prefixes estimated under
+        ``LLM_CONTEXT_CACHE_MIN_TOKENS`` are never registered, and a prefix
+        whose registration failed is sent inline from then on. Registration
+        happens under the lock so concurrent workers create one cache, not
+        one each.
+        """
+        if self._mode != "genai" or not static_prefix:
+            return None
+        if estimate_tokens(static_prefix, None) < _CONTEXT_CACHE_MIN_TOKENS:
+            return None
+        key = (id(client), model, hashlib.sha256(static_prefix.encode("utf-8")).hexdigest())
+        with self._context_caches_lock:
+            entry = self._context_caches.get(key)
+            if entry is not None and (entry[0] is None or time.monotonic() < entry[1]):
+                return entry[0]
+            try:
+                cached = client.caches.create(
+                    model=model,
+                    config=self._types.CreateCachedContentConfig(
+                        contents=[self._types.Content(
+                            role="user",
+                            parts=[self._types.Part.from_text(text=static_prefix)],
+                        )],
+                        ttl=f"{_CONTEXT_CACHE_TTL}s",
+                        display_name=f"llm-labeling-{key[2][:12]}",
+                    ),
+                )
+            except Exception as exc:
+                self._context_caches[key] = (None, math.inf)
+                print(
+                    f"[context-cache] {model}: could not cache prompt prefix "
+                    f"({type(exc).__name__}: {exc}); sending it inline.",
+                    file=sys.stderr,
+                    flush=True,
+                )
+                return None
+            self._context_caches[key] = (
+                cached.name, time.monotonic() + 0.9 * _CONTEXT_CACHE_TTL,
+            )
+            return cached.name
+
+    def _forget_context_cache(self, client: Any, model: str, static_prefix: str,
+                              exc: BaseException) -> None:
+        key = (id(client), model, hashlib.sha256(static_prefix.encode("utf-8")).hexdigest())
+        with self._context_caches_lock:
+            self._context_caches[key] = (None, math.inf)
+        print(
+            f"[context-cache] {model}: cached prefix rejected "
+            f"({type(exc).__name__}: {exc}); sending it inline.",
+            file=sys.stderr,
+            flush=True,
+        )
+
+    def _with_context_cache(self, client: Any, model: str, static_prefix: str | None,
+                            send: Callable[[Any, str | None], Any]) -> Any:
+        """Call ``send(client, cache_name)``, falling back to no cache.
+
+        ``send`` must drop ``static_prefix`` from the prompt when given a
+        cache name. A non-retryable failure of the cached request (expired or
+        deleted cache, unsupported model, ...) retires the cache and resends
+        the full prompt in the same attempt; retryable errors propagate to
+        ``_retry_call`` as usual.
+        """
+        cache_name = self._context_cache_name(client, model, static_prefix)
+        if cache_name is None:
+            return send(client, None)
+        try:
+            return send(client, cache_name)
+        except Exception as exc:
+            if _classify_exception(exc)[0] or _is_credential_error(exc):
+                raise
+            self._forget_context_cache(client, model, static_prefix or "", exc)
+            return send(client, None)
+
+    async def _awith_context_cache(self, client: Any, model: str, static_prefix: str | None,
+                                   send: Callable[[Any, str | None], Awaitable[Any]]) -> Any:
+        """Coroutine twin of :meth:`_with_context_cache`."""
+        cache_name = await asyncio.to_thread(
+            self._context_cache_name, client, model, static_prefix,
+        )
+        if cache_name is None:
+            return await send(client, None)
+        try:
+            return await send(client, cache_name)
+        except Exception as exc:
+            if _classify_exception(exc)[0] or _is_credential_error(exc):
+                raise
+            self._forget_context_cache(client, model, static_prefix or "", exc)
+            return await send(client, None)
+
+    def _delete_context_caches(self) -> None:
+        """Best-effort cleanup at exit so cached prefixes stop accruing storage."""
+        clients = {id(client): client for client in self._pool.values}
+        with self._context_caches_lock:
+            names = [
+                (clients[key[0]], name)
+                for key, (name, _) in self._context_caches.items() if name
+            ]
+            self._context_caches.clear()
+        for client, name in names:
+            try:
+                client.caches.delete(name=name)
+            except Exception:
+                pass
+
+    @staticmethod
+    def _legacy_config(temperature: float,
+                       response_schema: Dict[str, Any] | None) -> Dict[str, Any]:
+        config: Dict[str, Any] = {"temperature": temperature}
+        if response_schema is not None:
+            config["response_mime_type"] = "application/json"
+            config["response_schema"] = response_schema
+        return config
+
+    def _genai_contents(self, prompt: str, inputs: Dict[str, Any]) -> List[Any]:
+        # Empty when the whole prompt lives in a cached prefix.
+        parts = [self._types.Part.from_text(text=prompt)] if prompt else []
+        text_input = inputs.get("text")
+        if text_input:
+            parts.append(self._types.Part.from_text(text=text_input))
+
+        audio_input = inputs.get("audio")
+        if audio_input is not None:
+            audio_bytes = _read_bytes(audio_input)
+            audio_format = inputs.get("audio_format") or _infer_format(audio_input, "wav")
+            parts.append(self._types.Part.from_bytes(
+                data=audio_bytes,
+                mime_type=f"audio/{audio_format}",
+            ))
+
+        image_input = inputs.get("image")
+        if image_input is not None:
+            image_bytes = _read_bytes(image_input)
+            image_format = inputs.get("image_format") or _infer_format(image_input, "png")
+            parts.append(self._types.Part.from_bytes(
+                data=image_bytes,
+                mime_type=f"image/{image_format}",
+            ))
+
+        return [self._types.Content(role="user", parts=parts)]
+
+    def _legacy_parts(self, prompt: str, inputs: Dict[str, Any]) -> List[Any]:
+        parts: List[Any] = [prompt]
+        text_input = inputs.get("text")
+        if text_input:
+            parts.append(text_input)
+        audio_input = inputs.get("audio")
+        if audio_input is not None:
+            audio_bytes = _read_bytes(audio_input)
+            audio_format = inputs.get("audio_format") or _infer_format(audio_input, "wav")
+            parts.append(self._client.types.Blob(
+                mime_type=f"audio/{audio_format}",
+                data=audio_bytes,
+            ))
+        image_input = inputs.get("image")
+        if image_input is not None:
+            image_bytes = _read_bytes(image_input)
+            image_format = inputs.get("image_format") or _infer_format(image_input, "png")
+            parts.append(self._client.types.Blob(
+                mime_type=f"image/{image_format}",
+                data=image_bytes,
+            ))
+        return parts
+
+    def _response_text(self, response: Any) -> str:
+        if self._mode != "genai":
+            return getattr(response, "text", None) or str(response)
+        content = getattr(response, "text", None)
+        if content is None and getattr(response, "candidates", None):
+            candidate = response.candidates[0]
+            content_parts = getattr(candidate, "content", None)
+            if content_parts and getattr(content_parts, "parts", None):
+                content = getattr(content_parts.parts[0], "text", None)
+        if content is None:
+            content = str(response)
+        return content
+
+    def _to_llm_response(self, response: Any, start_time: float) -> LLMResponse:
+        content = self._response_text(response)
+        latency_ms = (time.perf_counter() - start_time) * 1000.0
+        input_tokens, output_tokens, audio_input_tokens = _extract_gemini_usage(response)
+        return LLMResponse(
+            content=content,
+            latency_ms=round(latency_ms, 2),
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            audio_input_tokens=audio_input_tokens,
+        )
 
     def generate(self, model: str, prompt: str, inputs: Dict[str, Any],
-                 modalities: List[str], temperature: float = 0.0) -> LLMResponse:
+                 modalities: List[str], temperature: float = 0.0,
+                 response_schema: Dict[str, Any] | None = None,
+                 static_prefix: str | None = None) -> LLMResponse:
         start_time = time.perf_counter()
         if self._mode == "genai":
-            parts = [self._types.Part.from_text(text=prompt)]
-            text_input = inputs.get("text")
-            if text_input:
-                parts.append(self._types.Part.from_text(text=text_input))
-
-            audio_input = inputs.get("audio")
-            if audio_input is not None:
-                audio_bytes = _read_bytes(audio_input)
-                audio_format = inputs.get("audio_format") or _infer_format(audio_input, "wav")
-                parts.append(self._types.Part.from_bytes(
-                    data=audio_bytes,
-                    mime_type=f"audio/{audio_format}",
-                ))
-
-            image_input = inputs.get("image")
-            if image_input is not None:
-                image_bytes = _read_bytes(image_input)
-                image_format = inputs.get("image_format") or _infer_format(image_input, "png")
-                parts.append(self._types.Part.from_bytes(
-                    data=image_bytes,
-                    mime_type=f"image/{image_format}",
-                ))
-
-            contents = [self._types.Content(role="user", parts=parts)]
-            response = _retry_call(
-                lambda: self._client.models.generate_content(
+
+            def _send(client: Any, cache_name: str | None) -> Any:
+                text = prompt[len(static_prefix or ""):] if cache_name else prompt
+                return client.models.generate_content(
                     model=model,
-                    contents=contents,
-                    config=self._types.GenerateContentConfig(temperature=temperature),
+                    contents=self._genai_contents(text, inputs),
+                    config=self._genai_config(temperature, response_schema, cache_name),
+                )
+
+            response = _retry_call(
+                lambda: self._pool.call(
+                    lambda client: self._with_context_cache(client, model, static_prefix, _send)
                 ),
                 description=f"Gemini generate_content ({model})",
                 model_id=model,
             )
-            content = getattr(response, "text", None)
-            if content is None and getattr(response, "candidates", None):
-                candidate = response.candidates[0]
-                content_parts = getattr(candidate, "content", None)
-                if content_parts and getattr(content_parts, "parts", None):
-                    content = getattr(content_parts.parts[0], "text", None)
-            if content is None:
-                content = str(response)
         else:
-            model_client = self._client.GenerativeModel(model)
-            parts: List[Any] = [prompt]
-            text_input = inputs.get("text")
-            if text_input:
-                parts.append(text_input)
-            audio_input = inputs.get("audio")
-            if audio_input is not None:
-                audio_bytes = _read_bytes(audio_input)
-                audio_format = inputs.get("audio_format") or _infer_format(audio_input, "wav")
-                parts.append(self._client.types.Blob(
-                    mime_type=f"audio/{audio_format}",
-                    data=audio_bytes,
-                ))
-            image_input = inputs.get("image")
-            if image_input is not None:
-                image_bytes = _read_bytes(image_input)
-                image_format = inputs.get("image_format") or _infer_format(image_input, "png")
-                parts.append(self._client.types.Blob(
-                    mime_type=f"image/{image_format}",
-                    data=image_bytes,
-                ))
+            model_client = self._legacy_model(model)
+            parts = self._legacy_parts(prompt, inputs)
             response = _retry_call(
                 lambda: model_client.generate_content(
                     parts,
-                    generation_config={"temperature": temperature},
+                    generation_config=self._legacy_config(temperature, response_schema),
                 ),
                 description=f"Gemini generate_content ({model})",
                 model_id=model,
             )
-            content = getattr(response, "text", None) or str(response)
+        return self._to_llm_response(response, start_time)
+
+    async def agenerate(self, model: str, prompt: str, inputs: Dict[str, Any],
+                        modalities: List[str], temperature: float = 0.0,
+                        response_schema: Dict[str, Any] | None = None,
+                        static_prefix: str | None = None) -> LLMResponse:
+        """Asyncio variant of :meth:`generate` using the SDK's native async
+        client (``client.aio`` for google-genai, ``generate_content_async``
+        for the legacy SDK), so many calls can share one event loop."""
+        start_time = time.perf_counter()
+        if self._mode == "genai":
 
-        latency_ms = (time.perf_counter() - start_time) * 1000.0
-        input_tokens, output_tokens, audio_input_tokens = _extract_gemini_usage(response)
+            async def _send(client: Any, cache_name: str | None) -> Any:
+                text = prompt[len(static_prefix or ""):] if cache_name else prompt
+                return await client.aio.models.generate_content(
+                    model=model,
+                    contents=self._genai_contents(text, inputs),
+                    config=self._genai_config(temperature, response_schema, cache_name),
+                )
+
+            response = await _aretry_call(
+                lambda: self._pool.acall(
+                    lambda client: self._awith_context_cache(client, model, static_prefix, _send)
+                ),
+                description=f"Gemini generate_content async ({model})",
+                model_id=model,
+            )
+        else:
+            model_client = self._legacy_model(model)
+            parts = self._legacy_parts(prompt, inputs)
+            response = await _aretry_call(
+                lambda: model_client.generate_content_async(
+                    parts,
+                    generation_config=self._legacy_config(temperature, response_schema),
+                ),
+                description=f"Gemini generate_content async ({model})",
+                model_id=model,
+            )
+        return self._to_llm_response(response, start_time)
+
+    @staticmethod
+    def _chunk_text(chunk: Any) -> str:
+        try:
+            return getattr(chunk, "text", None) or ""
+        except ValueError:
+            # The legacy SDK raises when a chunk carries no text part.
+            return ""
+
+    def generate_stream(self, model: str, prompt: str, inputs: Dict[str, Any],
+                        modalities: List[str], temperature: float = 0.0,
+                        stop_keys: List[str] | None = None,
+                        response_schema: Dict[str, Any] | None = None,
+                        static_prefix: str | None = None) -> LLMResponse:
+        """Streaming :meth:`generate` that stops once the JSON answer is in.
+
+        Chunks are fed to a :class:`JsonStopScanner`; the stream is closed as
+        soon as it reports the object complete (or every ``stop_keys`` field
+        parsed), so trailing prose is neither waited for nor generated.
+        """
+        start_time = time.perf_counter()
+        if self._mode == "genai":
+
+            def _open(client: Any, cache_name: str | None) -> Any:
+                text = prompt[len(static_prefix or ""):] if cache_name else prompt
+                return client.models.generate_content_stream(
+                    model=model,
+                    contents=self._genai_contents(text, inputs),
+                    config=self._genai_config(temperature, response_schema, cache_name),
+                )
+        else:
+            model_client = self._legacy_model(model)
+            parts = self._legacy_parts(prompt, inputs)
+
+            def _open(client: Any, cache_name: str | None) -> Any:
+                return model_client.generate_content(
+                    parts,
+                    generation_config=self._legacy_config(temperature, response_schema),
+                    stream=True,
+                )
+
+        def _consume(client: Any, cache_name: str | None) -> Tuple[JsonStopScanner, Any]:
+            scanner = JsonStopScanner(stop_keys)
+            last_chunk = None
+            stream = _open(client, cache_name)
+            try:
+                for chunk in stream:
+                    # Usage metadata rides on the chunks; the latest is the
+                    # most complete count we will see.
+                    last_chunk = chunk
+                    if scanner.feed(self._chunk_text(chunk)) is not None:
+                        break
+            finally:
+                close = getattr(stream, "close", None)
+                if callable(close):
+                    close()
+            return scanner, last_chunk
+
+        def _attempt() -> Tuple[JsonStopScanner, Any]:
+            if self._mode != "genai":
+                return _consume(self._client, None)
+            return self._pool.call(
+                lambda client: self._with_context_cache(client, model, static_prefix, _consume)
+            )
+
+        scanner, last_chunk = _retry_call(
+            _attempt,
+            description=f"Gemini generate_content_stream ({model})",
+            model_id=model,
+        )
+        usage = _extract_gemini_usage(last_chunk) if last_chunk is not None else (None, None, None)
+        return _streamed_llm_response(scanner, start_time, *usage, prompt, inputs)
+
+
+    # ---- provider batch jobs (see ``core.batch_jobs``) ----
+
+    def batch_request(self, model: str, prompt: str, inputs: Dict[str, Any],
+                      temperature: float = 0.0,
+                      response_schema: Dict[str, Any] | None = None) -> Dict[str, Any]:
+        """REST ``GenerateContentRequest`` for one line of a batch job file.
+
+        The same parts :meth:`_genai_contents` sends, in the camelCase JSON the
+        batch API reads from its input file, with media inlined as base64.
+        """
+        parts: List[Dict[str, Any]] = [{"text": prompt}]
+        text_input = inputs.get("text")
+        if text_input:
+            parts.append({"text": text_input})
+        for kind, default in (("audio", "wav"), ("image", "png")):
+            value = inputs.get(kind)
+            if value is None:
+                continue
+            media_format = inputs.get(f"{kind}_format") or _infer_format(value, default)
+            parts.append({"inlineData": {
+                "mimeType": f"{kind}/{media_format}",
+                "data": media_b64(value),
+            }})
+        config: Dict[str, Any] = {"temperature": temperature}
+        if response_schema is not None:
+            config["responseMimeType"] = "application/json"
+            config["responseSchema"] = response_schema
+        return {"contents": [{"role": "user", "parts": parts}], "generationConfig": config}
+
+    @staticmethod
+    def batch_response(body: Dict[str, Any], latency_ms: float) -> LLMResponse:
+        """``LLMResponse`` from one REST ``GenerateContentResponse`` result."""
+        candidates = body.get("candidates") or [{}]
+        content_parts = (candidates[0].get("content") or {}).get("parts") or []
+        content = "".join(
+            part.get("text") or "" for part in content_parts if not part.get("thought")
+        )
+        usage = body.get("usageMetadata") or body.get("usage_metadata") or {}
+        input_tokens, output_tokens, audio_input_tokens = _extract_gemini_usage(
+            {"usage_metadata": _snake_case_keys(usage)}
+        )
         return LLMResponse(
             content=content,
             latency_ms=round(latency_ms, 2),
             input_tokens=input_tokens,
             output_tokens=output_tokens,
             audio_input_tokens=audio_input_tokens,
+            batched=True,
+        )
+
+    def _require_genai(self) -> None:
+        if self._mode != "genai":
+            raise UnsupportedProviderError(
+                "Gemini batch jobs require `google-genai` (the legacy SDK has no batch API)."
+            )
+
+    def submit_batch_job(self, model: str, path: Path, display_name: str) -> str:
+        """Upload the JSONL job file and start a batch job; return its name."""
+        self._require_genai()
+        uploaded = self._client.files.upload(
+            file=str(path),
+            config=self._types.UploadFileConfig(display_name=display_name, mime_type="jsonl"),
         )
+        job = self._client.batches.create(
+            model=model,
+            src=uploaded.name,
+            config=self._types.CreateBatchJobConfig(display_name=display_name),
+        )
+        return job.name
+
+    def batch_job_state(self, name: str) -> str:
+        """Raw job state, e.g. ``JOB_STATE_RUNNING`` / ``JOB_STATE_SUCCEEDED``."""
+        self._require_genai()
+        state = self._client.batches.get(name=name).state
+        return str(getattr(state, "name", state))
+
+    def batch_job_results(self, name: str) -> Iterator[Tuple[str, Dict[str, Any] | None, str | None]]:
+        """Yield ``(key, response body, error)`` for each line of the output."""
+        self._require_genai()
+        dest = getattr(self._client.batches.get(name=name), "dest", None)
+        file_name = getattr(dest, "file_name", None)
+        if not file_name:
+            return
+        blob = self._client.files.download(file=file_name)
+        for line in blob.decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response")
+            error = None if response else json.dumps(
+                record.get("error") or record.get("status") or "no response"
+            )
+            yield str(record.get("key")), response, error
+
+
+_CAMEL_BOUNDARY_RE = re.compile(r"(?<!^)(?=[A-Z])")
+
+
+def _snake_case_keys(value: Any) -> Any:
+    """REST camelCase keys to the SDK's snake_case (``promptTokenCount`` ->
+    ``prompt_token_count``), recursively, so ``_extract_gemini_usage`` reads both."""
+    if isinstance(value, dict):
+        return {
+            _CAMEL_BOUNDARY_RE.sub("_", str(key)).lower(): _snake_case_keys(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_snake_case_keys(item) for item in value]
+    return value
 
 
 def _extract_gemini_usage(response: Any) -> tuple[int | None, int | None, int | None]:
@@ -534,6 +1201,143 @@ def _extract_gemini_usage(response: Any) -> tuple[int | None, int | None, int |
     return input_tokens, output_tokens, audio_input_tokens
 
 
+class _HTTPConnectionPool:
+    """Thread-safe keep-alive connection pool for one HTTP(S) endpoint.
+
+    Connections are reused across calls, retries and worker threads. Up to
+    ``size`` idle connections are kept; a burst that needs more opens extra
+    ones and closes them afterwards, so the pool never blocks.
+
+    Responses with status >= 400 are raised as ``urllib`` ``HTTPError`` and
+    protocol failures as ``ConnectionError``, so ``_classify_exception`` sees
+    the same exceptions ``urlopen`` produced.
+    """
+
+    def __init__(self, url: str, size: int, timeout: float) -> None:
+        parts = url_parse.urlsplit(url)
+        self._url = url
+        self._https = parts.scheme == "https"
+        self._host = parts.hostname or ""
+        self._port = parts.port
+        self._path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self._timeout = timeout
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize=size)
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self._https:
+            return http.client.HTTPSConnection(self._host, self._port, timeout=self._timeout)
+        return http.client.HTTPConnection(self._host, self._port, timeout=self._timeout)
+
+    def _checkout(self) -> Tuple[http.client.HTTPConnection, bool]:
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            return self._connect(), False
+
+    def _checkin(self, conn: http.client.HTTPConnection) -> None:
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _release(self, conn: http.client.HTTPConnection, resp: http.client.HTTPResponse) -> None:
+        if resp.will_close:
+            conn.close()
+        else:
+            self._checkin(conn)
+
+    @staticmethod
+    def _protocol_error(exc: http.client.HTTPException) -> Exception:
+        if isinstance(exc, ConnectionError):
+            return exc
+        return ConnectionError(f"HTTP protocol error: {exc}")
+
+    def _send(
+        self, body: bytes, headers: Dict[str, str]
+    ) -> Tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        conn, reused = self._checkout()
+        try:
+            try:
+                conn.request("POST", self._path, body=body, headers=headers)
+                return conn, conn.getresponse()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                if not reused:
+                    raise
+                # The server closed an idle keep-alive connection; that says
+                # nothing about the request, so replay it once on a fresh one.
+                conn.close()
+                conn = self._connect()
+                conn.request("POST", self._path, body=body, headers=headers)
+                return conn, conn.getresponse()
+        except BaseException:
+            conn.close()
+            raise
+
+    def _read_all(self, conn: http.client.HTTPConnection, resp: http.client.HTTPResponse) -> bytes:
+        try:
+            data = resp.read()
+        except BaseException:
+            conn.close()
+            raise
+        self._release(conn, resp)
+        if resp.status >= 400:
+            raise url_error.HTTPError(
+                self._url, resp.status, resp.reason, resp.headers, io.BytesIO(data),
+            )
+        return data
+
+    def post(self, body: bytes, headers: Dict[str, str]) -> bytes:
+        try:
+            conn, resp = self._send(body, headers)
+            return self._read_all(conn, resp)
+        except http.client.HTTPException as exc:
+            raise self._protocol_error(exc) from exc
+
+    def stream(self, body: bytes, headers: Dict[str, str]) -> Iterator[bytes]:
+        """POST ``body`` and yield the response line by line (for SSE).
+
+        Closing the generator before the body is exhausted closes the
+        connection instead of pooling it — dropping the socket is how a
+        streamed generation is cancelled server-side.
+        """
+        try:
+            conn, resp = self._send(body, headers)
+            if resp.status >= 400:
+                self._read_all(conn, resp)
+        except http.client.HTTPException as exc:
+            raise self._protocol_error(exc) from exc
+        finished = False
+        try:
+            while True:
+                try:
+                    line = resp.readline()
+                except http.client.HTTPException as exc:
+                    raise self._protocol_error(exc) from exc
+                if not line:
+                    finished = True
+                    return
+                yield line
+        finally:
+            if finished:
+                self._release(conn, resp)
+            else:
+                conn.close()
+
+
+_CONNECTION_POOLS: Dict[str, _HTTPConnectionPool] = {}
+_CONNECTION_POOLS_LOCK = threading.Lock()
+
+
+def _connection_pool_for(url: str) -> _HTTPConnectionPool:
+    """Process-wide pool per endpoint URL, shared by every adapter and thread."""
+    with _CONNECTION_POOLS_LOCK:
+        pool = _CONNECTION_POOLS.get(url)
+        if pool is None:
+            pool = _HTTPConnectionPool(url, _PHI_POOL_SIZE, _DEFAULT_REQUEST_TIMEOUT)
+            _CONNECTION_POOLS[url] = pool
+        return pool
+
+
 class _PhiContentFilterError(Exception):
     """Phi rejected the input via Microsoft's content filter (HTTP 400).
 
@@ -543,84 +1347,194 @@ class _PhiContentFilterError(Exception):
     """
 
 
+class _PhiStreamError(RuntimeError):
+    """An ``error`` event sent inside a Phi stream after the HTTP 200.
+
+    ``code`` carries the event's HTTP-style status, when it names one, so
+    retry classification treats it like the equivalent HTTP error.
+    """
+
+    def __init__(self, message: str, code: int | None = None) -> None:
+        super().__init__(message)
+        self.code = code
+
+
 class MicrosoftPhiAdapter:
     def __init__(self) -> None:
-        api_key = os.getenv("MICROSOFT_PHI_KEY")
-        if not api_key:
+        # ``PHI_TARGET_URIS`` / ``MICROSOFT_PHI_KEYS`` (comma-separated) pool
+        # several deployments; see ``core.credential_pool``. One key is shared
+        # by every URI and one URI by every key; otherwise they pair up by
+        # position.
+        api_keys = env_list("MICROSOFT_PHI_KEYS") or env_list("MICROSOFT_PHI_KEY")
+        if not api_keys:
             raise UnsupportedProviderError(
-                "Microsoft Phi adapter requires MICROSOFT_PHI_KEY."
+                "Microsoft Phi adapter requires MICROSOFT_PHI_KEY or MICROSOFT_PHI_KEYS."
             )
-        target_uri = os.getenv("PHI_TARGET_URI")
-        if not target_uri:
+        target_uris = env_list("PHI_TARGET_URIS") or env_list("PHI_TARGET_URI")
+        if not target_uris:
             raise UnsupportedProviderError(
-                "Microsoft Phi adapter requires PHI_TARGET_URI."
+                "Microsoft Phi adapter requires PHI_TARGET_URI or PHI_TARGET_URIS."
             )
-        self._api_key = api_key
-        self._target_uri = target_uri
+        if len(api_keys) == 1:
+            api_keys = api_keys * len(target_uris)
+        elif len(target_uris) == 1:
+            target_uris = target_uris * len(api_keys)
+        elif len(api_keys) != len(target_uris):
+            raise UnsupportedProviderError(
+                f"MICROSOFT_PHI_KEYS has {len(api_keys)} keys but PHI_TARGET_URIS has "
+                f"{len(target_uris)} URIs; give one key, one URI, or one key per URI."
+            )
+        self._pool = _credential_pool("microsoft", [
+            (
+                f"{url_parse.urlsplit(uri).netloc}/key{index}{mask_secret(key)}",
+                (uri, key),
+            )
+            for index, (uri, key) in enumerate(zip(target_uris, api_keys), start=1)
+        ])
+        # One httpx.AsyncClient per event loop: an async client is bound to the
+        # loop it was first used on, and keying weakly lets a finished loop's
+        # client be collected with it.
+        self._async_clients: "weakref.WeakKeyDictionary[Any, Any]" = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _headers(api_key: str) -> Dict[str, str]:
+        return {
+            "Content-Type": "application/json",
+            "api-key": api_key,
+        }
+
+    @staticmethod
+    def _non_retryable_http_error(code: int, reason: Any, detail: str) -> Exception:
+        if code == 400 and "content_filter" in detail:
+            return _PhiContentFilterError(detail)
+        return RuntimeError(
+            f"Microsoft Phi request failed: HTTP {code} {reason} - {detail}"
+        )
+
+    @staticmethod
+    def _stream_error(error: Any) -> Exception:
+        detail = json.dumps(error) if isinstance(error, dict) else str(error)
+        if "content_filter" in detail:
+            return _PhiContentFilterError(detail)
+        code = (error.get("status") or error.get("code")) if isinstance(error, dict) else None
+        try:
+            status = int(code)
+        except (TypeError, ValueError):
+            status = None
+        return _PhiStreamError(f"Microsoft Phi stream failed: {detail}", status)
 
     def _post_json(self, payload: Dict[str, Any], model_id: str) -> Dict[str, Any]:
         data = json.dumps(payload).encode("utf-8")
-        headers = {
-            "Content-Type": "application/json",
-            "api-key": self._api_key,
-        }
 
-        def _do_request() -> bytes:
-            req = url_request.Request(
-                self._target_uri,
-                data=data,
-                headers=headers,
-                method="POST",
-            )
+        def _do_request(endpoint: Tuple[str, str]) -> bytes:
+            target_uri, api_key = endpoint
             try:
-                with url_request.urlopen(req, timeout=_DEFAULT_REQUEST_TIMEOUT) as resp:
-                    return resp.read()
+                return _connection_pool_for(target_uri).post(data, self._headers(api_key))
             except url_error.HTTPError as exc:
                 if exc.code in _RETRYABLE_STATUS_CODES:
                     raise
                 body = exc.read()
                 detail = body.decode("utf-8", errors="replace")
-                if exc.code == 400 and "content_filter" in detail:
-                    raise _PhiContentFilterError(detail) from exc
-                raise RuntimeError(
-                    f"Microsoft Phi request failed: HTTP {exc.code} {exc.reason} - {detail}"
-                ) from exc
+                raise self._non_retryable_http_error(exc.code, exc.reason, detail) from exc
 
         body = _retry_call(
-            _do_request,
+            lambda: self._pool.call(_do_request),
             description=f"Microsoft Phi request ({model_id})",
             model_id=model_id,
         )
         return json.loads(body.decode("utf-8"))
 
-    def generate(self, model: str, prompt: str, inputs: Dict[str, Any],
-                 modalities: List[str], temperature: float = 0.0) -> LLMResponse:
-        messages = _build_phi_messages(prompt, inputs)
-        start_time = time.perf_counter()
+    def _async_client(self) -> Any:
+        import httpx  # type: ignore
+
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                timeout=_DEFAULT_REQUEST_TIMEOUT,
+                limits=httpx.Limits(max_keepalive_connections=_PHI_POOL_SIZE),
+            )
+            self._async_clients[loop] = client
+        return client
+
+    async def _apost_json(self, payload: Dict[str, Any], model_id: str) -> Dict[str, Any]:
+        """Non-blocking :meth:`_post_json` over ``httpx.AsyncClient``.
+
+        Transport failures are re-raised as the built-in ``TimeoutError`` /
+        ``ConnectionError`` and retryable statuses as ``urllib`` ``HTTPError``,
+        so ``_classify_exception`` treats them exactly like the blocking path.
+        """
+        import httpx  # type: ignore
+
+        data = json.dumps(payload).encode("utf-8")
+        client = self._async_client()
+
+        async def _do_request(endpoint: Tuple[str, str]) -> bytes:
+            target_uri, api_key = endpoint
+            try:
+                resp = await client.post(
+                    target_uri, content=data, headers=self._headers(api_key),
+                )
+            except httpx.TimeoutException as exc:
+                raise TimeoutError(f"Microsoft Phi request timed out: {exc}") from exc
+            except httpx.TransportError as exc:
+                raise ConnectionError(f"Microsoft Phi connection error: {exc}") from exc
+            if resp.status_code >= 400:
+                if resp.status_code in _RETRYABLE_STATUS_CODES:
+                    raise url_error.HTTPError(
+                        target_uri, resp.status_code, resp.reason_phrase,
+                        resp.headers, None,
+                    )
+                raise self._non_retryable_http_error(
+                    resp.status_code, resp.reason_phrase, resp.text,
+                )
+            return resp.content
+
+        body = await _aretry_call(
+            lambda: self._pool.acall(_do_request),
+            description=f"Microsoft Phi request async ({model_id})",
+            model_id=model_id,
+        )
+        return json.loads(body.decode("utf-8"))
+
+    @staticmethod
+    def _payload(model: str, prompt: str, inputs: Dict[str, Any],
+                 temperature: float,
+                 response_schema: Dict[str, Any] | None = None) -> Dict[str, Any]:
         payload: Dict[str, Any] = {
             "model": model,
-            "messages": messages,
+            "messages": _build_phi_messages(prompt, inputs),
             "temperature": temperature,
         }
-        try:
-            response = self._post_json(payload, model_id=model)
-        except _PhiContentFilterError as exc:
-            latency_ms = (time.perf_counter() - start_time) * 1000.0
-            print(
-                f"[phi] content filter rejected input for {model}; "
-                f"recording empty response so the run can continue. Detail: {exc}",
-                file=sys.stderr,
-                flush=True,
-            )
-            return LLMResponse(
-                content="",
-                latency_ms=round(latency_ms, 2),
-                input_tokens=0,
-                output_tokens=0,
-                audio_input_tokens=None,
-            )
+        if response_schema is not None:
+            payload["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "response",
+                    "schema": to_json_schema(response_schema),
+                },
+            }
+        return payload
+
+    @staticmethod
+    def _content_filter_response(model: str, exc: Exception, start_time: float) -> LLMResponse:
         latency_ms = (time.perf_counter() - start_time) * 1000.0
-        usage = response.get("usage") if isinstance(response, dict) else None
+        print(
+            f"[phi] content filter rejected input for {model}; "
+            f"recording empty response so the run can continue. Detail: {exc}",
+            file=sys.stderr,
+            flush=True,
+        )
+        return LLMResponse(
+            content="",
+            latency_ms=round(latency_ms, 2),
+            input_tokens=0,
+            output_tokens=0,
+            audio_input_tokens=None,
+        )
+
+    @staticmethod
+    def _usage_tokens(usage: Any) -> Tuple[int | None, int | None, int | None]:
         input_tokens = None
         output_tokens = None
         prompt_tokens = None
@@ -638,6 +1552,13 @@ class MicrosoftPhiAdapter:
             input_tokens = prompt_tokens
         if output_tokens is None:
             output_tokens = completion_tokens
+        return input_tokens, output_tokens, audio_input_tokens
+
+    @staticmethod
+    def _to_llm_response(response: Dict[str, Any], start_time: float) -> LLMResponse:
+        latency_ms = (time.perf_counter() - start_time) * 1000.0
+        usage = response.get("usage") if isinstance(response, dict) else None
+        input_tokens, output_tokens, audio_input_tokens = MicrosoftPhiAdapter._usage_tokens(usage)
         content = ""
         if isinstance(response, dict):
             choices = response.get("choices") or []
@@ -652,8 +1573,129 @@ class MicrosoftPhiAdapter:
             audio_input_tokens=audio_input_tokens,
         )
 
+    def batch_request(self, model: str, prompt: str, inputs: Dict[str, Any],
+                      temperature: float = 0.0,
+                      response_schema: Dict[str, Any] | None = None) -> Dict[str, Any]:
+        """Chat-completions body for one line of a batch job file."""
+        return self._payload(model, prompt, inputs, temperature, response_schema)
+
+    @staticmethod
+    def batch_response(body: Dict[str, Any], latency_ms: float) -> LLMResponse:
+        """``LLMResponse`` from one chat-completions result of a batch job."""
+        response = MicrosoftPhiAdapter._to_llm_response(body, time.perf_counter())
+        return replace(response, latency_ms=round(latency_ms, 2), batched=True)
+
+    def generate(self, model: str, prompt: str, inputs: Dict[str, Any],
+                 modalities: List[str], temperature: float = 0.0,
+                 response_schema: Dict[str, Any] | None = None) -> LLMResponse:
+        payload = self._payload(model, prompt, inputs, temperature, response_schema)
+        start_time = time.perf_counter()
+        try:
+            response = self._post_json(payload, model_id=model)
+        except _PhiContentFilterError as exc:
+            return self._content_filter_response(model, exc, start_time)
+        return self._to_llm_response(response, start_time)
+
+    def generate_stream(self, model: str, prompt: str, inputs: Dict[str, Any],
+                        modalities: List[str], temperature: float = 0.0,
+                        stop_keys: List[str] | None = None,
+                        response_schema: Dict[str, Any] | None = None) -> LLMResponse:
+        """Server-sent-events variant of :meth:`generate` with early stop.
+
+        Deltas are fed to a :class:`JsonStopScanner`; once it reports the JSON
+        answer complete the connection is dropped, which cancels the rest of
+        the generation. Events that are not JSON (keep-alives) are skipped;
+        an ``error`` event is raised and retried like the HTTP error it names.
+        """
+        payload = self._payload(model, prompt, inputs, temperature, response_schema)
+        payload["stream"] = True
+        payload["stream_options"] = {"include_usage": True}
+        data = json.dumps(payload).encode("utf-8")
+        start_time = time.perf_counter()
+
+        def _consume(endpoint: Tuple[str, str]) -> Tuple[JsonStopScanner, Any]:
+            target_uri, api_key = endpoint
+            scanner = JsonStopScanner(stop_keys)
+            usage = None
+            lines = _connection_pool_for(target_uri).stream(data, self._headers(api_key))
+            try:
+                for raw in lines:
+                    line = raw.decode("utf-8", errors="replace").strip()
+                    if not line.startswith("data:"):
+                        continue
+                    event_text = line[len("data:"):].strip()
+                    if event_text == "[DONE]":
+                        break
+                    try:
+                        event = json.loads(event_text)
+                    except json.JSONDecodeError:
+                        print(
+                            f"[phi] {model}: skipping non-JSON stream event "
+                            f"{event_text[:80]!r}",
+                            file=sys.stderr,
+                            flush=True,
+                        )
+                        continue
+                    if not isinstance(event, dict):
+                        continue
+                    if event.get("error"):
+                        raise self._stream_error(event["error"])
+                    usage = event.get("usage") or usage
+                    pieces = [
+                        (choice.get("delta") or {}).get("content") or ""
+                        for choice in event.get("choices") or []
+                    ]
+                    if scanner.feed("".join(pieces)) is not None:
+                        break
+            except url_error.HTTPError as exc:
+                if exc.code in _RETRYABLE_STATUS_CODES:
+                    raise
+                detail = exc.read().decode("utf-8", errors="replace")
+                raise self._non_retryable_http_error(exc.code, exc.reason, detail) from exc
+            finally:
+                lines.close()
+            return scanner, usage
+
+        try:
+            scanner, usage = _retry_call(
+                lambda: self._pool.call(_consume),
+                description=f"Microsoft Phi stream ({model})",
+                model_id=model,
+            )
+        except _PhiContentFilterError as exc:
+            return self._content_filter_response(model, exc, start_time)
+        return _streamed_llm_response(
+            scanner, start_time, *self._usage_tokens(usage), prompt, inputs,
+        )
+
+    async def agenerate(self, model: str, prompt: str, inputs: Dict[str, Any],
+                        modalities: List[str], temperature: float = 0.0,
+                        response_schema: Dict[str, Any] | None = None) -> LLMResponse:
+        """Asyncio variant of :meth:`generate`.
+
+        Uses ``httpx.AsyncClient`` when httpx is installed; otherwise falls back
+        to running the blocking :meth:`generate` in the default executor so the
+        coroutine interface still works (just without the one-loop scaling).
+        """
+        try:
+            import httpx  # type: ignore  # noqa: F401
+        except ImportError:
+            return await asyncio.to_thread(
+                self.generate, model, prompt, inputs, modalities, temperature,
+                response_schema,
+            )
+        payload = self._payload(model, prompt, inputs, temperature, response_schema)
+        start_time = time.perf_counter()
+        try:
+            response = await self._apost_json(payload, model_id=model)
+        except _PhiContentFilterError as exc:
+            return self._content_filter_response(model, exc, start_time)
+        return self._to_llm_response(response, start_time)
+
 
 _ADAPTER_CACHE: Dict[str, Any] = {}
+# Parallel failover workers resolve adapters concurrently; build each one once.
+_ADAPTER_LOCK = threading.Lock()
 
 
 def get_llm_adapter(provider: str) -> Any:
@@ -680,12 +1722,16 @@ def get_llm_adapter(provider: str) -> Any:
     adapter = _ADAPTER_CACHE.get(provider_key)
     if adapter is not None:
         return adapter
-    if provider_key == "gemini":
-        adapter = GeminiAdapter()
-        _ADAPTER_CACHE[provider_key] = adapter
-        return adapter
-    if provider_key == "microsoft":
-        adapter = MicrosoftPhiAdapter()
-        _ADAPTER_CACHE[provider_key] = adapter
-        return adapter
+    with _ADAPTER_LOCK:
+        adapter = _ADAPTER_CACHE.get(provider_key)
+        if adapter is not None:
+            return adapter
+        if provider_key == "gemini":
+            adapter = GeminiAdapter()
+            _ADAPTER_CACHE[provider_key] = adapter
+            return adapter
+        if provider_key == "microsoft":
+            adapter = MicrosoftPhiAdapter()
+            _ADAPTER_CACHE[provider_key] = adapter
+            return adapter
     raise UnsupportedProviderError(f"provider '{provider}' is not supported yet")
@@ -0,0 +1,173 @@
+"""Bounded in-process LRU cache of audio/image bytes and their base64 form.
+
+Entries are keyed by path, mtime and size; ``LLM_MEDIA_CACHE_MB`` caps the
+cache (``0`` disables it).
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+# Cap on cached raw + base64 bytes (0 disables the cache); files at least
+# the mmap size are read through mmap.
+_MAX_BYTES = int(float(os.getenv("LLM_MEDIA_CACHE_MB", "256")) * 1024 * 1024)
+_MMAP_THRESHOLD = int(float(os.getenv("LLM_MEDIA_MMAP_MB", "1")) * 1024 * 1024)
+
+_Key = Tuple[str, int, int]
+
+
+class _Entry:
+    __slots__ = ("key", "data", "b64", "digest")
+
+    def __init__(self, key: _Key, data: bytes) -> None:
+        self.key = key
+        self.data = data
+        self.b64: Optional[str] = None
+        self.digest: Optional[str] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.data) + (len(self.b64) if self.b64 is not None else 0)
+
+
+def _read_file(path: Path, size: int) -> bytes:
+    if size < _MMAP_THRESHOLD or size == 0:
+        return path.read_bytes()
+    with path.open("rb") as handle:
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return bytes(mapped)
+
+
+class MediaCache:
+    """LRU map of media file contents keyed by path, mtime and size."""
+
+    def __init__(self, max_bytes: int = _MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[_Key, _Entry]" = OrderedDict()
+        self._total = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def _entry(self, value: Any) -> _Entry:
+        path = Path(value)
+        stat = path.stat()
+        key: _Key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry
+            self._misses += 1
+        # Read outside the lock so a large file doesn't stall other threads;
+        # two threads racing on the same miss just read it twice.
+        entry = _Entry(key, _read_file(path, stat.st_size))
+        if self.max_bytes > 0:
+            with self._lock:
+                existing = self._entries.get(key)
+                if existing is not None:
+                    return existing
+                self._entries[key] = entry
+                self._total += entry.size
+                self._evict()
+        return entry
+
+    def _grow(self, before: int, entry: _Entry) -> None:
+        with self._lock:
+            if self._entries.get(entry.key) is entry:
+                self._total += entry.size - before
+                self._evict()
+
+    def _evict(self) -> None:
+        while self._total > self.max_bytes and self._entries:
+            _, dropped = self._entries.popitem(last=False)
+            self._total -= dropped.size
+
+    def read(self, value: Any) -> bytes:
+        return self._entry(value).data
+
+    def b64(self, value: Any) -> str:
+        entry = self._entry(value)
+        if entry.b64 is None:
+            before = entry.size
+            entry.b64 = base64.b64encode(entry.data).decode("utf-8")
+            self._grow(before, entry)
+        return entry.b64
+
+    def digest(self, value: Any) -> str:
+        entry = self._entry(value)
+        if entry.digest is None:
+            entry.digest = hashlib.sha256(entry.data).hexdigest()
+        return entry.digest
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total = 0
+
+
+_CACHE = MediaCache()
+
+
+def _check(value: Any) -> None:
+    if not isinstance(value, (str, Path)):
+        raise TypeError("input must be bytes or a filesystem path.")
+
+
+def read_media(value: Any) -> bytes:
+    """Raw bytes of an audio/image input (``bytes`` or a filesystem path)."""
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    _check(value)
+    return _CACHE.read(value)
+
+
+def media_b64(value: Any) -> str:
+    """Base64 (UTF-8 str) of an audio/image input."""
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode("utf-8")
+    _check(value)
+    return _CACHE.b64(value)
+
+
+def media_digest(value: Any) -> str:
+    """SHA-256 hex digest of an audio/image input."""
+    if isinstance(value, (bytes, bytearray)):
+        return hashlib.sha256(value).hexdigest()
+    _check(value)
+    return _CACHE.digest(value)
+
+
+def media_cache_stats() -> Dict[str, int]:
+    return _CACHE.stats()
+
+
+def clear_media_cache() -> None:
+    _CACHE.clear()
+
+
+__all__ = [
+    "MediaCache",
+    "clear_media_cache",
+    "media_b64",
+    "media_cache_stats",
+    "media_digest",
+    "read_media",
+]
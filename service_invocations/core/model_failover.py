@@ -3,34 +3,49 @@
 If a model raises ``ModelUnavailableError`` (the adapter has exhausted its
 retries on transient errors), this runner stops processing that model's
 remaining samples, queues them, and moves on to the next model. Once every
-model has had a first pass, the runner drains the queue — sleeping for a
-cooldown period between passes — and gives up after a configurable number
-of attempts.
+model has had a first pass, the runner drains the queue — each deferred model
+after its own cooldown — and gives up after a configurable number of drain
+passes.
 
 Callers supply:
 - ``models``: the list of model names to run.
 - ``samples``: the sequence of samples to evaluate (opaque to the runner).
 - ``make_processor(model_name)``: builds the per-model setup (generator,
-  prompt, etc.) and returns a ``process(sample) -> dict | None`` callable.
-- ``on_progress(model, rows, is_final)``: optional callback fired each time
-  a model's batch finishes a pass — either run-to-completion, deferred, or
-  given up after the final drain pass. Use this to persist partial CSVs.
-
-  It is also fired mid-batch every ``checkpoint_every`` newly processed
-  samples, so a hard crash (OOM, SIGKILL, unexpected exception) loses at most
-  that many samples' work instead of the entire in-progress model pass. The
-  callback must therefore be idempotent — it always receives every row
-  accumulated so far, and the runners persist via keyed upserts.
+  prompt, etc.) and returns a ``process(sample) -> dict | list | None``
+  callable. A list holds one row per sample of a packed item; see
+  :func:`partial_failure` for one that fails part-way.
+- ``on_progress(model, rows, is_final)``: optional callback fired with the
+  rows collected since its previous call for that model, each time a model's
+  batch finishes a pass and every ``checkpoint_every`` samples mid-batch. The
+  runners persist via keyed upserts, so a repeated row is harmless.
 """
 
 from __future__ import annotations
 
+import heapq
+import itertools
+import math
 import os
 import sys
+import threading
 import time
-from typing import Any, Callable, Dict, List, Optional
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
+from service_invocations.core.batch_jobs import BatchRequestQueued
+from service_invocations.core.checkpoint_writer import (
+    checkpoint_writer,
+    write_behind_enabled,
+)
+from service_invocations.core.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    CircuitBreaker,
+    get_circuit_breaker,
+)
 from service_invocations.core.llm_adapters import ModelUnavailableError
+from service_invocations.models import get_model_max_in_flight
 
 _DEFAULT_COOLDOWN = float(os.getenv("LLM_FAILOVER_COOLDOWN", "30.0"))
 _DEFAULT_DRAIN_PASSES = int(os.getenv("LLM_FAILOVER_DRAIN_PASSES", "3"))
@@ -39,11 +54,12 @@ _DEFAULT_DRAIN_PASSES = int(os.getenv("LLM_FAILOVER_DRAIN_PASSES", "3"))
 # much tighter rate-limit quota than the other models and routinely exhausts its
 # retries mid-run, getting its remaining samples dropped. Give just that model a
 # longer cooldown between drain passes so its quota window has time to recover;
-# every other model keeps the default. The drain sleep is shared across all
-# pending models in a pass, so a pass waits the longest cooldown among the models
-# still pending — in practice gemini_3_5_flash is the lone late straggler, so it
-# is the only one that triggers the longer wait. Override via env, e.g.
-# LLM_FAILOVER_COOLDOWN_GEMINI_3_5_FLASH=240.
+# every other model keeps the default. Each deferred model waits only its own
+# cooldown (the drain scheduler keeps one timer per model), so the longer
+# window never delays the other models' drain passes. Override via env, e.g.
+# LLM_FAILOVER_COOLDOWN_GEMINI_3_5_FLASH=240. Declaring the model's quota
+# (requests_per_minute / tokens_per_minute in models.yaml) paces its calls up
+# front, so with a quota set this longer cooldown should rarely be reached.
 _MODEL_COOLDOWN_OVERRIDES: Dict[str, float] = {
     "gemini_3_5_flash": float(
         os.getenv("LLM_FAILOVER_COOLDOWN_GEMINI_3_5_FLASH", "180.0")
@@ -53,12 +69,31 @@ _MODEL_COOLDOWN_OVERRIDES: Dict[str, float] = {
 # mid-batch checkpoints (persist only at pass/defer boundaries, the old
 # behavior); ``1`` flushes after every sample.
 _DEFAULT_CHECKPOINT_EVERY = int(os.getenv("LLM_FAILOVER_CHECKPOINT_EVERY", "10"))
+# Run each model's passes on its own worker thread instead of one model after
+# another. Off by default so a single-model debugging run stays linear.
+_DEFAULT_PARALLEL_MODELS = os.getenv("LLM_FAILOVER_PARALLEL_MODELS", "").strip().lower() in {
+    "1", "true", "yes", "on",
+}
+
 
+# Distinguishes concurrent run_with_failover calls in the checkpoint writer.
+_SLICE_TOKENS = itertools.count()
 
-ProcessorFactory = Callable[[str], Callable[[Any], Optional[Dict[str, Any]]]]
+ProcessorResult = Union[Dict[str, Any], List[Dict[str, Any]], None]
+ProcessorFactory = Callable[[str], Callable[[Any], ProcessorResult]]
 ProgressCallback = Callable[[str, List[Dict[str, Any]], bool], None]
 
 
+def partial_failure(
+    exc: ModelUnavailableError, rows: List[Dict[str, Any]], unfinished: List[Any]
+) -> ModelUnavailableError:
+    """Attach a multi-sample item's finished ``rows`` and ``unfinished``
+    samples to ``exc``, for the processor to re-raise."""
+    exc.finished_rows = list(rows)
+    exc.unfinished = list(unfinished)
+    return exc
+
+
 def run_with_failover(
     *,
     models: List[str],
@@ -73,29 +108,87 @@ def run_with_failover(
     progress_prompt: Optional[str] = None,
     progress_total: Optional[int] = None,
     progress_task_dir: Optional[Any] = None,
+    parallel_models: bool = _DEFAULT_PARALLEL_MODELS,
+    max_in_flight: Optional[Union[int, Dict[str, int]]] = None,
+    models_path: Optional[Path] = None,
 ) -> Dict[str, List[Dict[str, Any]]]:
     results: Dict[str, List[Dict[str, Any]]] = {m: [] for m in models}
-    processors: Dict[str, Callable[[Any], Optional[Dict[str, Any]]]] = {}
+    processors: Dict[str, Callable[[Any], ProcessorResult]] = {}
+    # One lock per model keeps on_progress serialized for that model even when
+    # models run on separate workers (the callback is not required to be
+    # re-entrant for the same model).
+    progress_locks: Dict[str, threading.Lock] = {m: threading.Lock() for m in models}
+    # Non-final checkpoints go through the write-behind writer, keyed per call
+    # so two slices running the same model never coalesce into each other.
+    writer = checkpoint_writer()
+    write_behind = write_behind_enabled()
+    slice_token = next(_SLICE_TOKENS)
+    # How many of each model's rows have been handed to a checkpoint (guarded
+    # by emit_locks, not progress_locks, so taking a delta never waits on a
+    # write in progress), and rows whose on_progress call raised, retried with
+    # the next checkpoint (guarded by progress_locks).
+    emitted: Dict[str, int] = {m: 0 for m in models}
+    emit_locks: Dict[str, threading.Lock] = {m: threading.Lock() for m in models}
+    unwritten: Dict[str, List[Dict[str, Any]]] = {m: [] for m in models}
+
+    def _in_flight_limit(model: str) -> int:
+        """Explicit ``max_in_flight`` argument first, then models.yaml."""
+        if isinstance(max_in_flight, int):
+            return max(1, max_in_flight)
+        if isinstance(max_in_flight, dict) and model in max_in_flight:
+            return max(1, int(max_in_flight[model]))
+        return get_model_max_in_flight(model, models_path)
 
-    def _get_processor(model: str) -> Callable[[Any], Optional[Dict[str, Any]]]:
+    def _get_processor(model: str) -> Callable[[Any], ProcessorResult]:
         proc = processors.get(model)
         if proc is None:
             proc = make_processor(model)
             processors[model] = proc
         return proc
 
+    def _write_progress(model: str, rows: List[Dict[str, Any]], is_final: bool) -> None:
+        with progress_locks[model]:
+            if on_progress is not None:
+                if unwritten[model]:
+                    rows = unwritten[model] + rows
+                    unwritten[model] = []
+                try:
+                    on_progress(model, rows, is_final)
+                except Exception as exc:
+                    unwritten[model] = rows
+                    print(
+                        f"[failover] on_progress callback for '{model}' raised "
+                        f"{type(exc).__name__}: {exc}. Continuing; its "
+                        f"{len(rows)} row(s) go out with the next checkpoint.",
+                        file=sys.stderr,
+                        flush=True,
+                    )
+            _record_progress(model)
+
     def _emit_progress(model: str, is_final: bool) -> None:
-        if on_progress is not None:
-            try:
-                on_progress(model, list(results[model]), is_final)
-            except Exception as exc:
-                print(
-                    f"[failover] on_progress callback for '{model}' raised "
-                    f"{type(exc).__name__}: {exc}. Continuing.",
-                    file=sys.stderr,
-                    flush=True,
-                )
-        _record_progress(model)
+        """Checkpoint ``model``'s new rows — on the writer thread unless final.
+
+        The delta is taken here, on the model's thread, so each checkpoint
+        carries exactly the rows collected since the previous one. A final
+        emit first writes whatever is still queued for the model, so deltas
+        reach ``on_progress`` in order and the final one always lands last.
+        """
+        with emit_locks[model]:
+            end = len(results[model])
+            rows = results[model][emitted[model]:end]
+            emitted[model] = end
+        key = (slice_token, model)
+        if not is_final and write_behind:
+            writer.submit(
+                key, rows, lambda batch: _write_progress(model, batch, False)
+            )
+            return
+        writer.flush(key)
+        _write_progress(model, rows, is_final)
+
+    def _flush_checkpoints() -> None:
+        for model in models:
+            writer.flush((slice_token, model))
 
     def _record_progress(model: str) -> None:
         """Mirror this slice's progress into run_status.json (best-effort).
@@ -103,17 +196,19 @@ def run_with_failover(
         Counts the unique sample ids already persisted to the consolidated CSV
         — the source of truth — so the tally is correct across resumes (it
         includes work done in earlier sessions, not just this process's rows).
-        on_progress has already flushed the current rows, so the CSV is current.
+        on_progress has already journaled the current rows, which keeps
+        ``results_io``'s in-process id index current, so this is a lookup
+        rather than a re-read of the CSV.
         """
         if progress_task is None or progress_task_dir is None:
             return
         try:
             from service_invocations.core import run_context as _rc
-            from service_invocations.core.results_io import load_completed_ids
+            from service_invocations.core.results_io import completed_count
 
-            done = len(load_completed_ids(
+            done = completed_count(
                 progress_task_dir, progress_paradigm, progress_prompt, model
-            ))
+            )
             total = progress_total if progress_total is not None else done
             _rc.record_progress(
                 progress_task, progress_paradigm, progress_prompt, model, done, total,
@@ -121,6 +216,22 @@ def run_with_failover(
         except Exception:
             pass
 
+    def _collect(model: str, row: ProcessorResult) -> int:
+        """Append a processor's row(s) to the model's results; return the count."""
+        if row is None:
+            return 0
+        rows = row if isinstance(row, list) else [row]
+        results[model].extend(rows)
+        return len(rows)
+
+    def _salvage(model: str, exc: ModelUnavailableError, item: Any) -> List[Any]:
+        """Keep the rows a failed item finished; return what is left of it."""
+        rows = getattr(exc, "finished_rows", None)
+        unfinished = getattr(exc, "unfinished", None)
+        exc.finished_rows = exc.unfinished = None
+        _collect(model, rows or None)
+        return [item] if unfinished is None else unfinished
+
     def _run_batch(model: str, batch: List[Any]) -> List[Any]:
         """Process ``batch`` for ``model``. Returns samples that were deferred.
 
@@ -135,86 +246,296 @@ def run_with_failover(
         pass. The boundary emits done by the caller still run; the extra writes
         are idempotent upserts, so they never duplicate rows.
         """
+        breaker = get_circuit_breaker(model)
+        if not breaker.allow():
+            return _short_circuit(model, breaker, batch)
         processor = _get_processor(model)
+        if breaker.state == HALF_OPEN:
+            deferred, batch = _probe(model, breaker, batch, processor)
+            if breaker.state != CLOSED:
+                return deferred + _short_circuit(model, breaker, batch)
+        limit = _in_flight_limit(model)
+        if limit > 1:
+            return _run_batch_concurrent(model, batch, processor, limit)
+        return _run_batch_sequential(model, batch, processor)
+
+    def _probe(
+        model: str,
+        breaker: CircuitBreaker,
+        batch: List[Any],
+        processor: Callable[[Any], ProcessorResult],
+    ) -> Tuple[List[Any], List[Any]]:
+        """Send samples one at a time until the provider answers one.
+
+        We hold the half-open probe, so the floodgates reopen only on a real
+        result: a sample with rows closes the breaker, a failure re-opens it.
+        Samples that produce nothing (already done, or queued for a batch
+        job) don't count; if the batch runs out first, the probe is handed
+        back with the breaker still half-open, as it is when anything else
+        escapes the processor. Returns ``(deferred, rest)``.
+        """
+        try:
+            for idx, sample in enumerate(batch):
+                try:
+                    row = processor(sample)
+                except BatchRequestQueued:
+                    continue
+                except ModelUnavailableError as exc:
+                    deferred = _handle_unavailable(model, exc, _salvage(model, exc, sample))
+                    return deferred, list(batch[idx + 1:])
+                if _collect(model, row):
+                    breaker.record_success()
+                    return [], list(batch[idx + 1:])
+        except BaseException:
+            # No-op once the probe has closed or re-opened the breaker.
+            breaker.release_probe()
+            raise
+        breaker.release_probe()
+        return [], []
+
+    def _run_batch_sequential(
+        model: str,
+        batch: List[Any],
+        processor: Callable[[Any], ProcessorResult],
+    ) -> List[Any]:
         since_checkpoint = 0
         for idx, sample in enumerate(batch):
             try:
                 row = processor(sample)
+            except BatchRequestQueued:
+                continue
             except ModelUnavailableError as exc:
-                remaining = batch[idx:]
-                if getattr(exc, "fatal", False):
-                    print(
-                        f"[failover] Model '{model}' permanently unavailable: {exc}. "
-                        f"Skipping {len(remaining)} remaining sample(s) "
-                        f"(no retry).",
-                        file=sys.stderr,
-                        flush=True,
-                    )
-                    return []
+                remaining = _salvage(model, exc, sample) + list(batch[idx + 1:])
+                return _handle_unavailable(model, exc, remaining)
+            since_checkpoint += _collect(model, row)
+            if checkpoint_every > 0 and since_checkpoint >= checkpoint_every:
+                _emit_progress(model, is_final=False)
+                since_checkpoint = 0
+        return []
+
+    def _run_batch_concurrent(
+        model: str,
+        batch: List[Any],
+        processor: Callable[[Any], ProcessorResult],
+        limit: int,
+    ) -> List[Any]:
+        """``_run_batch`` with up to ``limit`` samples in flight at once.
+
+        Submission is windowed rather than all-up-front, so a model that goes
+        unavailable stops taking new samples immediately. Rows are collected
+        and checkpointed on this (the model's) thread only, keeping
+        ``on_progress`` serialized for the model.
+        """
+        since_checkpoint = 0
+        next_idx = 0
+        failed: List[Tuple[int, List[Any]]] = []
+        failure: Optional[ModelUnavailableError] = None
+        in_flight: Dict[Future, int] = {}
+        with ThreadPoolExecutor(
+            max_workers=limit, thread_name_prefix=f"failover-{model}"
+        ) as pool:
+            while in_flight or (failure is None and next_idx < len(batch)):
+                while failure is None and next_idx < len(batch) and len(in_flight) < limit:
+                    in_flight[pool.submit(processor, batch[next_idx])] = next_idx
+                    next_idx += 1
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    idx = in_flight.pop(future)
+                    try:
+                        row = future.result()
+                    except BatchRequestQueued:
+                        continue
+                    except ModelUnavailableError as exc:
+                        failed.append((idx, _salvage(model, exc, batch[idx])))
+                        # A fatal error wins over a transient one: it decides
+                        # whether the leftovers are dropped or deferred.
+                        if failure is None or (
+                            getattr(exc, "fatal", False)
+                            and not getattr(failure, "fatal", False)
+                        ):
+                            failure = exc
+                        continue
+                    since_checkpoint += _collect(model, row)
+                    if checkpoint_every > 0 and since_checkpoint >= checkpoint_every:
+                        _emit_progress(model, is_final=False)
+                        since_checkpoint = 0
+        if failure is None:
+            return []
+        remaining = [item for _, left in sorted(failed, key=lambda f: f[0]) for item in left]
+        remaining += list(batch[next_idx:])
+        return _handle_unavailable(model, failure, remaining)
+
+    def _short_circuit(model: str, breaker: CircuitBreaker, batch: List[Any]) -> List[Any]:
+        """Skip ``batch`` without calling the provider while the circuit is open."""
+        if not batch:
+            return []
+        if breaker.fatal:
+            print(
+                f"[failover] Circuit open for '{model}' ({breaker.reason}). "
+                f"Skipping {len(batch)} sample(s) (no retry).",
+                file=sys.stderr,
+                flush=True,
+            )
+            return []
+        print(
+            f"[failover] Circuit open for '{model}' "
+            f"(probe in {breaker.retry_in():.0f}s). "
+            f"Deferring {len(batch)} sample(s) to the queue.",
+            file=sys.stderr,
+            flush=True,
+        )
+        return list(batch)
+
+    def _handle_unavailable(
+        model: str, exc: ModelUnavailableError, remaining: List[Any]
+    ) -> List[Any]:
+        get_circuit_breaker(model).trip(exc, _cooldown_for(model))
+        if getattr(exc, "fatal", False):
+            print(
+                f"[failover] Model '{model}' permanently unavailable: {exc}. "
+                f"Skipping {len(remaining)} remaining sample(s) "
+                f"(no retry).",
+                file=sys.stderr,
+                flush=True,
+            )
+            return []
+        print(
+            f"[failover] Model '{model}' unavailable: {exc}. "
+            f"Deferring {len(remaining)} sample(s) to the queue.",
+            file=sys.stderr,
+            flush=True,
+        )
+        return remaining
+
+    def _cooldown_for(model: str) -> float:
+        return _MODEL_COOLDOWN_OVERRIDES.get(model, cooldown_seconds)
+
+    def _drain_delay(model: str) -> float:
+        """Wait before the next drain pass: the model's cooldown, stretched to
+        cover an open circuit (another paradigm may have re-tripped it)."""
+        retry_in = get_circuit_breaker(model).retry_in()
+        if math.isinf(retry_in):
+            retry_in = 0.0
+        return max(_cooldown_for(model), retry_in)
+
+    def _give_up(model: str, remaining: List[Any]) -> None:
+        print(
+            f"[failover] Giving up on '{model}' after "
+            f"{max_drain_passes} drain pass(es); "
+            f"{len(remaining)} sample(s) unprocessed.",
+            file=sys.stderr,
+            flush=True,
+        )
+
+    def _run_model(model: str) -> None:
+        """First pass plus this model's own drain passes (parallel mode).
+
+        Each model sleeps only its own cooldown, so a tight-quota straggler
+        never holds up the drain passes of the others.
+        """
+        remaining = _run_batch(model, list(samples))
+        for pass_idx in range(max_drain_passes):
+            if not remaining:
+                break
+            _emit_progress(model, is_final=False)
+            cooldown = _drain_delay(model)
+            if cooldown > 0:
                 print(
-                    f"[failover] Model '{model}' unavailable: {exc}. "
-                    f"Deferring {len(remaining)} sample(s) to the queue.",
+                    f"[failover] Drain pass {pass_idx + 1}/{max_drain_passes} "
+                    f"for '{model}': {len(remaining)} sample(s) pending. "
+                    f"Cooling down {cooldown:.0f}s.",
                     file=sys.stderr,
                     flush=True,
                 )
-                return remaining
-            if row is not None:
-                results[model].append(row)
-                since_checkpoint += 1
-                if checkpoint_every > 0 and since_checkpoint >= checkpoint_every:
-                    _emit_progress(model, is_final=False)
-                    since_checkpoint = 0
-        return []
+                time.sleep(cooldown)
+            remaining = _run_batch(model, remaining)
+        if remaining and max_drain_passes > 0:
+            _give_up(model, remaining)
+        _emit_progress(model, is_final=True)
 
-    pending: Dict[str, List[Any]] = {}
+    def _compact_slice() -> None:
+        """Fold this slice's checkpoint journal into the consolidated CSV."""
+        if progress_task_dir is None or progress_paradigm is None:
+            return
+        try:
+            from service_invocations.core.results_io import compact_results
 
-    for model in models:
-        remaining = _run_batch(model, list(samples))
-        if remaining:
-            pending[model] = remaining
-            _emit_progress(model, is_final=False)
-        else:
-            _emit_progress(model, is_final=True)
-
-    for pass_idx in range(max_drain_passes):
-        if not pending:
-            break
-        is_last_pass = pass_idx == max_drain_passes - 1
-        # Per-model cooldown: a pass waits the longest cooldown among the models
-        # still pending, so a tighter-quota model (see _MODEL_COOLDOWN_OVERRIDES)
-        # gets its longer recovery window without penalizing passes it isn't in.
-        effective_cooldown = max(
-            _MODEL_COOLDOWN_OVERRIDES.get(m, cooldown_seconds) for m in pending
-        )
-        if effective_cooldown > 0:
+            compact_results(progress_task_dir, progress_paradigm)
+        except Exception as exc:
             print(
-                f"[failover] Drain pass {pass_idx + 1}/{max_drain_passes}: "
-                f"{len(pending)} model(s) pending "
-                f"({', '.join(sorted(pending))}). "
-                f"Cooling down {effective_cooldown:.0f}s.",
+                f"[failover] compacting {progress_paradigm} results raised "
+                f"{type(exc).__name__}: {exc}. The journal is folded in later.",
                 file=sys.stderr,
                 flush=True,
             )
-            time.sleep(effective_cooldown)
-        next_pending: Dict[str, List[Any]] = {}
-        for model, batch in pending.items():
+
+    # Checkpoints still queued on the writer are written on the way out
+    # however the pass ends (an exception or KeyboardInterrupt included),
+    # before the journal is compacted.
+    if parallel_models and len(models) > 1:
+        try:
+            with ThreadPoolExecutor(
+                max_workers=len(models), thread_name_prefix="failover"
+            ) as pool:
+                futures = [pool.submit(_run_model, model) for model in models]
+                for future in futures:
+                    future.result()
+        finally:
+            _flush_checkpoints()
+        _compact_slice()
+        return results
+
+    # Event-driven drain: every deferred model gets its own ready time on a
+    # timer heap, and whichever window elapses first is drained first, so a
+    # tight-quota model's long cooldown doesn't stall the others.
+    pending: Dict[str, List[Any]] = {}
+    drain_counts: Dict[str, int] = {}
+    timers: List[Tuple[float, int, str]] = []
+    order = itertools.count()
+
+    def _defer(model: str, remaining: List[Any]) -> None:
+        pending[model] = remaining
+        ready_at = time.monotonic() + _drain_delay(model)
+        heapq.heappush(timers, (ready_at, next(order), model))
+
+    try:
+        for model in models:
+            remaining = _run_batch(model, list(samples))
+            if remaining and max_drain_passes > 0:
+                _defer(model, remaining)
+                _emit_progress(model, is_final=False)
+            else:
+                _emit_progress(model, is_final=True)
+
+        while timers:
+            ready_at, _, model = heapq.heappop(timers)
+            batch = pending.pop(model)
+            drain_counts[model] = drain_counts.get(model, 0) + 1
+            pass_idx = drain_counts[model]
+            delay = ready_at - time.monotonic()
+            if delay > 0:
+                waiting = sorted(m for m in pending if m != model)
+                print(
+                    f"[failover] Drain pass {pass_idx}/{max_drain_passes} "
+                    f"for '{model}': {len(batch)} sample(s) pending. "
+                    f"Cooling down {delay:.0f}s"
+                    + (f" (also waiting: {', '.join(waiting)})." if waiting else "."),
+                    file=sys.stderr,
+                    flush=True,
+                )
+                time.sleep(delay)
             remaining = _run_batch(model, batch)
-            if remaining and not is_last_pass:
-                next_pending[model] = remaining
+            if remaining and pass_idx < max_drain_passes:
+                _defer(model, remaining)
                 _emit_progress(model, is_final=False)
             else:
                 if remaining:
-                    print(
-                        f"[failover] Giving up on '{model}' after "
-                        f"{max_drain_passes} drain pass(es); "
-                        f"{len(remaining)} sample(s) unprocessed.",
-                        file=sys.stderr,
-                        flush=True,
-                    )
+                    _give_up(model, remaining)
                 _emit_progress(model, is_final=True)
-        pending = next_pending
-
+    finally:
+        _flush_checkpoints()
+    _compact_slice()
     return results
 
 
-__all__ = ["run_with_failover", "ModelUnavailableError"]
+__all__ = ["run_with_failover", "partial_failure", "ModelUnavailableError"]
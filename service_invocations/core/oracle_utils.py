@@ -1,7 +1,9 @@
+import ast
 import json
 import os
 import re
 import sys
+import threading
 import time
 from pathlib import Path
 from typing import Any, Callable, TypeVar
@@ -13,15 +15,106 @@ _NULLISH_STRINGS = {"", "n/a", "na", "null", "none", "nan"}
 
 _DEFAULT_OUTPUT_RETRIES = int(os.getenv("LLM_OUTPUT_RETRIES", "3"))
 _DEFAULT_OUTPUT_RETRY_DELAY = float(os.getenv("LLM_OUTPUT_RETRY_DELAY", "1.0"))
+# The salvage pass only looks at this many characters of a response and this
+# many brace-balanced candidates, so a runaway completion can't stall parsing.
+_SALVAGE_MAX_CHARS = int(os.getenv("LLM_SALVAGE_MAX_CHARS", "20000"))
+_SALVAGE_MAX_CANDIDATES = 16
+# How often (in parsed responses per model) salvage counters are mirrored into
+# run_status.json; salvaged and failed parses are always published.
+_SALVAGE_PUBLISH_EVERY = 25
+
+_PLACEHOLDER_RE = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+_PY_LITERALS = {"None": "null", "True": "true", "False": "false"}
 
 T = TypeVar("T")
 
 
+class RenderedPrompt(str):
+    """A rendered prompt that remembers its template's static prefix.
+
+    Behaves as the plain prompt string everywhere; the generator layer reads
+    ``static_prefix`` to register it with providers that cache context.
+    """
+
+    static_prefix: str
+
+    def __new__(cls, text: str, static_prefix: str = "") -> "RenderedPrompt":
+        rendered = super().__new__(cls, text)
+        rendered.static_prefix = static_prefix
+        return rendered
+
+    def __add__(self, other: str) -> "RenderedPrompt":
+        # Text appended after the template (a packing or batching addendum)
+        # leaves its prefix intact, so keep it for the context cache.
+        joined = super().__add__(other)
+        if joined is NotImplemented:
+            return joined
+        return RenderedPrompt(joined, self.static_prefix)
+
+
+class CompiledPrompt:
+    """A prompt template split once into literal text and ``{name}`` slots.
+
+    ``static_prefix`` is the literal text before the first slot — identical
+    for every sample rendered from the template, so it can be cached
+    provider-side. Slots not passed to :meth:`render` are left as written.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self._literals: list[str] = []
+        self._slots: list[str] = []
+        pos = 0
+        for match in _PLACEHOLDER_RE.finditer(text):
+            self._literals.append(text[pos:match.start()])
+            self._slots.append(match.group(1))
+            pos = match.end()
+        self._literals.append(text[pos:])
+
+    @property
+    def slots(self) -> tuple[str, ...]:
+        return tuple(self._slots)
+
+    @property
+    def static_prefix(self) -> str:
+        return self._literals[0]
+
+    def render(self, **substitutions: Any) -> RenderedPrompt:
+        pieces = [self._literals[0]]
+        for slot, literal in zip(self._slots, self._literals[1:]):
+            pieces.append(str(substitutions[slot]) if slot in substitutions else "{" + slot + "}")
+            pieces.append(literal)
+        return RenderedPrompt("".join(pieces), self.static_prefix)
+
+
+_TEMPLATES: dict[str, tuple[tuple[int, int], CompiledPrompt]] = {}
+_TEMPLATES_LOCK = threading.Lock()
+
+
+def compile_prompt(path: Path | str) -> CompiledPrompt:
+    """The compiled template for ``path``, read from disk once.
+
+    Cached by resolved path and re-read only when the file's mtime or size
+    changes, so judge/human-loop processors can call this per sample for the
+    price of a ``stat``.
+    """
+    resolved = Path(path).resolve()
+    stat = resolved.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    key = str(resolved)
+    with _TEMPLATES_LOCK:
+        cached = _TEMPLATES.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+    compiled = CompiledPrompt(resolved.read_text(encoding="utf-8"))
+    with _TEMPLATES_LOCK:
+        _TEMPLATES[key] = (stamp, compiled)
+    return compiled
+
+
 def load_prompt(path: Path | str, **substitutions: str) -> str:
-    text = Path(path).read_text(encoding="utf-8")
-    for key, value in substitutions.items():
-        text = text.replace("{" + key + "}", str(value))
-    return text
+    """Render the prompt at ``path`` (see :func:`compile_prompt`)."""
+    return compile_prompt(path).render(**substitutions)
 
 
 def resolve_prompt_path(prompts_root: Path, paradigm: str, prompt_name: str) -> Path:
@@ -38,38 +131,203 @@ def _strip_code_fence(content: str) -> str:
     return match.group(1) if match else content
 
 
-def parse_json_payload(content: str) -> dict:
-    """Strip an optional ```json ... ``` fence and parse the response as a dict.
+def _balanced_objects(text: str) -> list[str]:
+    """Top-level ``{...}`` spans in ``text``, string-aware, in order.
 
-    Returns ``{}`` when the content is missing, malformed, or not a JSON object.
-    Use this instead of bare ``json.loads(resp.content)`` so callers tolerate
-    models that wrap their output in markdown fences.
+    Quotes are only tracked inside braces (so an apostrophe in a leading
+    sentence doesn't swallow the object), and either quote character opens a
+    string so single-quoted pseudo-JSON still balances.
     """
-    if content is None:
-        return {}
+    spans: list[str] = []
+    depth = 0
+    start = -1
+    quote = ""
+    escape = False
+    for i, ch in enumerate(text):
+        if depth == 0:
+            if ch == "{":
+                depth, start = 1, i
+            continue
+        if quote:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == quote:
+                quote = ""
+            continue
+        if ch in "\"'":
+            quote = ch
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                spans.append(text[start:i + 1])
+                if len(spans) >= _SALVAGE_MAX_CANDIDATES:
+                    break
+    return spans
+
+
+def _string_end(text: str, start: int) -> int:
+    """Index of the quote closing the string opened at ``start`` (or -1)."""
+    quote = text[start]
+    i = start + 1
+    while i < len(text):
+        if text[i] == "\\":
+            i += 2
+            continue
+        if text[i] == quote:
+            return i
+        i += 1
+    return -1
+
+
+def _repair(candidate: str) -> str:
+    """Small repair pass: trailing commas, Python literals, single quotes.
+
+    Only the structure between string tokens is rewritten, so a value such
+    as ``"None of the True believers"`` or ``"it's"`` comes through intact.
+    A single-quoted string is re-encoded as a JSON string.
+    """
+    out: list[str] = []
+    i = 0
+    while i < len(candidate):
+        ch = candidate[i]
+        if ch in "\"'":
+            end = _string_end(candidate, i)
+            if end < 0:
+                out.append(candidate[i:])
+                break
+            token = candidate[i:end + 1]
+            if ch == "'":
+                try:
+                    token = json.dumps(ast.literal_eval(token), ensure_ascii=False)
+                except (SyntaxError, ValueError):
+                    pass
+            out.append(token)
+            i = end + 1
+        elif ch == ",":
+            rest = candidate[i + 1:].lstrip()
+            if not rest.startswith(("}", "]")):
+                out.append(ch)
+            i += 1
+        elif ch.isalpha():
+            end = i
+            while end < len(candidate) and (candidate[end].isalnum() or candidate[end] == "_"):
+                end += 1
+            word = candidate[i:end]
+            out.append(_PY_LITERALS.get(word, word))
+            i = end
+        else:
+            out.append(ch)
+            i += 1
+    return "".join(out)
+
+
+def _loads_dict(text: str) -> dict | None:
     try:
-        payload = json.loads(_strip_code_fence(content).strip())
-    except (json.JSONDecodeError, TypeError):
-        return {}
-    return payload if isinstance(payload, dict) else {}
+        payload = json.loads(text)
+    except (json.JSONDecodeError, TypeError, ValueError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def salvage_json_object(content: str) -> dict | None:
+    """Best-effort recovery of the answer object from a messy response.
+
+    Covers a leading sentence, trailing commentary, several objects (the last
+    well-formed one wins — models tend to restate a corrected answer last),
+    single quotes, trailing commas and Python ``None``/``True``/``False``.
+    Bounded by ``LLM_SALVAGE_MAX_CHARS``; returns ``None`` when nothing
+    parses.
+    """
+    if not content:
+        return None
+    for candidate in reversed(_balanced_objects(content[:_SALVAGE_MAX_CHARS])):
+        payload = _loads_dict(candidate)
+        if payload is None:
+            payload = _loads_dict(_repair(candidate))
+        if payload is not None:
+            return payload
+    return None
+
+
+class _SalvageStats:
+    """Per-model counts of clean / salvaged / failed response parses."""
+
+    def __init__(self) -> None:
+        self._counts: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, outcome: str) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(
+                model, {"clean": 0, "salvaged": 0, "failed": 0}
+            )
+            counts[outcome] += 1
+            total = sum(counts.values())
+            snapshot = dict(counts)
+        if outcome != "clean" or total % _SALVAGE_PUBLISH_EVERY == 0:
+            snapshot["salvage_rate"] = round(snapshot["salvaged"] / total, 4)
+            try:
+                from service_invocations.core import run_context as rc
+
+                rc.record_salvage(model, snapshot)
+            except Exception:
+                pass
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {model: dict(counts) for model, counts in self._counts.items()}
+
+
+_SALVAGE_STATS = _SalvageStats()
+
+
+def salvage_stats() -> dict[str, dict[str, int]]:
+    """Per-model parse outcomes so far in this process."""
+    return _SALVAGE_STATS.snapshot()
 
 
-def extract_oracle(content: str, key: str = "llm_oracle") -> Any:
+def _parse_object(content: str | None, model: str | None) -> dict | None:
+    """Strict parse first, then salvage; tallies the outcome for ``model``."""
+    if content is None:
+        return None
+    payload = _loads_dict(_strip_code_fence(content).strip())
+    outcome = "clean"
+    if payload is None:
+        payload = salvage_json_object(content)
+        outcome = "failed" if payload is None else "salvaged"
+    if model is not None:
+        _SALVAGE_STATS.record(model, outcome)
+    return payload
+
+
+def parse_json_payload(content: str, model: str | None = None) -> dict:
+    """Strip an optional ```json ... ``` fence and parse the response as a dict.
+
+    Returns ``{}`` when the content is missing, or not a JSON object even after
+    :func:`salvage_json_object` has tried to recover one. Use this instead of
+    bare ``json.loads(resp.content)`` so callers tolerate models that wrap
+    their output in fences or prose. Pass ``model`` to count the outcome in the
+    per-model salvage stats (``json_salvage`` in run_status.json).
+    """
+    payload = _parse_object(content, model)
+    return payload if payload is not None else {}
+
+
+def extract_oracle(content: str, key: str = "llm_oracle", model: str | None = None) -> Any:
     """Extract the oracle payload from a model response.
 
     ``key`` is the JSON field the prompt instructs the model to return
     (e.g. ``"transcript"`` for ASR, ``"translation"`` for MT, ``"scores"``
-    for emotion). If the response can't be parsed or the key is missing,
-    returns ``"n/a"`` so ``is_nullish_output`` can route it through retry.
+    for emotion). If the response can't be parsed (or salvaged) or the key is
+    missing, returns ``"n/a"`` so ``is_nullish_output`` can route it through
+    retry. ``model`` is as in :func:`parse_json_payload`.
     """
-    if content is None:
-        return "n/a"
-    candidate = _strip_code_fence(content).strip()
-    try:
-        payload = json.loads(candidate)
-    except json.JSONDecodeError:
-        return "n/a"
-    if not isinstance(payload, dict):
+    payload = _parse_object(content, model)
+    if payload is None:
         return "n/a"
     return payload.get(key, "n/a")
 
@@ -135,12 +393,17 @@ _normalize_id = normalize_id
 _TRUTHY = {"1", "true", "yes", "on"}
 
 
-def is_fresh_run_requested(explicit: bool = False) -> bool:
-    """True when callers want resume disabled — either via explicit param or
-    the ``LLM_FRESH_RUN`` env var. Centralized here so every runner agrees on
-    the parsing rules."""
-    if explicit:
-        return True
+def is_fresh_run_requested(explicit: bool | None = None) -> bool:
+    """True when callers want resume disabled — the explicit param when given,
+    else the ``LLM_FRESH_RUN`` env var. Centralized here so every runner
+    agrees on the parsing rules.
+
+    An explicit ``False`` wins over ``LLM_FRESH_RUN=1``: ``batch_jobs``
+    passes it to its replay rounds so they resume from the rows the first
+    round wrote instead of clearing them again.
+    """
+    if explicit is not None:
+        return bool(explicit)
     return os.getenv("LLM_FRESH_RUN", "").strip().lower() in _TRUTHY
 
 
@@ -16,6 +16,8 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
+from service_invocations.core.results_io import read_results
+
 
 # Per-task metric configuration.
 #   metric_col: the column in accuracy_summary.csv to plot
@@ -62,13 +64,12 @@ def _ensure_dir(path: Path) -> Path:
 
 
 def _read_csv_or_none(path: Path) -> pd.DataFrame | None:
-    if not path.exists():
-        return None
+    # read_results merges a paradigm file's not-yet-compacted journal rows.
     try:
-        df = pd.read_csv(path)
+        df = read_results(path)
     except pd.errors.EmptyDataError:
         return None
-    return df if not df.empty else None
+    return df if df is not None and not df.empty else None
 
 
 def _avg_suffix(df: pd.DataFrame | None) -> str:
@@ -0,0 +1,180 @@
+"""Per-model token-bucket rate limiting driven by models.yaml quotas.
+
+A model entry with ``requests_per_minute`` / ``tokens_per_minute`` gets a
+process-wide limiter; tokens are estimated before each attempt and settled
+from the usage the response reports.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Declared quotas are scaled by this so bursts land just under the window.
+_HEADROOM = float(os.getenv("LLM_RATE_LIMIT_HEADROOM", "0.95"))
+
+# Rough token allowances used only for the pre-call estimate; the real usage
+# reported by the provider corrects the bucket afterwards.
+_CHARS_PER_TOKEN = 4
+_AUDIO_BYTES_PER_TOKEN = 1000  # 16 kHz/16-bit mono WAV at ~32 tokens/second
+_IMAGE_TOKENS = 258
+
+
+class TokenBucket:
+    """A classic token bucket that allows its balance to go negative.
+
+    ``reserve(amount)`` debits immediately and returns how long the caller must
+    wait for the balance to be non-negative again. Debiting up front (instead
+    of waiting for the tokens first) keeps concurrent callers in FIFO order and
+    lets :meth:`adjust` reconcile estimates after the fact.
+    """
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = max(1.0, float(per_minute))
+        self.rate = self.capacity / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # A single request larger than the bucket could never be admitted;
+            # cap it at a full bucket so it waits one window instead of forever.
+            self._tokens -= min(float(amount), self.capacity)
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def adjust(self, delta: float) -> None:
+        """Debit (``delta > 0``) or refund (``delta < 0``) tokens."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens - float(delta))
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+class RateLimiter:
+    """Request- and token-per-minute limits for one model."""
+
+    def __init__(
+        self,
+        model_name: str,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+    ) -> None:
+        self.model_name = model_name
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = (
+            TokenBucket(requests_per_minute * _HEADROOM) if requests_per_minute else None
+        )
+        self._tokens = (
+            TokenBucket(tokens_per_minute * _HEADROOM) if tokens_per_minute else None
+        )
+
+    def _reserve(self, estimated_tokens: int) -> float:
+        wait = 0.0
+        if self._requests is not None:
+            wait = max(wait, self._requests.reserve(1))
+        if self._tokens is not None:
+            wait = max(wait, self._tokens.reserve(estimated_tokens))
+        return wait
+
+    def acquire(self, estimated_tokens: int = 0) -> float:
+        """Block until a call with ``estimated_tokens`` fits; return the wait."""
+        wait = self._reserve(estimated_tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, estimated_tokens: int = 0) -> float:
+        """Asyncio variant of :meth:`acquire` (sleeps without blocking the loop)."""
+        wait = self._reserve(estimated_tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def settle(self, estimated_tokens: int, response: Any) -> None:
+        """Reconcile the token bucket with the usage the response reported."""
+        if self._tokens is None:
+            return
+        input_tokens = getattr(response, "input_tokens", None)
+        output_tokens = getattr(response, "output_tokens", None)
+        if input_tokens is None and output_tokens is None:
+            return
+        actual = int(input_tokens or 0) + int(output_tokens or 0)
+        self._tokens.adjust(actual - estimated_tokens)
+
+
+def estimate_tokens(prompt: str, inputs: Dict[str, Any] | None) -> int:
+    """Cheap pre-call token estimate for the token-per-minute bucket."""
+    inputs = inputs or {}
+    chars = len(prompt or "") + len(inputs.get("text") or "")
+    tokens = chars // _CHARS_PER_TOKEN
+    audio = inputs.get("audio")
+    if audio is not None:
+        try:
+            size = (
+                len(audio) if isinstance(audio, (bytes, bytearray))
+                else Path(audio).stat().st_size
+            )
+        except (OSError, TypeError):
+            size = 0
+        tokens += size // _AUDIO_BYTES_PER_TOKEN
+    if inputs.get("image") is not None:
+        tokens += _IMAGE_TOKENS
+    return tokens
+
+
+_LIMITERS: Dict[str, RateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(
+    model_name: str,
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None,
+) -> Optional[RateLimiter]:
+    """Return the process-wide limiter for ``model_name`` (``None`` if unlimited).
+
+    The first caller's quotas win for the life of the process; a run pins its
+    models.yaml snapshot, so every caller passes the same values anyway.
+    """
+    if not requests_per_minute and not tokens_per_minute:
+        return None
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(model_name)
+        if limiter is None:
+            limiter = RateLimiter(model_name, requests_per_minute, tokens_per_minute)
+            _LIMITERS[model_name] = limiter
+        return limiter
+
+
+def reset_rate_limiters() -> None:
+    with _LIMITERS_LOCK:
+        _LIMITERS.clear()
+
+
+__all__ = [
+    "TokenBucket",
+    "RateLimiter",
+    "estimate_tokens",
+    "get_rate_limiter",
+    "reset_rate_limiters",
+]
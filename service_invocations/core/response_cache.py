@@ -0,0 +1,215 @@
+"""Content-addressed on-disk (SQLite) cache of LLM responses.
+
+``LLM_RESPONSE_CACHE`` is ``off`` (default), ``on`` or ``offline`` (hits only).
+Identical requests are stored per ordinal, so a replay sees the same answers in
+the same order, retries included; hits come back with ``cached=True``.
+"""
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from service_invocations.core import run_context as rc
+from service_invocations.core.llm_adapters import LLMResponse
+from service_invocations.core.media_cache import media_digest
+
+CACHE_OFF = "off"
+CACHE_ON = "on"
+CACHE_OFFLINE = "offline"
+_MODES = {CACHE_OFF, CACHE_ON, CACHE_OFFLINE}
+
+_CACHE_FILE = "llm_cache.sqlite"
+# Past this size, least-recently-used entries go until it is under _EVICT_TO.
+_MAX_BYTES = int(float(os.getenv("LLM_RESPONSE_CACHE_MAX_MB", "1024")) * 1024 * 1024)
+_EVICT_TO = 0.9
+
+
+class ResponseCacheMiss(RuntimeError):
+    """Raised in ``offline`` mode when a request has no cached response."""
+
+
+def cache_mode() -> str:
+    mode = os.getenv("LLM_RESPONSE_CACHE", CACHE_OFF).strip().lower() or CACHE_OFF
+    if mode not in _MODES:
+        raise ValueError(
+            f"LLM_RESPONSE_CACHE must be one of {sorted(_MODES)}, got '{mode}'."
+        )
+    return mode
+
+
+def _media_digest(value: Any) -> Optional[str]:
+    return None if value is None else media_digest(value)
+
+
+def request_key(
+    model_id: str,
+    temperature: float,
+    prompt: str,
+    inputs: Dict[str, Any],
+    **extra: Any,
+) -> str:
+    """SHA-256 identifying a request by everything that shapes its answer.
+
+    ``extra`` carries any further request options that change the response
+    (left out of the key when ``None``).
+    """
+    material = {
+        "model_id": model_id,
+        "temperature": float(temperature),
+        "prompt": prompt,
+        "text": inputs.get("text"),
+        "audio": _media_digest(inputs.get("audio")),
+        "audio_format": inputs.get("audio_format"),
+        "image": _media_digest(inputs.get("image")),
+        "image_format": inputs.get("image_format"),
+    }
+    material.update({k: v for k, v in extra.items() if v is not None})
+    blob = json.dumps(material, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed store of ``LLMResponse`` rows keyed by (key, ordinal)."""
+
+    def __init__(self, path: Path, max_bytes: int = _MAX_BYTES) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._ordinals: Dict[str, int] = {}
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT NOT NULL,
+                ordinal INTEGER NOT NULL,
+                model_id TEXT,
+                payload TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (key, ordinal)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)"
+        )
+        self._conn.commit()
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        self._total = int(row[0])
+
+    def next_ordinal(self, key: str) -> int:
+        """Claim the ordinal for this process's next identical request."""
+        with self._lock:
+            ordinal = self._ordinals.get(key, 0)
+            self._ordinals[key] = ordinal + 1
+            return ordinal
+
+    def ordinals(self) -> Dict[str, int]:
+        """Snapshot of the per-key ordinal counters."""
+        with self._lock:
+            return dict(self._ordinals)
+
+    def restore_ordinals(self, snapshot: Dict[str, int]) -> None:
+        """Rewind the counters to ``snapshot`` so a re-run of the same calls
+        claims the same ordinals (see ``core.batch_jobs``)."""
+        with self._lock:
+            self._ordinals = dict(snapshot)
+
+    def get(self, key: str, ordinal: int) -> Optional[LLMResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM responses WHERE key = ? AND ordinal = ?",
+                (key, ordinal),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ? AND ordinal = ?",
+                (time.time(), key, ordinal),
+            )
+            self._conn.commit()
+        fields = json.loads(row[0])
+        fields["cached"] = True
+        return LLMResponse(**fields)
+
+    def put(self, key: str, ordinal: int, model_id: str, response: LLMResponse) -> None:
+        fields = {
+            f.name: getattr(response, f.name)
+            for f in dataclasses.fields(LLMResponse)
+            if f.name not in {"cached", "hedges"}
+        }
+        payload = json.dumps(fields)
+        size = len(payload) + len(key)
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ? AND ordinal = ?",
+                (key, ordinal),
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, ordinal, model_id, payload, size, created, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, ordinal, model_id, payload, size, now, now),
+            )
+            self._total += size - (int(previous[0]) if previous else 0)
+            if self._total > self._max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least-recently-used rows until under ``_EVICT_TO`` of the cap."""
+        target = int(self._max_bytes * _EVICT_TO)
+        cursor = self._conn.execute(
+            "SELECT key, ordinal, size FROM responses ORDER BY last_access ASC"
+        )
+        doomed: list[Tuple[str, int]] = []
+        total = self._total
+        for key, ordinal, size in cursor:
+            if total <= target:
+                break
+            doomed.append((key, ordinal))
+            total -= int(size)
+        self._conn.executemany(
+            "DELETE FROM responses WHERE key = ? AND ordinal = ?", doomed,
+        )
+        self._total = total
+
+
+_CACHES: Dict[Path, ResponseCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """The shared cache for the current mode, or ``None`` when caching is off."""
+    if cache_mode() == CACHE_OFF:
+        return None
+    path = rc.results_root() / _CACHE_FILE
+    with _CACHES_LOCK:
+        cache = _CACHES.get(path)
+        if cache is None:
+            cache = ResponseCache(path)
+            _CACHES[path] = cache
+        return cache
+
+
+__all__ = [
+    "CACHE_OFF",
+    "CACHE_ON",
+    "CACHE_OFFLINE",
+    "ResponseCache",
+    "ResponseCacheMiss",
+    "cache_mode",
+    "get_response_cache",
+    "request_key",
+]
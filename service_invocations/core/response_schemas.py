@@ -0,0 +1,98 @@
+"""Response schemas for provider-side structured output.
+
+Written in the OpenAPI subset Gemini accepts; :func:`to_json_schema` converts
+one for OpenAI-compatible endpoints. Fields stay nullable so a ``null`` answer
+still reaches the validators as nullish.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Optional
+
+_NULLABLE_STRING: Dict[str, Any] = {"type": "string", "nullable": True}
+_NULLABLE_NUMBER: Dict[str, Any] = {"type": "number", "nullable": True}
+
+
+def _object(properties: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+    }
+
+
+def _scores(names: Iterable[str]) -> Dict[str, Any]:
+    return _object({str(name): dict(_NULLABLE_NUMBER) for name in names})
+
+
+def oracle_schema(key: str, *, score_keys: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Oracle answer: ``{key: string}``, or ``{key: {label: number}}`` when
+    ``score_keys`` is given (the FER score distribution)."""
+    value = _scores(score_keys) if score_keys is not None else dict(_NULLABLE_STRING)
+    return _object({key: value})
+
+
+def packed_oracle_schema(
+    key: str, slots: Iterable[str], *, score_keys: Optional[Iterable[str]] = None
+) -> Dict[str, Any]:
+    """Packed oracle answer: ``{key: {slot: value}}`` with one numbered slot
+    per sample sent in the request; values are shaped as in
+    :func:`oracle_schema`."""
+    names = list(score_keys) if score_keys is not None else None
+    return _object({key: _object({
+        str(slot): _scores(names) if names is not None else dict(_NULLABLE_STRING)
+        for slot in slots
+    })})
+
+
+def segmented_oracle_schema(key: str) -> Dict[str, Any]:
+    """Batched oracle answer over concatenated media: ``{key: [string, ...]}``
+    with one entry per segment, in order."""
+    return _object({key: {"type": "array", "items": dict(_NULLABLE_STRING)}})
+
+
+def judge_schema(
+    label_key: str, services: Iterable[str], *, confidence: bool = False
+) -> Dict[str, Any]:
+    """Judge answer: the LLM's own label, a ``winner`` and one score per
+    service; human-loop prompts (``confidence=True``) add ``confidence``."""
+    names = list(services)
+    properties: Dict[str, Any] = {
+        label_key: dict(_NULLABLE_STRING),
+        "winner": dict(_NULLABLE_STRING),
+        "scores": _scores(names),
+    }
+    if confidence:
+        properties["confidence"] = dict(_NULLABLE_NUMBER)
+    return _object(properties)
+
+
+def human_loop_schema(label_key: str, services: Iterable[str]) -> Dict[str, Any]:
+    return judge_schema(label_key, services, confidence=True)
+
+
+def to_json_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Translate the OpenAPI-style schema to plain JSON Schema."""
+    converted: Dict[str, Any] = {}
+    for key, value in schema.items():
+        if key == "nullable":
+            continue
+        if key == "properties":
+            value = {name: to_json_schema(sub) for name, sub in value.items()}
+        elif key == "items":
+            value = to_json_schema(value)
+        converted[key] = value
+    if schema.get("nullable") and "type" in converted:
+        converted["type"] = [converted["type"], "null"]
+    if converted.get("type") == "object":
+        converted.setdefault("additionalProperties", False)
+    return converted
+
+
+__all__ = [
+    "human_loop_schema",
+    "judge_schema",
+    "oracle_schema",
+    "packed_oracle_schema",
+    "segmented_oracle_schema",
+    "to_json_schema",
+]
@@ -0,0 +1,341 @@
+"""SQLite storage backend for the consolidated results files.
+
+Each file is a table of the task folder's ``results.sqlite``, keyed like its
+``results_io`` upserts; changed tables are exported back to their CSVs so
+readers of the CSVs keep working.
+"""
+from __future__ import annotations
+
+import atexit
+import io
+import math
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+import pandas as pd
+
+from service_invocations.core.oracle_utils import normalize_id
+
+BACKEND_CSV = "csv"
+BACKEND_SQLITE = "sqlite"
+_BACKENDS = {BACKEND_CSV, BACKEND_SQLITE}
+
+DB_FILE = "results.sqlite"
+_ID_COLUMN = "__id"
+
+
+def results_backend() -> Optional[str]:
+    """``LLM_RESULTS_BACKEND`` if set (``csv`` or ``sqlite``), else None."""
+    backend = os.getenv("LLM_RESULTS_BACKEND", "").strip().lower()
+    if not backend:
+        return None
+    if backend not in _BACKENDS:
+        raise ValueError(
+            f"LLM_RESULTS_BACKEND must be one of {sorted(_BACKENDS)}, got '{backend}'."
+        )
+    return backend
+
+
+def _quote(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _sql_value(value: Any) -> Any:
+    if value is None or value is pd.NA or value is pd.NaT:
+        return None
+    if isinstance(value, bool):
+        return str(value)
+    item = getattr(value, "item", None)
+    if callable(item) and not isinstance(value, (str, bytes)):
+        try:
+            value = item()
+        except (TypeError, ValueError):
+            pass
+        if isinstance(value, bool):
+            return str(value)
+    if isinstance(value, float):
+        return None if math.isnan(value) else value
+    if isinstance(value, (int, str)):
+        return value
+    return str(value)
+
+
+def _as_csv_typed(df: pd.DataFrame) -> pd.DataFrame:
+    """``df`` as it would come back from a CSV round-trip."""
+    if df.empty:
+        return df
+    buf = io.StringIO()
+    df.to_csv(buf, index=False)
+    buf.seek(0)
+    return pd.read_csv(buf)
+
+
+class ResultsDatabase:
+    """One task folder's consolidated results as SQLite tables."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._columns: Dict[str, List[str]] = {}
+        # Tables changed since they were last exported to their CSV.
+        self._dirty: Set[str] = set()
+        self._adopted: Set[str] = set()
+        self._adopt_lock = threading.Lock()
+
+    @staticmethod
+    def table_for(csv_name: str) -> str:
+        return Path(csv_name).stem
+
+    def _table_columns(self, table: str) -> List[str]:
+        columns = self._columns.get(table)
+        if columns is None:
+            rows = self._conn.execute(f"PRAGMA table_info({_quote(table)})").fetchall()
+            columns = [row[1] for row in rows]
+            self._columns[table] = columns
+        return columns
+
+    def _key_columns(self, key: Sequence[str]) -> List[str]:
+        return [_ID_COLUMN if k == "id" else k for k in key]
+
+    def _ensure_table(self, table: str, columns: Sequence[str], key: Sequence[str]) -> None:
+        existing = self._table_columns(table)
+        if not existing:
+            key_columns = self._key_columns(key)
+            declared = list(dict.fromkeys(
+                ([_ID_COLUMN] if "id" in key else []) + list(columns)
+            ))
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {_quote(table)} ("
+                + ", ".join(_quote(c) for c in declared)
+                + f", PRIMARY KEY ({', '.join(_quote(c) for c in key_columns)}))"
+            )
+            self._columns[table] = declared
+            return
+        for column in columns:
+            if column not in existing:
+                self._conn.execute(
+                    f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(column)}"
+                )
+                existing.append(column)
+
+    def adopt(self, table: str, key: Sequence[str],
+              load: Callable[[], Optional[pd.DataFrame]]) -> None:
+        """Import ``load()`` (the folder's CSV rows) if ``table`` is new.
+
+        Switching an existing CSV folder to SQLite must not hide its rows —
+        nor let the next export overwrite them. Done once per table.
+        """
+        if table in self._adopted:
+            return
+        with self._adopt_lock:
+            if table in self._adopted:
+                return
+            with self._lock:
+                exists = bool(self._table_columns(table))
+            if not exists:
+                existing = load()
+                if existing is not None and not existing.empty:
+                    self.upsert(table, existing, key)
+                    self._dirty.discard(table)
+            self._adopted.add(table)
+
+    def upsert(self, table: str, df: pd.DataFrame, key: Sequence[str]) -> None:
+        """Insert or replace ``df``'s rows by ``key`` in one transaction."""
+        if df.empty:
+            return
+        missing = [k for k in key if k not in df.columns]
+        if missing:
+            raise ValueError(f"{table}: rows lack key column(s) {missing}.")
+        columns = [str(c) for c in df.columns]
+        records = df.to_dict("records")
+        with self._lock:
+            with self._conn:
+                self._ensure_table(table, columns, key)
+                insert_columns = ([_ID_COLUMN] if "id" in key else []) + columns
+                statement = (
+                    f"INSERT OR REPLACE INTO {_quote(table)} ("
+                    + ", ".join(_quote(c) for c in insert_columns)
+                    + ") VALUES (" + ", ".join("?" * len(insert_columns)) + ")"
+                )
+                self._conn.executemany(statement, [
+                    ([normalize_id(record["id"])] if "id" in key else [])
+                    + [
+                        str(record[c]) if c in key and c != "id" and record[c] is not None
+                        else _sql_value(record[c])
+                        for c in columns
+                    ]
+                    for record in records
+                ])
+            self._dirty.add(table)
+
+    def _frame(self, table: str, where: str = "", params: Sequence[Any] = ()) -> pd.DataFrame:
+        with self._lock:
+            columns = self._table_columns(table)
+            if not columns:
+                return pd.DataFrame()
+            cursor = self._conn.execute(
+                f"SELECT * FROM {_quote(table)} {where} ORDER BY rowid", tuple(params),
+            )
+            names = [d[0] for d in cursor.description]
+            rows = cursor.fetchall()
+        df = pd.DataFrame(rows, columns=names)
+        return df.drop(columns=[_ID_COLUMN], errors="ignore")
+
+    def read(self, table: str) -> Optional[pd.DataFrame]:
+        """The whole table (None if it does not exist)."""
+        with self._lock:
+            if not self._table_columns(table):
+                return None
+        return _as_csv_typed(self._frame(table))
+
+    def read_slice(self, table: str, prompt: str, model: str) -> pd.DataFrame:
+        """Rows for (``prompt``, ``model``), read through the primary key."""
+        with self._lock:
+            columns = self._table_columns(table)
+        if not {"prompt", "model"}.issubset(columns):
+            return pd.DataFrame()
+        return _as_csv_typed(self._frame(
+            table, "WHERE prompt = ? AND model = ?", (str(prompt), str(model)),
+        ))
+
+    def slice_ids(self, table: str, prompt: str, model: str) -> Set[str]:
+        """Normalized ids stored for (``prompt``, ``model``)."""
+        with self._lock:
+            columns = self._table_columns(table)
+            if not {"prompt", "model", _ID_COLUMN}.issubset(columns):
+                return set()
+            rows = self._conn.execute(
+                f"SELECT {_quote(_ID_COLUMN)} FROM {_quote(table)} "
+                "WHERE prompt = ? AND model = ?",
+                (str(prompt), str(model)),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def slice_count(self, table: str, prompt: str, model: str) -> int:
+        """Number of rows stored for (``prompt``, ``model``)."""
+        with self._lock:
+            columns = self._table_columns(table)
+            if not {"prompt", "model"}.issubset(columns):
+                return 0
+            return self._conn.execute(
+                f"SELECT COUNT(DISTINCT {_quote(_ID_COLUMN)}) FROM {_quote(table)} "
+                "WHERE prompt = ? AND model = ?",
+                (str(prompt), str(model)),
+            ).fetchone()[0]
+
+    def slice_pairs(self, table: str, prompt: str, model: str) -> Set[tuple[str, str]]:
+        """(service, normalized id) pairs stored for (``prompt``, ``model``)."""
+        with self._lock:
+            columns = self._table_columns(table)
+            if not {"prompt", "model", "service", _ID_COLUMN}.issubset(columns):
+                return set()
+            rows = self._conn.execute(
+                f"SELECT service, {_quote(_ID_COLUMN)} FROM {_quote(table)} "
+                "WHERE prompt = ? AND model = ?",
+                (str(prompt), str(model)),
+            ).fetchall()
+        return {(str(service), sample_id) for service, sample_id in rows}
+
+    def delete_slice(self, table: str, prompt: str, models: Iterable[str]) -> int:
+        """Delete rows for ``prompt`` and any of ``models``; return the count."""
+        model_list = [str(m) for m in models]
+        with self._lock:
+            columns = self._table_columns(table)
+            if not model_list or not {"prompt", "model"}.issubset(columns):
+                return 0
+            with self._conn:
+                cursor = self._conn.execute(
+                    f"DELETE FROM {_quote(table)} WHERE prompt = ? AND model IN ("
+                    + ", ".join("?" * len(model_list)) + ")",
+                    (str(prompt), *model_list),
+                )
+            if cursor.rowcount:
+                self._dirty.add(table)
+            return max(cursor.rowcount, 0)
+
+    def count(self, table: str) -> Optional[int]:
+        with self._lock:
+            if not self._table_columns(table):
+                return None
+            return self._conn.execute(f"SELECT COUNT(*) FROM {_quote(table)}").fetchone()[0]
+
+    def export(self, table: Optional[str] = None, *, force: bool = False) -> List[str]:
+        """Write changed tables (or just ``table``) to their CSV; return them.
+
+        ``force`` also rewrites tables that have not changed since the last
+        export.
+        """
+        with self._lock:
+            if table is not None:
+                tables = [table] if force or table in self._dirty else []
+            elif force:
+                tables = [
+                    row[0] for row in self._conn.execute(
+                        "SELECT name FROM sqlite_master WHERE type = 'table'"
+                    ).fetchall()
+                ]
+            else:
+                tables = sorted(self._dirty)
+            for name in tables:
+                self._dirty.discard(name)
+        for name in tables:
+            df = self._frame(name)
+            target = self.path.parent / f"{name}.csv"
+            tmp = target.with_name(f"{target.name}.tmp")
+            df.to_csv(tmp, index=False)
+            os.replace(tmp, target)
+        return tables
+
+
+_DATABASES: Dict[Path, Optional[ResultsDatabase]] = {}
+_DATABASES_LOCK = threading.Lock()
+
+
+def results_database(task_dir: Path) -> Optional[ResultsDatabase]:
+    """The database backing ``task_dir``, or None when it stays on CSV.
+
+    ``LLM_RESULTS_BACKEND`` decides; unset, a folder that already has a
+    ``results.sqlite`` keeps using it. Resolved once per folder per process.
+    """
+    key = Path(task_dir).resolve()
+    with _DATABASES_LOCK:
+        if key in _DATABASES:
+            return _DATABASES[key]
+        backend = results_backend()
+        path = key / DB_FILE
+        if backend == BACKEND_SQLITE or (backend is None and path.exists()):
+            database: Optional[ResultsDatabase] = ResultsDatabase(path)
+        else:
+            database = None
+        _DATABASES[key] = database
+        return database
+
+
+def _export_all_at_exit() -> None:
+    with _DATABASES_LOCK:
+        databases = [db for db in _DATABASES.values() if db is not None]
+    for database in databases:
+        try:
+            database.export()
+        except Exception:
+            pass
+
+
+atexit.register(_export_all_at_exit)
+
+
+__all__ = [
+    "BACKEND_CSV",
+    "BACKEND_SQLITE",
+    "DB_FILE",
+    "ResultsDatabase",
+    "results_backend",
+    "results_database",
+]
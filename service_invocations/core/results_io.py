@@ -5,15 +5,26 @@ the same (prompt, model[, service]) combination replaces just those rows in
 the consolidated file rather than appending duplicates. This lets a single
 file accumulate results across prompts and models without exploding the
 number of files on disk.
+
+The paradigm files are appended to a ``<name>.journal.jsonl`` journal that
+:func:`compact_results` folds into the CSV. With ``LLM_RESULTS_BACKEND=sqlite``
+every file is stored through ``core.results_db`` instead.
 """
 from __future__ import annotations
 
+import atexit
+import json
+import os
+import sys
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 import pandas as pd
 
 from service_invocations.core.oracle_utils import normalize_id as _normalize_id
+from service_invocations.core.results_db import DB_FILE, ResultsDatabase, results_database
 
 
 SERVICES_KEY = ("service", "id")
@@ -28,6 +39,59 @@ LLMAAS_ACCURACY_KEY = ("prompt", "model", "id")
 LLMAAS_SUMMARY_KEY = ("prompt", "model")
 
 
+_PARADIGM_FILES = {
+    "oracle": "oracle.csv",
+    "judge": "judge.csv",
+    "human_loop": "human_loop.csv",
+}
+# Consolidated files written through the append-only journal, with their keys.
+_JOURNAL_KEYS: Dict[str, Sequence[str]] = {
+    "oracle.csv": ORACLE_KEY,
+    "judge.csv": JUDGE_KEY,
+    "human_loop.csv": HUMAN_LOOP_KEY,
+}
+# A journal past this many rows is compacted on a background thread.
+_COMPACT_ROWS = int(os.getenv("LLM_RESULTS_JOURNAL_COMPACT_ROWS", "2000"))
+# Every consolidated file with its key (the SQLite backend's primary keys).
+_FILE_KEYS: Dict[str, Sequence[str]] = {
+    "services.csv": SERVICES_KEY,
+    **_JOURNAL_KEYS,
+    "accuracy.csv": ACCURACY_KEY,
+    "accuracy_summary.csv": ACCURACY_SUMMARY_KEY,
+    "llmaas_accuracy.csv": LLMAAS_ACCURACY_KEY,
+    "llmaas_summary.csv": LLMAAS_SUMMARY_KEY,
+}
+
+
+_PATH_LOCKS: Dict[Path, threading.Lock] = {}
+_COMPACTION_LOCKS: Dict[Path, threading.Lock] = {}
+_PATH_LOCKS_GUARD = threading.Lock()
+
+
+def _lock_for(registry: Dict[Path, threading.Lock], path: Path) -> threading.Lock:
+    key = Path(path).resolve()
+    with _PATH_LOCKS_GUARD:
+        lock = registry.get(key)
+        if lock is None:
+            lock = threading.Lock()
+            registry[key] = lock
+        return lock
+
+
+def _path_lock(path: Path) -> threading.Lock:
+    """Process-wide lock guarding read-modify-write cycles on ``path``."""
+    return _lock_for(_PATH_LOCKS, path)
+
+
+def _compaction_lock(path: Path) -> threading.Lock:
+    """Held by whoever rewrites a journaled CSV (compaction, slice clearing).
+
+    Separate from :func:`_path_lock` so checkpoints keep appending while a
+    compaction merges the rotated journal into the CSV.
+    """
+    return _lock_for(_COMPACTION_LOCKS, path)
+
+
 def _row_keys(df: pd.DataFrame, keys: Sequence[str]) -> pd.Series:
     """Build a per-row join key that is stable across the CSV round-trip.
 
@@ -74,11 +138,382 @@ def _merge(existing: pd.DataFrame | None, new: pd.DataFrame, key: Sequence[str])
     return merged.reset_index(drop=True)
 
 
+def _database(path: Path) -> ResultsDatabase | None:
+    """The SQLite database storing ``path``, or None when it is a plain CSV.
+
+    The first use of a table imports the rows the CSV (and its journal)
+    already hold, so switching a folder to SQLite mid-way loses nothing.
+    """
+    key = _FILE_KEYS.get(path.name)
+    if key is None:
+        return None
+    database = results_database(path.parent)
+    if database is not None:
+        database.adopt(database.table_for(path.name), key, lambda: _csv_rows(path))
+    return database
+
+
+def _csv_rows(path: Path) -> pd.DataFrame | None:
+    if path.name in _JOURNAL_KEYS:
+        with _compaction_lock(path):
+            _compact(path)
+    with _path_lock(path):
+        return pd.read_csv(path) if path.exists() else None
+
+
 def _upsert(path: Path, new: pd.DataFrame, key: Sequence[str]) -> None:
+    database = _database(path)
+    if database is not None:
+        database.upsert(database.table_for(path.name), new, key)
+        return
     path.parent.mkdir(parents=True, exist_ok=True)
-    existing = pd.read_csv(path) if path.exists() else None
-    merged = _merge(existing, new, key)
-    merged.to_csv(path, index=False)
+    with _path_lock(path):
+        existing = pd.read_csv(path) if path.exists() else None
+        merged = _merge(existing, new, key)
+        merged.to_csv(path, index=False)
+
+
+# --------------------------------------------------------------------------
+# Completed-id index for the paradigm files (CSV backend)
+# --------------------------------------------------------------------------
+
+FileSignature = Tuple[Optional[Tuple[int, int]], ...]
+
+
+@dataclass
+class _CompletedIndex:
+    signature: FileSignature
+    ids: Dict[Tuple[str, str], Set[str]] = field(default_factory=dict)
+
+
+# Resolved paradigm-file path -> its index. Guarded by _COMPLETED_LOCK.
+_COMPLETED: Dict[Path, _CompletedIndex] = {}
+_COMPLETED_LOCK = threading.Lock()
+
+
+def _signature(path: Path) -> FileSignature:
+    """(mtime, size) of the CSV and its journals; changes on every write."""
+    signature = []
+    for member in (path, _compacting_path(path), _journal_path(path)):
+        try:
+            stat = member.stat()
+        except OSError:
+            signature.append(None)
+            continue
+        signature.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def _slice_ids(df: pd.DataFrame) -> Dict[Tuple[str, str], Set[str]]:
+    ids: Dict[Tuple[str, str], Set[str]] = {}
+    if df is None or df.empty or not {"prompt", "model", "id"}.issubset(df.columns):
+        return ids
+    for prompt, model, sample_id in zip(
+        df["prompt"].astype(str), df["model"].astype(str), df["id"].tolist(),
+    ):
+        ids.setdefault((prompt, model), set()).add(_normalize_id(sample_id))
+    return ids
+
+
+def _completed_index(path: Path) -> _CompletedIndex:
+    """The index for ``path``, (re)loaded when the files changed elsewhere."""
+    resolved = path.resolve()
+    signature = _signature(path)
+    with _COMPLETED_LOCK:
+        index = _COMPLETED.get(resolved)
+        if index is not None and index.signature == signature:
+            return index
+    # Loaded outside the lock; a write racing the load changes the signature,
+    # so the next lookup simply reloads.
+    index = _CompletedIndex(signature, _slice_ids(_merged_view(path)))
+    with _COMPLETED_LOCK:
+        _COMPLETED[resolved] = index
+    return index
+
+
+def _reindex(path: Path, before: FileSignature, after: FileSignature, *,
+             added: pd.DataFrame | None = None,
+             dropped: Tuple[str, Iterable[str]] | None = None) -> None:
+    """Carry ``path``'s index over one of this module's own writes.
+
+    ``before`` / ``after`` are the signatures around the write (taken under
+    the path lock). An index that was already stale before it is discarded
+    instead — it missed a change made elsewhere.
+    """
+    with _COMPLETED_LOCK:
+        index = _COMPLETED.get(path.resolve())
+        if index is None:
+            return
+        if index.signature != before:
+            del _COMPLETED[path.resolve()]
+            return
+        if added is not None:
+            for slice_key, ids in _slice_ids(added).items():
+                index.ids.setdefault(slice_key, set()).update(ids)
+        if dropped is not None:
+            prompt, models = dropped
+            for model in models:
+                index.ids.pop((str(prompt), str(model)), None)
+        index.signature = after
+
+
+# --------------------------------------------------------------------------
+# Append-only journal for the paradigm files
+# --------------------------------------------------------------------------
+
+# Per journaled file (resolved path): row key -> hash of the JSON line last
+# journaled for it by this process, so rows written again (a retried
+# checkpoint, a replayed slice) append only what changed. Guarded by the file's path lock.
+_JOURNALED: Dict[Path, Dict[str, int]] = {}
+# Per journaled file: rows appended since the journal was last rotated.
+_JOURNAL_ROWS: Dict[Path, int] = {}
+_COMPACTORS: Dict[Path, threading.Thread] = {}
+
+
+def _journal_path(path: Path) -> Path:
+    return path.with_name(f"{path.stem}.journal.jsonl")
+
+
+def _compacting_path(path: Path) -> Path:
+    """Where a journal sits while :func:`_compact` folds it into the CSV."""
+    return path.with_name(f"{path.stem}.journal.compacting.jsonl")
+
+
+def _json_value(value: Any) -> Any:
+    if value is pd.NA or value is pd.NaT:
+        return None
+    item = getattr(value, "item", None)
+    if callable(item):
+        try:
+            return item()
+        except (TypeError, ValueError):
+            pass
+    return str(value)
+
+
+def _journal_records(journals: Iterable[Path]) -> List[dict]:
+    """Rows of ``journals``, in order. A torn last line (crash mid-append)
+    is skipped rather than failing the whole read."""
+    records: List[dict] = []
+    for journal in journals:
+        if not journal.exists():
+            continue
+        with journal.open("r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    return records
+
+
+def _read_journal(path: Path) -> pd.DataFrame | None:
+    """Rows of the rotated and live journals of ``path``, oldest first."""
+    records = _journal_records((_compacting_path(path), _journal_path(path)))
+    return pd.DataFrame(records) if records else None
+
+
+def _latest_per_key(df: pd.DataFrame, key: Sequence[str]) -> pd.DataFrame:
+    merge_keys = [k for k in key if k in df.columns]
+    if not merge_keys:
+        return df
+    return df[~_row_keys(df, merge_keys).duplicated(keep="last")].reset_index(drop=True)
+
+
+def _merged_view(path: Path) -> pd.DataFrame | None:
+    """The consolidated CSV with its journal merged over it (None if neither).
+
+    On the SQLite backend: the table, exported to the CSV first if changed.
+    """
+    database = _database(path)
+    if database is not None:
+        table = database.table_for(path.name)
+        database.export(table)
+        return database.read(table)
+    key = _JOURNAL_KEYS.get(path.name)
+    with _path_lock(path):
+        existing = pd.read_csv(path) if path.exists() else None
+        journal = _read_journal(path) if key is not None else None
+    if journal is None:
+        return existing
+    return _merge(existing, _latest_per_key(journal, key), key)
+
+
+def _append(path: Path, new: pd.DataFrame, key: Sequence[str]) -> None:
+    """Journal the rows of ``new`` that this process has not journaled yet."""
+    database = _database(path)
+    if database is not None:
+        database.upsert(database.table_for(path.name), new, key)
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    resolved = path.resolve()
+    merge_keys = [k for k in key if k in new.columns]
+    row_keys = _row_keys(new, merge_keys) if merge_keys else new.index.astype(str)
+    with _path_lock(path):
+        seen = _JOURNALED.setdefault(resolved, {})
+        lines: List[str] = []
+        for row_key, record in zip(row_keys, new.to_dict("records")):
+            line = json.dumps(record, default=_json_value, ensure_ascii=False)
+            digest = hash(line)
+            if seen.get(row_key) != digest:
+                seen[row_key] = digest
+                lines.append(line)
+        if not lines:
+            return
+        before = _signature(path)
+        with _journal_path(path).open("a", encoding="utf-8") as fh:
+            fh.write("\n".join(lines) + "\n")
+        _reindex(path, before, _signature(path), added=new)
+        _JOURNAL_ROWS[resolved] = _JOURNAL_ROWS.get(resolved, 0) + len(lines)
+        due = _JOURNAL_ROWS[resolved] >= _COMPACT_ROWS
+    if due:
+        _compact_in_background(path)
+
+
+def _compact(path: Path) -> int:
+    """Fold the journal of ``path`` into the CSV; return the rows folded.
+
+    The live journal is renamed aside under the path lock, so checkpoints keep
+    appending to a fresh one while the merge runs; the merged CSV replaces the
+    old one and the rotated journal is dropped together, again under the path
+    lock, so a reader never sees the rows twice or not at all. Caller holds
+    the compaction lock.
+    """
+    key = _JOURNAL_KEYS[path.name]
+    journal, compacting = _journal_path(path), _compacting_path(path)
+    with _path_lock(path):
+        if journal.exists():
+            before = _signature(path)
+            if compacting.exists():
+                # Left over from an interrupted compaction: fold both.
+                with compacting.open("a", encoding="utf-8") as fh:
+                    fh.write(journal.read_text(encoding="utf-8"))
+                journal.unlink()
+            else:
+                os.replace(journal, compacting)
+            _reindex(path, before, _signature(path))
+        _JOURNAL_ROWS[path.resolve()] = 0
+        if not compacting.exists():
+            return 0
+        existing = pd.read_csv(path) if path.exists() else None
+    records = _journal_records((compacting,))
+    merged = (
+        _merge(existing, _latest_per_key(pd.DataFrame(records), key), key)
+        if records else existing
+    )
+    tmp = path.with_name(f"{path.name}.tmp")
+    if merged is not None:
+        merged.to_csv(tmp, index=False)
+    with _path_lock(path):
+        before = _signature(path)
+        if merged is not None:
+            os.replace(tmp, path)
+        compacting.unlink()
+        _reindex(path, before, _signature(path))
+    return len(records)
+
+
+def _compact_in_background(path: Path) -> None:
+    resolved = path.resolve()
+
+    def _run() -> None:
+        try:
+            with _compaction_lock(path):
+                _compact(path)
+        except Exception as exc:
+            print(
+                f"[results-journal] compaction of {path} failed "
+                f"({type(exc).__name__}: {exc}); the journal is kept and retried later.",
+                file=sys.stderr,
+                flush=True,
+            )
+
+    with _PATH_LOCKS_GUARD:
+        running = _COMPACTORS.get(resolved)
+        if running is not None and running.is_alive():
+            return
+        thread = threading.Thread(target=_run, name="results-journal-compactor", daemon=True)
+        _COMPACTORS[resolved] = thread
+    thread.start()
+
+
+def compact_results(task_dir: Path, paradigm: str | None = None) -> int:
+    """Fold the append-only journal into the consolidated CSV.
+
+    ``paradigm`` is one of ``"oracle"``, ``"judge"``, ``"human_loop"``, or
+    None for all three. Returns the number of journal rows folded (0 when
+    there was nothing to do). Safe to call while checkpoints are appending.
+    On the SQLite backend this exports the paradigm's tables to their CSVs.
+    """
+    if paradigm is None:
+        names = list(_PARADIGM_FILES.values())
+    elif paradigm in _PARADIGM_FILES:
+        names = [_PARADIGM_FILES[paradigm]]
+    else:
+        raise ValueError(
+            f"compact_results: unknown paradigm '{paradigm}'. "
+            f"Expected one of {sorted(_PARADIGM_FILES)}."
+        )
+    folded = 0
+    for name in names:
+        path = Path(task_dir) / name
+        database = _database(path)
+        if database is not None:
+            database.export(database.table_for(name))
+            continue
+        with _compaction_lock(path):
+            folded += _compact(path)
+    return folded
+
+
+def _compact_all_at_exit() -> None:
+    with _PATH_LOCKS_GUARD:
+        paths = list(_JOURNAL_ROWS)
+    for path in paths:
+        try:
+            with _compaction_lock(path):
+                _compact(path)
+        except Exception:
+            pass
+
+
+atexit.register(_compact_all_at_exit)
+
+
+def read_results(path: Path) -> pd.DataFrame | None:
+    """Read a consolidated CSV as its readers should see it.
+
+    For the journaled paradigm files that is the CSV with any not-yet-
+    compacted journal rows merged in, and for files on the SQLite backend the
+    table itself; other files are read as-is. Returns None when there is
+    nothing on disk.
+    """
+    path = Path(path)
+    return _merged_view(path)
+
+
+def stored_row_count(path: Path) -> int | None:
+    """Rows stored for consolidated file ``path`` (None if nothing is).
+
+    Cheap by design, for progress listings: CSV lines plus journal lines (an
+    upper bound, as a journaled row may replace one in the CSV), or the
+    table's row count on the SQLite backend. Never creates a database.
+    """
+    path = Path(path)
+    if path.name in _FILE_KEYS and (path.parent / DB_FILE).exists():
+        database = results_database(path.parent)
+        if database is not None:
+            return database.count(database.table_for(path.name))
+    count: int | None = None
+    for lines_file, header in (
+        (path, 1), (_compacting_path(path), 0), (_journal_path(path), 0),
+    ):
+        try:
+            with lines_file.open("r", encoding="utf-8") as fh:
+                count = (count or 0) + max(sum(1 for _ in fh) - header, 0)
+        except OSError:
+            continue
+    return count
 
 
 def write_services(task_dir: Path, task: str, rows: Iterable[dict]) -> None:
@@ -97,7 +532,7 @@ def write_oracle(task_dir: Path, task: str, prompt: str, model: str, rows: Itera
     df.insert(0, "task", task)
     df.insert(1, "prompt", prompt)
     df.insert(2, "model", model)
-    _upsert(task_dir / "oracle.csv", df, ORACLE_KEY)
+    _append(task_dir / "oracle.csv", df, ORACLE_KEY)
 
 
 def write_judge(task_dir: Path, task: str, prompt: str, model: str, rows: Iterable[dict]) -> None:
@@ -107,7 +542,7 @@ def write_judge(task_dir: Path, task: str, prompt: str, model: str, rows: Iterab
     df.insert(0, "task", task)
     df.insert(1, "prompt", prompt)
     df.insert(2, "model", model)
-    _upsert(task_dir / "judge.csv", df, JUDGE_KEY)
+    _append(task_dir / "judge.csv", df, JUDGE_KEY)
 
 
 def write_human_loop(task_dir: Path, task: str, prompt: str, model: str, rows: Iterable[dict]) -> None:
@@ -117,7 +552,7 @@ def write_human_loop(task_dir: Path, task: str, prompt: str, model: str, rows: I
     df.insert(0, "task", task)
     df.insert(1, "prompt", prompt)
     df.insert(2, "model", model)
-    _upsert(task_dir / "human_loop.csv", df, HUMAN_LOOP_KEY)
+    _append(task_dir / "human_loop.csv", df, HUMAN_LOOP_KEY)
 
 
 def write_accuracy(task_dir: Path, task: str, prompt: str, model: str, rows: Iterable[dict]) -> None:
@@ -181,30 +616,29 @@ def accuracy_slice_complete(
     particular, reloading the COMET checkpoint and re-running inference.
     """
     path = task_dir / "accuracy.csv"
-    if not path.exists():
-        return False
-    try:
-        df = pd.read_csv(path)
-    except Exception:
+    database = _database(path)
+    if database is not None:
+        have = database.slice_pairs("accuracy", prompt, model)
+    else:
+        if not path.exists():
+            return False
+        try:
+            df = pd.read_csv(path)
+        except Exception:
+            return False
+        needed = {"prompt", "model", "service", "id"}
+        if df.empty or not needed.issubset(df.columns):
+            return False
+        sl = df[(df["prompt"].astype(str) == str(prompt)) & (df["model"].astype(str) == str(model))]
+        have = {
+            (str(s), _normalize_id(i)) for s, i in zip(sl["service"].tolist(), sl["id"].tolist())
+        }
+    if not have:
         return False
-    needed = {"prompt", "model", "service", "id"}
-    if df.empty or not needed.issubset(df.columns):
-        return False
-    sl = df[(df["prompt"].astype(str) == str(prompt)) & (df["model"].astype(str) == str(model))]
-    if sl.empty:
-        return False
-    have = {(str(s), _normalize_id(i)) for s, i in zip(sl["service"].tolist(), sl["id"].tolist())}
     expected = {(str(s), _normalize_id(i)) for s in services for i in sample_ids}
     return bool(expected) and expected.issubset(have)
 
 
-_PARADIGM_FILES = {
-    "oracle": "oracle.csv",
-    "judge": "judge.csv",
-    "human_loop": "human_loop.csv",
-}
-
-
 def load_completed_ids(
     task_dir: Path, paradigm: str, prompt: str, model: str
 ) -> set[str]:
@@ -221,26 +655,43 @@ def load_completed_ids(
             f"load_completed_ids: unknown paradigm '{paradigm}'. "
             f"Expected one of {sorted(_PARADIGM_FILES)}."
         )
-    path = task_dir / filename
-    if not path.exists():
-        return set()
+    database = _database(task_dir / filename)
+    if database is not None:
+        return database.slice_ids(database.table_for(filename), prompt, model)
+    # Ids are normalized the same way the runners do before checking
+    # membership. pandas re-reads a zero-padded id column (e.g. "0001") as the
+    # int 1, so a raw str() would yield "1" and never match the runner's "0001"
+    # key — the resume guard would then silently re-invoke every
+    # already-completed sample.
     try:
-        df = pd.read_csv(path)
+        index = _completed_index(task_dir / filename)
     except Exception:
         return set()
-    if df.empty:
-        return set()
-    needed = {"prompt", "model", "id"}
-    if not needed.issubset(df.columns):
-        return set()
-    matched = df[(df["prompt"].astype(str) == str(prompt)) & (df["model"].astype(str) == str(model))]
-    if matched.empty:
-        return set()
-    # Normalize ids the same way the runners do before checking membership.
-    # pandas re-reads a zero-padded id column (e.g. "0001") as the int 1, so a
-    # raw str() would yield "1" and never match the runner's "0001" key — the
-    # resume guard would then silently re-invoke every already-completed sample.
-    return {_normalize_id(v) for v in matched["id"].tolist()}
+    with _COMPLETED_LOCK:
+        return set(index.ids.get((str(prompt), str(model)), ()))
+
+
+def completed_count(task_dir: Path, paradigm: str, prompt: str, model: str) -> int:
+    """``len(load_completed_ids(...))`` without copying the id set.
+
+    Constant-time on CSV once the index is loaded, and an indexed ``COUNT``
+    on SQLite; used for progress accounting after every checkpoint.
+    """
+    filename = _PARADIGM_FILES.get(paradigm)
+    if filename is None:
+        raise ValueError(
+            f"completed_count: unknown paradigm '{paradigm}'. "
+            f"Expected one of {sorted(_PARADIGM_FILES)}."
+        )
+    database = _database(task_dir / filename)
+    if database is not None:
+        return database.slice_count(database.table_for(filename), prompt, model)
+    try:
+        index = _completed_index(task_dir / filename)
+    except Exception:
+        return 0
+    with _COMPLETED_LOCK:
+        return len(index.ids.get((str(prompt), str(model)), ()))
 
 
 def clear_completed_slice(
@@ -261,21 +712,32 @@ def clear_completed_slice(
             f"Expected one of {sorted(_PARADIGM_FILES)}."
         )
     path = task_dir / filename
-    if not path.exists():
-        return 0
-    try:
-        df = pd.read_csv(path)
-    except Exception:
-        return 0
-    if df.empty or "prompt" not in df.columns or "model" not in df.columns:
-        return 0
     model_set = {str(m) for m in models}
     if not model_set:
         return 0
-    mask = (df["prompt"].astype(str) == str(prompt)) & df["model"].astype(str).isin(model_set)
-    removed = int(mask.sum())
-    if removed > 0:
-        df[~mask].reset_index(drop=True).to_csv(path, index=False)
+    database = _database(path)
+    if database is not None:
+        return database.delete_slice(database.table_for(filename), prompt, model_set)
+    with _compaction_lock(path):
+        # Fold the journal first so its rows are cleared along with the CSV's.
+        _compact(path)
+        if not path.exists():
+            return 0
+        with _path_lock(path):
+            try:
+                df = pd.read_csv(path)
+            except Exception:
+                return 0
+            if df.empty or "prompt" not in df.columns or "model" not in df.columns:
+                return 0
+            mask = (df["prompt"].astype(str) == str(prompt)) & df["model"].astype(str).isin(model_set)
+            removed = int(mask.sum())
+            if removed > 0:
+                before = _signature(path)
+                df[~mask].reset_index(drop=True).to_csv(path, index=False)
+                _reindex(path, before, _signature(path), dropped=(prompt, model_set))
+                # Re-running the slice must journal its rows again.
+                _JOURNALED.pop(path.resolve(), None)
     return removed
 
 
@@ -292,14 +754,14 @@ def load_completed_rows(
             f"load_completed_rows: unknown paradigm '{paradigm}'. "
             f"Expected one of {sorted(_PARADIGM_FILES)}."
         )
-    path = task_dir / filename
-    if not path.exists():
-        return pd.DataFrame()
+    database = _database(task_dir / filename)
+    if database is not None:
+        return database.read_slice(database.table_for(filename), prompt, model)
     try:
-        df = pd.read_csv(path)
+        df = _merged_view(task_dir / filename)
     except Exception:
         return pd.DataFrame()
-    if df.empty or not {"prompt", "model"}.issubset(df.columns):
+    if df is None or df.empty or not {"prompt", "model"}.issubset(df.columns):
         return pd.DataFrame()
     matched = df[(df["prompt"].astype(str) == str(prompt)) & (df["model"].astype(str) == str(model))]
     return matched.reset_index(drop=True)
@@ -315,6 +777,10 @@ __all__ = [
     "write_llmaas_accuracy",
     "write_llmaas_summary",
     "load_completed_ids",
+    "completed_count",
     "load_completed_rows",
     "clear_completed_slice",
+    "compact_results",
+    "read_results",
+    "stored_row_count",
 ]
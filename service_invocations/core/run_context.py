@@ -39,6 +39,7 @@ from __future__ import annotations
 
 import json
 import shutil
+import threading
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -61,6 +62,9 @@ _CONFIG_SNAPSHOT_DIRNAME = "config"
 _CONFIG_FILES = ("services.yaml", "models.yaml", "prompts.yaml")
 
 _active_run: "RunInfo | None" = None
+# Guards read-modify-write of run_status.json: parallel failover workers record
+# progress for different models concurrently.
+_STATUS_LOCK = threading.Lock()
 
 
 @dataclass
@@ -356,29 +360,31 @@ def _update_status_payload(mutate) -> None:
     ``finished``), and is best-effort: a read/write hiccup is swallowed so
     progress bookkeeping can never crash the run it's reporting on.
     """
-    if _active_run is None:
+    run = _active_run
+    if run is None:
         return
-    path = _active_run.dir / _STATUS_FILE
-    payload: dict[str, Any] = {}
-    if path.exists():
+    path = run.dir / _STATUS_FILE
+    with _STATUS_LOCK:
+        payload: dict[str, Any] = {}
+        if path.exists():
+            try:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+            except (json.JSONDecodeError, OSError):
+                payload = {}
         try:
-            payload = json.loads(path.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError):
-            payload = {}
-    try:
-        mutate(payload)
-    except Exception:
-        return
-    payload.setdefault("task", _active_run.label)
-    payload.setdefault("date", _active_run.date)
-    payload.setdefault("time", _active_run.time)
-    payload.setdefault("subdir_by_task", _active_run.subdir_by_task)
-    payload.setdefault("started", datetime.now().isoformat(timespec="seconds"))
-    payload.setdefault("status", "in_progress")
-    try:
-        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-    except OSError:
-        pass
+            mutate(payload)
+        except Exception:
+            return
+        payload.setdefault("task", run.label)
+        payload.setdefault("date", run.date)
+        payload.setdefault("time", run.time)
+        payload.setdefault("subdir_by_task", run.subdir_by_task)
+        payload.setdefault("started", datetime.now().isoformat(timespec="seconds"))
+        payload.setdefault("status", "in_progress")
+        try:
+            path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        except OSError:
+            pass
 
 
 def set_plan(**fields: Any) -> None:
@@ -447,6 +453,101 @@ def record_progress(
     _update_status_payload(_mutate)
 
 
+def record_concurrency(model: str, snapshot: dict[str, Any]) -> None:
+    """Mirror one model's adaptive concurrency state into ``run_status.json``.
+
+    Written under ``concurrency.<model>`` whenever the controller changes its
+    limit, so the file shows the limit each provider settled on and how often
+    it was raised or cut. Best-effort — never raises into the caller.
+    """
+    if _active_run is None:
+        return
+    now = datetime.now().isoformat(timespec="seconds")
+
+    def _mutate(payload: dict[str, Any]) -> None:
+        block = payload.get("concurrency") or {}
+        block[model] = {**snapshot, "updated": now}
+        payload["concurrency"] = block
+
+    _update_status_payload(_mutate)
+
+
+def record_salvage(model: str, counts: dict[str, Any]) -> None:
+    """Mirror one model's JSON salvage counters into ``run_status.json``.
+
+    Written under ``json_salvage.<model>``: how many responses parsed cleanly,
+    were recovered by the salvage parser (each one a paid retry avoided), or
+    could not be parsed at all. Best-effort — never raises into the caller.
+    """
+    if _active_run is None:
+        return
+    now = datetime.now().isoformat(timespec="seconds")
+
+    def _mutate(payload: dict[str, Any]) -> None:
+        block = payload.get("json_salvage") or {}
+        block[model] = {**counts, "updated": now}
+        payload["json_salvage"] = block
+
+    _update_status_payload(_mutate)
+
+
+def record_batch_job(job: str, info: dict[str, Any]) -> None:
+    """Mirror one provider batch job's state into ``run_status.json``.
+
+    Written under ``batch_jobs.<job>`` on every state change (submitted,
+    running, succeeded, failed), so a long offline sweep shows which jobs are
+    still queued at the provider. Best-effort — never raises into the caller.
+    """
+    if _active_run is None:
+        return
+    now = datetime.now().isoformat(timespec="seconds")
+
+    def _mutate(payload: dict[str, Any]) -> None:
+        block = payload.get("batch_jobs") or {}
+        block[job] = {**block.get(job, {}), **info, "updated": now}
+        payload["batch_jobs"] = block
+
+    _update_status_payload(_mutate)
+
+
+def record_checkpoint_writer(stats: dict[str, Any]) -> None:
+    """Mirror the write-behind checkpoint writer's stats into ``run_status.json``.
+
+    Written under ``checkpoint_writer``: queue depth, writes, coalesced
+    checkpoints and write latency, so a slow results disk shows up as a deep
+    queue instead of stalled labeling. Best-effort — never raises into the
+    caller.
+    """
+    if _active_run is None:
+        return
+    now = datetime.now().isoformat(timespec="seconds")
+
+    def _mutate(payload: dict[str, Any]) -> None:
+        payload["checkpoint_writer"] = {**stats, "updated": now}
+
+    _update_status_payload(_mutate)
+
+
+def record_key_pool(provider: str, members: dict[str, Any]) -> None:
+    """Mirror one provider's credential pool stats into ``run_status.json``.
+
+    Written under ``key_pools.<provider>`` (one entry per key/endpoint label)
+    on every quarantine and periodically, so the file shows how load spread
+    across quotas and which keys are benched. Best-effort — never raises into
+    the caller.
+    """
+    if _active_run is None:
+        return
+    now = datetime.now().isoformat(timespec="seconds")
+
+    def _mutate(payload: dict[str, Any]) -> None:
+        block = payload.get("key_pools") or {}
+        block[provider] = {"members": members, "updated": now}
+        payload["key_pools"] = block
+
+    _update_status_payload(_mutate)
+
+
 # --------------------------------------------------------------------------
 # Sample persistence (so a continued run replays the exact same inputs)
 # --------------------------------------------------------------------------
@@ -495,14 +596,13 @@ def _dir_progress(run_dir: Path) -> str:
         n = len(list(services_dir.glob("*.csv")))
         if n:
             parts.append(f"services={n}")
+    from service_invocations.core.results_io import stored_row_count
+
     for name in ("oracle.csv", "judge.csv", "human_loop.csv"):
-        path = run_dir / name
-        if path.exists():
-            try:
-                rows = sum(1 for _ in path.open("r", encoding="utf-8")) - 1
-            except OSError:
-                rows = 0
-            parts.append(f"{name.removesuffix('.csv')}={max(rows, 0)} rows")
+        # Counts journaled / SQLite-stored rows as well as the CSV's.
+        rows = stored_row_count(run_dir / name)
+        if rows is not None:
+            parts.append(f"{name.removesuffix('.csv')}={rows} rows")
     if (run_dir / "plots").is_dir():
         parts.append("plots")
     return ", ".join(parts) if parts else "no output yet"
@@ -568,6 +668,11 @@ __all__ = [
     "end_run",
     "set_plan",
     "record_progress",
+    "record_concurrency",
+    "record_salvage",
+    "record_batch_job",
+    "record_key_pool",
+    "record_checkpoint_writer",
     "save_samples",
     "load_samples",
     "find_continuable_runs",
@@ -32,9 +32,9 @@ _INVOKE_SETTINGS = (
 
 # module dotted-path -> the attribute names that count as run settings.
 _SETTING_MODULES: dict[str, tuple[str, ...]] = {
-    "service_invocations.invoke_speech_recognition": _INVOKE_SETTINGS,
-    "service_invocations.invoke_language_translation": _INVOKE_SETTINGS,
-    "service_invocations.invoke_emotion_detection": _INVOKE_SETTINGS,
+    "service_invocations.invoke_speech_recognition": _INVOKE_SETTINGS + ("ORACLE_BATCH_SIZE",),
+    "service_invocations.invoke_language_translation": _INVOKE_SETTINGS + ("ORACLE_PACK_SIZE",),
+    "service_invocations.invoke_emotion_detection": _INVOKE_SETTINGS + ("ORACLE_GRID_SIZE",),
 }
 
 
@@ -22,6 +22,7 @@ from service_invocations.core.oracle_utils import (
     resolve_prompt_path as _resolve_prompt_path,
     retry_until_valid as _retry_until_valid,
 )
+from service_invocations.core.response_schemas import judge_schema as _judge_schema
 from service_invocations.core.results_io import (
     clear_completed_slice,
     load_completed_ids,
@@ -31,6 +32,8 @@ from service_invocations.models import get_enabled_models, get_model_generator
 
 _PARADIGM_NAME = "judge"
 _TASK_NAME = "emotion_detection"
+# JSON fields read from each response; lets streaming models stop early.
+_STOP_KEYS = ("llm_emotion", "winner", "scores")
 _PROMPTS_ROOT = Path(__file__).parent / "prompts"
 _PARADIGM = "judge"
 
@@ -83,7 +86,7 @@ def judge_emotions(
     services_path: Path | None = None,
     models_path: Path | None = None,
     task_name: str = _TASK_NAME,
-    fresh_run: bool = False,
+    fresh_run: bool | None = None,
 ):
     task_dir = results_dir if results_dir is not None else _DEFAULT_TASK_DIR
     if services_path is None:
@@ -133,6 +136,8 @@ def judge_emotions(
         for sample_id, image_file in zip(ids, image_files)
     ]
 
+    response_schema = _judge_schema("llm_emotion", services)
+
     def make_processor(model_name: str):
         generator = get_model_generator(model_name, models_path=models_path)
         tracker = session_tracker()
@@ -162,9 +167,14 @@ def judge_emotions(
             prompt = _load_prompt(prompt_path, service_blocks=service_blocks)
 
             def _invoke_once():
-                resp = generator(prompt, inputs={"image": image_file})
+                resp = generator(
+                    prompt,
+                    inputs={"image": image_file},
+                    stop_keys=_STOP_KEYS,
+                    response_schema=response_schema,
+                )
                 print(resp.content)
-                return resp, _parse_json_payload(resp.content)
+                return resp, _parse_json_payload(resp.content, model=model_name)
 
             on_attempt, total_cost = _make_attempt_recorder(
                 tracker,
@@ -236,6 +246,7 @@ def judge_emotions(
         progress_prompt=prompt_name,
         progress_total=len(samples),
         progress_task_dir=task_dir,
+        models_path=models_path,
     )
 
     return True
@@ -5,8 +5,13 @@ import pandas as pd
 from service_invocations.core.cost_tracker import (
     make_attempt_recorder as _make_attempt_recorder,
     session_tracker,
+    split_response as _split_response,
+)
+from service_invocations.core.llm_adapters import ModelUnavailableError
+from service_invocations.core.model_failover import (
+    partial_failure as _partial_failure,
+    run_with_failover,
 )
-from service_invocations.core.model_failover import run_with_failover
 from service_invocations.core import run_context as rc
 from service_invocations.core.oracle_utils import (
     extract_oracle as _extract_oracle,
@@ -14,19 +19,43 @@ from service_invocations.core.oracle_utils import (
     is_nullish_output as _is_nullish_output,
     load_prompt as _load_prompt,
     normalize_id as _normalize_id,
+    parse_json_payload as _parse_json_payload,
     resolve_prompt_path as _resolve_prompt_path,
     retry_until_valid as _retry_until_valid,
 )
+from service_invocations.core.response_schemas import (
+    oracle_schema as _oracle_schema,
+    packed_oracle_schema as _packed_oracle_schema,
+)
 from service_invocations.core.results_io import (
     clear_completed_slice,
     load_completed_ids,
     load_completed_rows,
+    read_results,
     write_oracle,
 )
+from service_invocations.emotion_detection.image_grid import tile_images as _tile_images
 from service_invocations.models import get_enabled_models, get_model_generator
 
 _TASK_NAME = "emotion_detection"
 _PARADIGM_NAME = "oracle"
+# JSON fields read from each response; lets streaming models stop early.
+_STOP_KEYS = ("scores",)
+_SCORE_KEYS = ("anger", "disgust", "fear", "happiness", "neutral", "sadness", "surprise")
+_RESPONSE_SCHEMA = _oracle_schema("scores", score_keys=_SCORE_KEYS)
+# Grid mode (``grid_size`` > 1): K faces are tiled into one numbered grid
+# image, and the answer maps each tile number to that face's scores.
+_GRID_KEY = "tiles"
+_GRID_STOP_KEYS = (_GRID_KEY,)
+_GRID_INSTRUCTIONS = (
+    "\n\nGRID MODE (this overrides the JSON schema above): the image is a grid "
+    "of separate face images, each under a white banner showing its number "
+    "(1, 2, 3, ...). Classify each face independently, following every rule "
+    "above, and return ONLY a JSON object of the form "
+    '{"tiles": {"1": {"anger": float, "disgust": float, "fear": float, '
+    '"happiness": float, "neutral": float, "sadness": float, "surprise": float}, '
+    '"2": {...}, ...}} with exactly one entry per numbered face.'
+)
 
 _PROMPTS_ROOT = Path(__file__).parent / "prompts"
 _PARADIGM = "oracle"
@@ -47,8 +76,20 @@ def generate_oracle_emotions(
     use_existing: bool = False,
     results_dir: Path | None = None,
     models_path: Path | None = None,
-    fresh_run: bool = False,
+    fresh_run: bool | None = None,
+    grid_size: int = 1,
 ):
+    """Label ``affectnet_data`` with each enabled model acting as the oracle.
+
+    ``grid_size`` > 1 tiles that many faces into one numbered grid image per
+    request (see ``image_grid``). The grid's tokens are split evenly across its
+    faces in cost.csv; faces whose tile comes back missing or nullish — or
+    every face, if the answer doesn't parse — are then labeled from their own
+    image as usual, continuing the same cost ledger. ``grid_comparison``
+    measures what the grid costs in accuracy.
+    """
+    if isinstance(grid_size, bool) or not isinstance(grid_size, int) or grid_size < 1:
+        raise ValueError("grid_size must be a positive integer.")
     task_dir = results_dir if results_dir is not None else _DEFAULT_TASK_DIR
     if models_path is None:
         models_path = rc.config_path("models.yaml")
@@ -82,10 +123,13 @@ def generate_oracle_emotions(
         {"id": row["id"], "image": row["image"]}
         for _, row in affectnet_data.iterrows()
     ]
+    work_items: list = (
+        samples if grid_size == 1
+        else [samples[i:i + grid_size] for i in range(0, len(samples), grid_size)]
+    )
 
     pending_models: list[str] = []
-    existing_path = task_dir / "oracle.csv"
-    existing_df = pd.read_csv(existing_path) if existing_path.exists() else None
+    existing_df = read_results(task_dir / "oracle.csv")
     for model_name in enabled_models:
         if use_existing and existing_df is not None:
             slice_df = existing_df[
@@ -100,6 +144,7 @@ def generate_oracle_emotions(
     def make_processor(model_name: str):
         generator = get_model_generator(model_name, models_path=models_path)
         prompt = _load_prompt(prompt_path)
+        grid_prompt = prompt + _GRID_INSTRUCTIONS
         tracker = session_tracker()
         done_ids: set[str] = (
             set()
@@ -112,20 +157,8 @@ def generate_oracle_emotions(
                 f"{len(done_ids)} sample(s) already in CSV — will skip."
             )
 
-        def process(sample: dict) -> dict | None:
-            sample_id = sample["id"]
-            image_file = sample["image"]
-            id_key = _normalize_id(sample_id)
-            if id_key in done_ids:
-                return None
-            print(f"LLM Oracle Emotion ({model_name}): {image_file}")
-
-            def _invoke_once():
-                resp = generator(prompt, inputs={"image": image_file})
-                print(resp.content)
-                return resp, _extract_oracle(resp.content, key="scores")
-
-            on_attempt, total_cost = _make_attempt_recorder(
+        def _recorder(sample_id):
+            return _make_attempt_recorder(
                 tracker,
                 task=_TASK_NAME,
                 paradigm=_PARADIGM_NAME,
@@ -134,14 +167,28 @@ def generate_oracle_emotions(
                 usable=lambda pair: not _is_nullish_output(pair[1]),
                 models_path=models_path,
             )
-            response, llm_oracle = _retry_until_valid(
+
+        def _classify(sample: dict, on_attempt):
+            image_file = sample["image"]
+
+            def _invoke_once():
+                resp = generator(
+                    prompt,
+                    inputs={"image": image_file},
+                    stop_keys=_STOP_KEYS,
+                    response_schema=_RESPONSE_SCHEMA,
+                )
+                print(resp.content)
+                return resp, _extract_oracle(resp.content, key="scores", model=model_name)
+
+            return _retry_until_valid(
                 _invoke_once,
                 validate=lambda pair: not _is_nullish_output(pair[1]),
-                description=f"emotion_oracle {model_name} sample={sample_id}",
+                description=f"emotion_oracle {model_name} sample={sample['id']}",
                 on_attempt=on_attempt,
             )
-            cost = total_cost()
-            done_ids.add(id_key)
+
+        def _row(id_key: str, response, llm_oracle, cost) -> dict:
             return {
                 "id": id_key,
                 "llm_oracle": llm_oracle,
@@ -151,6 +198,70 @@ def generate_oracle_emotions(
                 "cost_usd": cost,
             }
 
+        def process_one(sample: dict) -> dict | None:
+            sample_id = sample["id"]
+            id_key = _normalize_id(sample_id)
+            if id_key in done_ids:
+                return None
+            print(f"LLM Oracle Emotion ({model_name}): {sample['image']}")
+            on_attempt, total_cost = _recorder(sample_id)
+            response, llm_oracle = _classify(sample, on_attempt)
+            done_ids.add(id_key)
+            return _row(id_key, response, llm_oracle, total_cost())
+
+        def process_grid(grid: list[dict]) -> list[dict]:
+            todo = [s for s in grid if _normalize_id(s["id"]) not in done_ids]
+            if len(todo) <= 1:
+                row = process_one(todo[0]) if todo else None
+                return [row] if row is not None else []
+            slots = [str(i) for i in range(1, len(todo) + 1)]
+            print(
+                f"LLM Oracle Emotion ({model_name}): grid of {len(todo)} "
+                f"({todo[0]['id']} .. {todo[-1]['id']})"
+            )
+            resp = generator(
+                grid_prompt,
+                inputs={
+                    "image": _tile_images([s["image"] for s in todo]),
+                    "image_format": "png",
+                },
+                stop_keys=_GRID_STOP_KEYS,
+                response_schema=_packed_oracle_schema(_GRID_KEY, slots, score_keys=_SCORE_KEYS),
+            )
+            print(resp.content)
+            answers = _parse_json_payload(resp.content, model=model_name).get(_GRID_KEY)
+            if not isinstance(answers, dict):
+                answers = {}
+            shares = _split_response(resp, [1.0] * len(todo))
+            rows = []
+            fallbacks = []
+            for slot, sample, share in zip(slots, todo, shares):
+                on_attempt, total_cost = _recorder(sample["id"])
+                answer = answers.get(slot, "n/a")
+                ok = not _is_nullish_output(answer)
+                # The grid counts as this sample's first attempt.
+                on_attempt((share, answer), ok)
+                if ok:
+                    rows.append(_row(_normalize_id(sample["id"]), share, answer, total_cost()))
+                else:
+                    fallbacks.append((sample, on_attempt, total_cost))
+            done_ids.update(row["id"] for row in rows)
+            for i, (sample, on_attempt, total_cost) in enumerate(fallbacks):
+                try:
+                    response, llm_oracle = _classify(sample, on_attempt)
+                except ModelUnavailableError as exc:
+                    # Keep the answers already paid for; only the faces still
+                    # without a row are deferred, each on its own.
+                    raise _partial_failure(exc, rows, [s for s, _, _ in fallbacks[i:]])
+                rows.append(_row(_normalize_id(sample["id"]), response, llm_oracle, total_cost()))
+                done_ids.add(rows[-1]["id"])
+            return rows
+
+        def process(item):
+            if isinstance(item, list):
+                return process_grid(item)
+            return process_one(item)
+
         return process
 
     def on_progress(model_name: str, rows: list[dict], is_final: bool) -> None:
@@ -159,17 +270,11 @@ def generate_oracle_emotions(
             full_slice = load_completed_rows(task_dir, "oracle", prompt_name, model_name)
             if not full_slice.empty:
                 results_by_model[model_name] = full_slice
-            elif rows:
-                results_by_model[model_name] = pd.DataFrame(rows)
-            # else: this model produced no oracle rows (e.g. it was permanently
-            # unavailable). Leave it unregistered rather than storing an empty,
-            # column-less pd.DataFrame([]) — that frame later crashed the metric
-            # layer with KeyError: 'id'.
 
     if pending_models:
-        run_with_failover(
+        pass_rows = run_with_failover(
             models=pending_models,
-            samples=samples,
+            samples=work_items,
             make_processor=make_processor,
             on_progress=on_progress,
             progress_task=_TASK_NAME,
@@ -177,7 +282,16 @@ def generate_oracle_emotions(
             progress_prompt=prompt_name,
             progress_total=len(samples),
             progress_task_dir=task_dir,
+            models_path=models_path,
         )
+        # on_progress only sees each checkpoint's new rows, so if the slice
+        # could not be read back, fall back to the rows this pass returned.
+        # A model with none (e.g. permanently unavailable) stays unregistered
+        # rather than storing an empty, column-less pd.DataFrame([]) — that
+        # frame later crashed the metric layer with KeyError: 'id'.
+        for model_name, rows in pass_rows.items():
+            if model_name not in results_by_model and rows:
+                results_by_model[model_name] = pd.DataFrame(rows)
 
     if len(enabled_models) > 1:
         return results_by_model
@@ -0,0 +1,127 @@
+"""Compare FER oracle grid mode against single-image mode.
+
+Run ``python -m service_invocations.emotion_detection.grid_comparison
+[num_samples] [grid_size ...]`` or call :func:`compare_grid_sizes`.
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+
+from service_invocations.core import run_context as rc
+from service_invocations.core.oracle_utils import normalize_id as _normalize_id
+from service_invocations.emotion_detection.emotion_oracle import generate_oracle_emotions
+from service_invocations.emotion_detection.metrics import (
+    _normalize_label,
+    oracle_top_emotion,
+)
+from service_invocations.emotion_detection.services._shared import label_to_name
+from service_invocations.models import get_enabled_models
+
+_TASK_NAME = "emotion_detection"
+_DEFAULT_PROMPT = "fer_service_medium"
+_DEFAULT_GRID_SIZES = (4, 9)
+_DEFAULT_NUM_SAMPLES = 36
+
+
+def _frames_by_model(result, models: list[str]) -> dict[str, pd.DataFrame]:
+    """Normalize ``generate_oracle_emotions``' return shape to model -> rows."""
+    if isinstance(result, dict):
+        return result
+    if isinstance(result, pd.DataFrame) and models:
+        return {models[0]: result}
+    return {}
+
+
+def _mean(flags: list[bool]) -> float | None:
+    return round(sum(flags) / len(flags), 4) if flags else None
+
+
+def compare_grid_sizes(
+    affectnet_data: pd.DataFrame,
+    prompt_name: str = _DEFAULT_PROMPT,
+    grid_sizes: Iterable[int] = _DEFAULT_GRID_SIZES,
+    results_dir: Path | None = None,
+    models_path: Path | None = None,
+) -> pd.DataFrame:
+    """Run the oracle at grid size 1 and each of ``grid_sizes``; compare.
+
+    Writes ``grid_comparison.csv`` under ``results_dir`` (default
+    ``<task results>/grid_comparison``) and returns the same frame.
+    """
+    base = results_dir if results_dir is not None else (
+        rc.task_results_dir(_TASK_NAME) / "grid_comparison"
+    )
+    if models_path is None:
+        models_path = rc.config_path("models.yaml")
+    models = get_enabled_models(models_path)
+    sizes = [1] + sorted({int(k) for k in grid_sizes if int(k) > 1})
+    human_by_id = {
+        _normalize_id(row["id"]): _normalize_label(label_to_name(row.get("label")))
+        for _, row in affectnet_data.iterrows()
+    }
+
+    frames: dict[tuple[str, int], pd.DataFrame] = {}
+    for size in sizes:
+        print(f"--- Grid comparison: grid_size={size} ---")
+        result = generate_oracle_emotions(
+            affectnet_data,
+            prompt_name=prompt_name,
+            results_dir=base / f"grid_{size}",
+            models_path=models_path,
+            grid_size=size,
+        )
+        for model_name, frame in _frames_by_model(result, models).items():
+            frames[(model_name, size)] = frame
+
+    top1: dict[tuple[str, int], dict[str, str]] = {
+        key: {
+            _normalize_id(sample_id): oracle_top_emotion(value)
+            for sample_id, value in zip(frame["id"], frame["llm_oracle"])
+        }
+        for key, frame in frames.items()
+    }
+    rows = []
+    for (model_name, size), preds in sorted(top1.items()):
+        frame = frames[(model_name, size)]
+        labeled = [i for i in preds if human_by_id.get(i)]
+        accuracy = _mean([preds[i] == human_by_id[i] for i in labeled])
+        single = top1.get((model_name, 1), {})
+        single_accuracy = _mean([single[i] == human_by_id[i] for i in labeled if i in single])
+        cost = pd.to_numeric(frame["cost_usd"], errors="coerce").sum(min_count=1)
+        rows.append({
+            "model": model_name,
+            "grid_size": size,
+            "n_faces": len(preds),
+            "human_accuracy": accuracy,
+            "delta_vs_single": (
+                round(accuracy - single_accuracy, 4)
+                if accuracy is not None and single_accuracy is not None else None
+            ),
+            "agreement_with_single": _mean([preds[i] == single[i] for i in preds if i in single]),
+            "cost_usd": None if pd.isna(cost) else round(float(cost), 6),
+            "cost_per_face_usd": (
+                None if pd.isna(cost) or not len(preds) else round(float(cost) / len(preds), 6)
+            ),
+            "mean_latency_ms": round(
+                float(pd.to_numeric(frame["latency_ms"], errors="coerce").mean()), 2
+            ),
+        })
+
+    report = pd.DataFrame(rows)
+    base.mkdir(parents=True, exist_ok=True)
+    report.to_csv(base / "grid_comparison.csv", index=False)
+    print(report.to_string(index=False) if not report.empty else "No oracle results to compare.")
+    return report
+
+
+if __name__ == "__main__":
+    from data_management.affectnet import load_affectnet
+
+    cli_args = [int(a) for a in sys.argv[1:]]
+    num_samples = cli_args[0] if cli_args else _DEFAULT_NUM_SAMPLES
+    cli_sizes = cli_args[1:] or list(_DEFAULT_GRID_SIZES)
+    compare_grid_sizes(load_affectnet(num_samples), grid_sizes=cli_sizes)
@@ -0,0 +1,67 @@
+"""Tile several face crops into one numbered grid image.
+
+Used by the FER oracle's grid mode; each tile sits under a banner with its
+1-based number, which the grid prompt asks the model to key its answer by.
+"""
+from __future__ import annotations
+
+import io
+import math
+from typing import Any, Sequence
+
+from service_invocations.core.media_cache import read_media
+
+_BANNER_HEIGHT = 24
+_GUTTER = 8
+_BACKGROUND = (255, 255, 255)
+_LABEL_COLOR = (0, 0, 0)
+
+
+def _label_font(size: int) -> Any:
+    from PIL import ImageFont
+
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # Pillow < 10.1 has a single fixed-size bitmap font
+        return ImageFont.load_default()
+
+
+def tile_images(images: Sequence[Any], columns: int | None = None) -> bytes:
+    """Return PNG bytes of ``images`` (paths or bytes) laid out row-major.
+
+    Tiles are numbered ``1..len(images)`` in input order. Every tile gets the
+    size of the largest input; smaller faces are centered rather than
+    upscaled, so the model sees each crop at its native resolution — as it
+    does in single-image mode. ``columns`` defaults to ``ceil(sqrt(K))``.
+    """
+    from PIL import Image, ImageDraw
+
+    if not images:
+        raise ValueError("tile_images needs at least one image.")
+    faces = [Image.open(io.BytesIO(read_media(image))).convert("RGB") for image in images]
+    tile_w = max(face.width for face in faces)
+    tile_h = max(face.height for face in faces)
+    columns = columns or math.ceil(math.sqrt(len(faces)))
+    rows = math.ceil(len(faces) / columns)
+    cell_w = tile_w + _GUTTER
+    cell_h = tile_h + _BANNER_HEIGHT + _GUTTER
+    grid = Image.new("RGB", (columns * cell_w + _GUTTER, rows * cell_h + _GUTTER), _BACKGROUND)
+    draw = ImageDraw.Draw(grid)
+    font = _label_font(_BANNER_HEIGHT - 6)
+    for index, face in enumerate(faces):
+        left = _GUTTER + (index % columns) * cell_w
+        top = _GUTTER + (index // columns) * cell_h
+        draw.text((left + 2, top + 2), str(index + 1), fill=_LABEL_COLOR, font=font)
+        grid.paste(
+            face,
+            (
+                left + (tile_w - face.width) // 2,
+                top + _BANNER_HEIGHT + (tile_h - face.height) // 2,
+            ),
+        )
+    buf = io.BytesIO()
+    grid.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+__all__ = ["tile_images"]
@@ -64,6 +64,10 @@ HUMAN_LOOP_NO_THRESHOLD_PROMPT = "fer_hitl_medium"
 QUIET_SKIP_PROMPTS = False
 SDS_TOP_K: int | None = None
 RUN_MAJORITY_VOTING = True
+# Faces tiled into each LLM oracle request as one numbered grid image. 1 sends
+# one image per request; see emotion_detection/grid_comparison.py for how much
+# accuracy a given grid size costs before turning it on.
+ORACLE_GRID_SIZE = 1
 
 _TASK_NAME = "emotion_detection"
 _OUTPUT_KIND = "emotion"
@@ -233,6 +237,7 @@ def run_emotion_detection(
             prompt_name=ORACLE_PROMPT,
             results_dir=results_dir,
             models_path=models_path,
+            grid_size=ORACLE_GRID_SIZE,
         )
     elif not QUIET_SKIP_PROMPTS:
         print("--- Skipping LLM Oracle Emotion (ORACLE_PROMPT is empty) ---")
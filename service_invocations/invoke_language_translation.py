@@ -60,6 +60,10 @@ HUMAN_LOOP_NO_THRESHOLD_PROMPT = "translation_hitl_medium"
 QUIET_SKIP_PROMPTS = False
 SDS_TOP_K: int | None = None
 RUN_MAJORITY_VOTING = True
+# Sentences packed into each LLM oracle request (numbered slots in one prompt).
+# 1 sends one sentence per request; larger packs share the fixed prompt across
+# sentences, and any sentence the pack answer misses is retried on its own.
+ORACLE_PACK_SIZE = 1
 
 _TASK_NAME = "language_translation"
 _OUTPUT_KIND = "text"
@@ -226,6 +230,7 @@ def run_language_translation(
             prompt_name=ORACLE_PROMPT,
             results_dir=results_dir,
             models_path=models_path,
+            pack_size=ORACLE_PACK_SIZE,
         )
     elif not QUIET_SKIP_PROMPTS:
         print("--- Skipping LLM Oracle Translation (ORACLE_PROMPT is empty) ---")
@@ -60,6 +60,10 @@ HUMAN_LOOP_NO_THRESHOLD_PROMPT = "asr_hitl_medium"
 QUIET_SKIP_PROMPTS = False
 SDS_TOP_K: int | None = None
 RUN_MAJORITY_VOTING = True
+# Clips joined (beep-separated) into each LLM oracle request. 1 sends one clip
+# per request; larger batches share the prompt across clips, and any clip the
+# batch answer misses is transcribed on its own.
+ORACLE_BATCH_SIZE = 1
 
 _TASK_NAME = "speech_recognition"
 _OUTPUT_KIND = "text"
@@ -226,6 +230,7 @@ def run_speech_recognition(
             prompt_name=ORACLE_PROMPT,
             results_dir=results_dir,
             models_path=models_path,
+            batch_size=ORACLE_BATCH_SIZE,
         )
     elif not QUIET_SKIP_PROMPTS:
         print("--- Skipping LLM Oracle (ORACLE_PROMPT is empty) ---")
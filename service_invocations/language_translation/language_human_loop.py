@@ -21,15 +21,19 @@ from service_invocations.core.oracle_utils import (
     resolve_prompt_path as _resolve_prompt_path,
     retry_until_valid as _retry_until_valid,
 )
+from service_invocations.core.response_schemas import human_loop_schema as _human_loop_schema
 from service_invocations.core.results_io import (
     clear_completed_slice,
     load_completed_ids,
+    read_results,
     write_human_loop,
 )
 from service_invocations.models import get_enabled_models, get_model_generator
 
 _PARADIGM_NAME = "human_loop"
 _TASK_NAME = "language_translation"
+# JSON fields read from each response; lets streaming models stop early.
+_STOP_KEYS = ("llm_translation", "winner", "scores", "confidence")
 _PROMPTS_ROOT = Path(__file__).parent / "prompts"
 _PARADIGM = "human-loop"
 # Confidence below this routes the sample to a human reviewer (the fallback in
@@ -50,14 +54,13 @@ def _load_human_comet_lookup(task_dir: Path) -> dict[str, dict[str, float]]:
     Returns {id: {service: human_comet}}; empty if the file or column is
     missing. Reused on fallback so the winner matches the COMET ranking we
     actually report — no inline re-scoring."""
-    path = task_dir / "accuracy.csv"
-    if not path.exists():
-        return {}
     try:
-        df = pd.read_csv(path)
+        # read_results, not read_csv: on the SQLite backend accuracy.csv is
+        # only exported later, and may not exist yet.
+        df = read_results(task_dir / "accuracy.csv")
     except (pd.errors.EmptyDataError, OSError):
         return {}
-    if df.empty or not {"id", "service", "human_comet"}.issubset(df.columns):
+    if df is None or df.empty or not {"id", "service", "human_comet"}.issubset(df.columns):
         return {}
     lookup: dict[str, dict[str, float]] = {}
     for sid, service, score in zip(df["id"], df["service"], df["human_comet"]):
@@ -110,7 +113,7 @@ def human_loop_translations(
     services_path: Path | None = None,
     models_path: Path | None = None,
     task_name: str = _TASK_NAME,
-    fresh_run: bool = False,
+    fresh_run: bool | None = None,
 ):
     task_dir = results_dir if results_dir is not None else _DEFAULT_TASK_DIR
     if services_path is None:
@@ -170,6 +173,8 @@ def human_loop_translations(
         for sample_id, english in zip(ids, english_input)
     ]
 
+    response_schema = _human_loop_schema("llm_translation", services)
+
     def make_processor(model_name: str):
         generator = get_model_generator(model_name, models_path=models_path)
         tracker = session_tracker()
@@ -203,9 +208,14 @@ def human_loop_translations(
             )
 
             def _invoke_once():
-                resp = generator(prompt, inputs={"text": english})
+                resp = generator(
+                    prompt,
+                    inputs={"text": english},
+                    stop_keys=_STOP_KEYS,
+                    response_schema=response_schema,
+                )
                 print(resp.content)
-                return resp, _parse_json_payload(resp.content)
+                return resp, _parse_json_payload(resp.content, model=model_name)
 
             on_attempt, total_cost = _make_attempt_recorder(
                 tracker,
@@ -314,6 +324,7 @@ def human_loop_translations(
         progress_prompt=prompt_name,
         progress_total=len(samples),
         progress_task_dir=task_dir,
+        models_path=models_path,
     )
 
     return True
@@ -21,6 +21,7 @@ from service_invocations.core.oracle_utils import (
     resolve_prompt_path as _resolve_prompt_path,
     retry_until_valid as _retry_until_valid,
 )
+from service_invocations.core.response_schemas import judge_schema as _judge_schema
 from service_invocations.core.results_io import (
     clear_completed_slice,
     load_completed_ids,
@@ -30,6 +31,8 @@ from service_invocations.models import get_enabled_models, get_model_generator
 
 _PARADIGM_NAME = "judge"
 _TASK_NAME = "language_translation"
+# JSON fields read from each response; lets streaming models stop early.
+_STOP_KEYS = ("llm_translation", "winner", "scores")
 _PROMPTS_ROOT = Path(__file__).parent / "prompts"
 _PARADIGM = "judge"
 
@@ -65,7 +68,7 @@ def judge_translations(
     services_path: Path | None = None,
     models_path: Path | None = None,
     task_name: str = _TASK_NAME,
-    fresh_run: bool = False,
+    fresh_run: bool | None = None,
 ):
     task_dir = results_dir if results_dir is not None else _DEFAULT_TASK_DIR
     if services_path is None:
@@ -115,6 +118,8 @@ def judge_translations(
         for sample_id, english in zip(ids, english_input)
     ]
 
+    response_schema = _judge_schema("llm_translation", services)
+
     def make_processor(model_name: str):
         generator = get_model_generator(model_name, models_path=models_path)
         tracker = session_tracker()
@@ -148,9 +153,14 @@ def judge_translations(
             )
 
             def _invoke_once():
-                resp = generator(prompt, inputs={"text": english})
+                resp = generator(
+                    prompt,
+                    inputs={"text": english},
+                    stop_keys=_STOP_KEYS,
+                    response_schema=response_schema,
+                )
                 print(resp.content)
-                return resp, _parse_json_payload(resp.content)
+                return resp, _parse_json_payload(resp.content, model=model_name)
 
             on_attempt, total_cost = _make_attempt_recorder(
                 tracker,
@@ -222,6 +232,7 @@ def judge_translations(
         progress_prompt=prompt_name,
         progress_total=len(samples),
         progress_task_dir=task_dir,
+        models_path=models_path,
     )
 
     return True
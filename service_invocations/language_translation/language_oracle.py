@@ -5,8 +5,13 @@ import pandas as pd
 from service_invocations.core.cost_tracker import (
     make_attempt_recorder as _make_attempt_recorder,
     session_tracker,
+    split_response as _split_response,
+)
+from service_invocations.core.llm_adapters import ModelUnavailableError
+from service_invocations.core.model_failover import (
+    partial_failure as _partial_failure,
+    run_with_failover,
 )
-from service_invocations.core.model_failover import run_with_failover
 from service_invocations.core import run_context as rc
 from service_invocations.core.oracle_utils import (
     extract_oracle as _extract_oracle,
@@ -14,19 +19,40 @@ from service_invocations.core.oracle_utils import (
     is_nullish_output as _is_nullish_output,
     load_prompt as _load_prompt,
     normalize_id as _normalize_id,
+    parse_json_payload as _parse_json_payload,
     resolve_prompt_path as _resolve_prompt_path,
     retry_until_valid as _retry_until_valid,
 )
+from service_invocations.core.response_schemas import (
+    oracle_schema as _oracle_schema,
+    packed_oracle_schema as _packed_oracle_schema,
+)
 from service_invocations.core.results_io import (
     clear_completed_slice,
     load_completed_ids,
     load_completed_rows,
+    read_results,
     write_oracle,
 )
 from service_invocations.models import get_enabled_models, get_model_generator
 
 _TASK_NAME = "language_translation"
 _PARADIGM_NAME = "oracle"
+# JSON fields read from each response; lets streaming models stop early.
+_STOP_KEYS = ("translation",)
+_RESPONSE_SCHEMA = _oracle_schema("translation")
+# Packing (``pack_size`` > 1): several sentences go out in one request as
+# numbered slots, and the answer maps each slot number to its translation.
+_PACK_KEY = "translations"
+_PACK_STOP_KEYS = (_PACK_KEY,)
+_PACK_INSTRUCTIONS = (
+    "\n\nBATCH MODE (this overrides the JSON schema above): you will receive "
+    "several English sources, each on its own line prefixed with a number in "
+    "square brackets, e.g. [1]. Translate each source independently, following "
+    "every rule above, and return ONLY a JSON object of the form "
+    '{"translations": {"1": string|null, "2": string|null, ...}} '
+    "with exactly one entry per number received."
+)
 
 _PROMPTS_ROOT = Path(__file__).parent / "prompts"
 _PARADIGM = "oracle"
@@ -42,8 +68,19 @@ def generate_oracle_translations(
     use_existing: bool = False,
     results_dir: Path | None = None,
     models_path: Path | None = None,
-    fresh_run: bool = False,
+    fresh_run: bool | None = None,
+    pack_size: int = 1,
 ):
+    """Label ``europarl_data`` with each enabled model acting as the oracle.
+
+    ``pack_size`` > 1 packs that many sentences into one request (one shared
+    prompt instead of one per sentence). The pack's tokens are split evenly
+    across its sentences in cost.csv; sentences whose slot is missing or null
+    in the answer — or every sentence, if the answer doesn't parse — are then
+    labeled one at a time as usual, continuing the same cost ledger.
+    """
+    if isinstance(pack_size, bool) or not isinstance(pack_size, int) or pack_size < 1:
+        raise ValueError("pack_size must be a positive integer.")
     task_dir = results_dir if results_dir is not None else _DEFAULT_TASK_DIR
     if models_path is None:
         models_path = rc.config_path("models.yaml")
@@ -77,10 +114,13 @@ def generate_oracle_translations(
         {"id": row["id"], "english": row["english"]}
         for _, row in europarl_data.iterrows()
     ]
+    work_items: list = (
+        samples if pack_size == 1
+        else [samples[i:i + pack_size] for i in range(0, len(samples), pack_size)]
+    )
 
     pending_models: list[str] = []
-    existing_path = task_dir / "oracle.csv"
-    existing_df = pd.read_csv(existing_path) if existing_path.exists() else None
+    existing_df = read_results(task_dir / "oracle.csv")
     for model_name in enabled_models:
         if use_existing and existing_df is not None:
             slice_df = existing_df[
@@ -95,6 +135,7 @@ def generate_oracle_translations(
     def make_processor(model_name: str):
         generator = get_model_generator(model_name, models_path=models_path)
         prompt = _load_prompt(prompt_path)
+        pack_prompt = prompt + _PACK_INSTRUCTIONS
         tracker = session_tracker()
         done_ids: set[str] = (
             set()
@@ -107,20 +148,8 @@ def generate_oracle_translations(
                 f"{len(done_ids)} sample(s) already in CSV — will skip."
             )
 
-        def process(sample: dict) -> dict | None:
-            sample_id = sample["id"]
-            english_text = sample["english"]
-            id_key = _normalize_id(sample_id)
-            if id_key in done_ids:
-                return None
-            print(f"LLM Oracle Translation ({model_name}): {sample_id}")
-
-            def _invoke_once():
-                resp = generator(prompt, inputs={"text": english_text})
-                print(resp.content)
-                return resp, _extract_oracle(resp.content, key="translation")
-
-            on_attempt, total_cost = _make_attempt_recorder(
+        def _recorder(sample_id):
+            return _make_attempt_recorder(
                 tracker,
                 task=_TASK_NAME,
                 paradigm=_PARADIGM_NAME,
@@ -129,14 +158,28 @@ def generate_oracle_translations(
                 usable=lambda pair: not _is_nullish_output(pair[1]),
                 models_path=models_path,
             )
-            response, llm_oracle = _retry_until_valid(
+
+        def _translate(sample: dict, on_attempt):
+            english_text = sample["english"]
+
+            def _invoke_once():
+                resp = generator(
+                    prompt,
+                    inputs={"text": english_text},
+                    stop_keys=_STOP_KEYS,
+                    response_schema=_RESPONSE_SCHEMA,
+                )
+                print(resp.content)
+                return resp, _extract_oracle(resp.content, key="translation", model=model_name)
+
+            return _retry_until_valid(
                 _invoke_once,
                 validate=lambda pair: not _is_nullish_output(pair[1]),
-                description=f"language_oracle {model_name} sample={sample_id}",
+                description=f"language_oracle {model_name} sample={sample['id']}",
                 on_attempt=on_attempt,
             )
-            cost = total_cost()
-            done_ids.add(id_key)
+
+        def _row(id_key: str, response, llm_oracle, cost) -> dict:
             return {
                 "id": id_key,
                 "llm_oracle": llm_oracle,
@@ -146,6 +189,69 @@ def generate_oracle_translations(
                 "cost_usd": cost,
             }
 
+        def process_one(sample: dict) -> dict | None:
+            sample_id = sample["id"]
+            id_key = _normalize_id(sample_id)
+            if id_key in done_ids:
+                return None
+            print(f"LLM Oracle Translation ({model_name}): {sample_id}")
+            on_attempt, total_cost = _recorder(sample_id)
+            response, llm_oracle = _translate(sample, on_attempt)
+            done_ids.add(id_key)
+            return _row(id_key, response, llm_oracle, total_cost())
+
+        def process_pack(pack: list[dict]) -> list[dict]:
+            todo = [s for s in pack if _normalize_id(s["id"]) not in done_ids]
+            if len(todo) <= 1:
+                row = process_one(todo[0]) if todo else None
+                return [row] if row is not None else []
+            slots = [str(i) for i in range(1, len(todo) + 1)]
+            print(
+                f"LLM Oracle Translation ({model_name}): pack of {len(todo)} "
+                f"({todo[0]['id']} .. {todo[-1]['id']})"
+            )
+            resp = generator(
+                pack_prompt,
+                inputs={"text": "\n".join(
+                    f"[{slot}] {sample['english']}" for slot, sample in zip(slots, todo)
+                )},
+                stop_keys=_PACK_STOP_KEYS,
+                response_schema=_packed_oracle_schema(_PACK_KEY, slots),
+            )
+            print(resp.content)
+            answers = _parse_json_payload(resp.content, model=model_name).get(_PACK_KEY)
+            if not isinstance(answers, dict):
+                answers = {}
+            shares = _split_response(resp, [1.0] * len(todo))
+            rows = []
+            fallbacks = []
+            for slot, sample, share in zip(slots, todo, shares):
+                on_attempt, total_cost = _recorder(sample["id"])
+                answer = answers.get(slot, "n/a")
+                ok = not _is_nullish_output(answer)
+                # The pack counts as this sample's first attempt.
+                on_attempt((share, answer), ok)
+                if ok:
+                    rows.append(_row(_normalize_id(sample["id"]), share, answer, total_cost()))
+                else:
+                    fallbacks.append((sample, on_attempt, total_cost))
+            done_ids.update(row["id"] for row in rows)
+            for i, (sample, on_attempt, total_cost) in enumerate(fallbacks):
+                try:
+                    response, llm_oracle = _translate(sample, on_attempt)
+                except ModelUnavailableError as exc:
+                    # Keep the answers already paid for; only the samples
+                    # still without a row are deferred, each on its own.
+                    raise _partial_failure(exc, rows, [s for s, _, _ in fallbacks[i:]])
+                rows.append(_row(_normalize_id(sample["id"]), response, llm_oracle, total_cost()))
+                done_ids.add(rows[-1]["id"])
+            return rows
+
+        def process(item):
+            if isinstance(item, list):
+                return process_pack(item)
+            return process_one(item)
+
         return process
 
     def on_progress(model_name: str, rows: list[dict], is_final: bool) -> None:
@@ -154,17 +260,11 @@ def generate_oracle_translations(
             full_slice = load_completed_rows(task_dir, "oracle", prompt_name, model_name)
             if not full_slice.empty:
                 results_by_model[model_name] = full_slice
-            elif rows:
-                results_by_model[model_name] = pd.DataFrame(rows)
-            # else: this model produced no oracle rows (e.g. it was permanently
-            # unavailable). Leave it unregistered rather than storing an empty,
-            # column-less pd.DataFrame([]) — that frame later crashed the metric
-            # layer with KeyError: 'id'.
 
     if pending_models:
-        run_with_failover(
+        pass_rows = run_with_failover(
             models=pending_models,
-            samples=samples,
+            samples=work_items,
             make_processor=make_processor,
             on_progress=on_progress,
             progress_task=_TASK_NAME,
@@ -172,7 +272,16 @@ def generate_oracle_translations(
             progress_prompt=prompt_name,
             progress_total=len(samples),
             progress_task_dir=task_dir,
+            models_path=models_path,
         )
+        # on_progress only sees each checkpoint's new rows, so if the slice
+        # could not be read back, fall back to the rows this pass returned.
+        # A model with none (e.g. permanently unavailable) stays unregistered
+        # rather than storing an empty, column-less pd.DataFrame([]) — that
+        # frame later crashed the metric layer with KeyError: 'id'.
+        for model_name, rows in pass_rows.items():
+            if model_name not in results_by_model and rows:
+                results_by_model[model_name] = pd.DataFrame(rows)
 
     if len(enabled_models) > 1:
         return results_by_model
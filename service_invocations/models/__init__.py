@@ -1,13 +1,44 @@
 from __future__ import annotations
 
+import asyncio
 from pathlib import Path
-from typing import Any, Dict, List, Callable
+from typing import Any, Awaitable, Dict, List, Callable, Sequence
 import os
 import re
 
 import yaml
 
-from service_invocations.core.llm_adapters import LLMResponse, get_llm_adapter
+from service_invocations.core.adaptive_concurrency import (
+    AdaptiveConcurrency,
+    get_concurrency_controller,
+)
+from service_invocations.core.batch_jobs import BatchTarget, active_batch_session
+from service_invocations.core.hedging import (
+    ahedged_call,
+    get_hedge_executor,
+    get_latency_tracker,
+    hedged_call,
+)
+from service_invocations.core.llm_adapters import (
+    LLMResponse,
+    before_each_attempt,
+    get_llm_adapter,
+    observe_retries,
+)
+from service_invocations.core.oracle_utils import salvage_json_object
+from service_invocations.core.rate_limiter import (
+    RateLimiter,
+    estimate_tokens,
+    get_rate_limiter,
+)
+from service_invocations.core.response_cache import (
+    CACHE_OFFLINE,
+    ResponseCache,
+    ResponseCacheMiss,
+    cache_mode,
+    get_response_cache,
+    request_key,
+)
 from service_invocations.core import run_context as rc
 
 
@@ -89,6 +120,41 @@ def _resolve_temperature(entry: Dict[str, Any]) -> float:
     return float(temperature)
 
 
+def _resolve_positive_int(entry: Dict[str, Any], key: str, default: int) -> int:
+    value = entry.get(key, default)
+    if value is None:
+        return default
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError(f"models.yaml entry {key} must be a positive integer.")
+    return value
+
+
+def _resolve_flag(entry: Dict[str, Any], key: str) -> bool:
+    value = entry.get(key, False)
+    if not isinstance(value, bool):
+        raise ValueError(f"models.yaml entry {key} must be true or false.")
+    return value
+
+
+def get_model_max_in_flight(model_name: str, models_path: Path | None = None) -> int:
+    """How many samples the failover runner may have in flight for a model.
+
+    Read from the optional ``max_in_flight`` key of the model's models.yaml
+    entry. Models without an entry (or without the key) get ``1`` — the old
+    one-request-at-a-time behavior.
+    """
+    if models_path is None:
+        models_path = rc.config_path("models.yaml")
+    try:
+        models_cfg = _get_models_section(_load_models_config(models_path))
+    except (FileNotFoundError, ValueError):
+        return 1
+    entry = models_cfg.get(model_name)
+    if not isinstance(entry, dict):
+        return 1
+    return _resolve_positive_int(entry, "max_in_flight", 1)
+
+
 def get_enabled_models(models_path: Path | None = None) -> List[str]:
     if models_path is None:
         models_path = rc.config_path("models.yaml")
@@ -101,10 +167,123 @@ def get_enabled_models(models_path: Path | None = None) -> List[str]:
     return enabled
 
 
-def get_model_generator(
-    model_name: str,
-    models_path: Path | None = None,
-) -> Callable[[str, Dict[str, Any] | None, List[str] | None], LLMResponse]:
+def _resolve_rate(entry: Dict[str, Any], key: str) -> float | None:
+    value = entry.get(key)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        raise ValueError(f"models.yaml entry {key} must be a positive number.")
+    return float(value)
+
+
+def _rate_limiter_for(model_name: str, entry: Dict[str, Any]) -> RateLimiter | None:
+    return get_rate_limiter(
+        model_name,
+        requests_per_minute=_resolve_rate(entry, "requests_per_minute"),
+        tokens_per_minute=_resolve_rate(entry, "tokens_per_minute"),
+    )
+
+
+def _concurrency_controller_for(
+    model_name: str, entry: Dict[str, Any]
+) -> AdaptiveConcurrency | None:
+    if not _resolve_flag(entry, "adaptive_concurrency"):
+        return None
+    ceiling = _resolve_positive_int(entry, "max_in_flight", 1)
+    return get_concurrency_controller(model_name, ceiling)
+
+
+class _AttemptBudget:
+    """Rate-limit budget and concurrency slot for one logical call.
+
+    The first attempt's are taken before the call. Each retry ``_retry_call``
+    makes takes its own, and the slot is given back while it backs off.
+    """
+
+    def __init__(
+        self,
+        limiter: RateLimiter | None,
+        controller: AdaptiveConcurrency | None,
+        estimated: int,
+    ) -> None:
+        self.limiter = limiter
+        self.controller = controller
+        self.estimated = estimated
+        self._held = False
+
+    def acquire(self) -> None:
+        if self.controller is not None and not self._held:
+            self.controller.acquire()
+            self._held = True
+        if self.limiter is not None:
+            self.limiter.acquire(self.estimated)
+
+    async def aacquire(self) -> None:
+        if self.controller is not None and not self._held:
+            await self.controller.aacquire()
+            self._held = True
+        if self.limiter is not None:
+            await self.limiter.aacquire(self.estimated)
+
+    def before_attempt(self, attempt: int) -> None:
+        if attempt > 0:
+            self.acquire()
+
+    def abefore_attempt(self, attempt: int) -> Awaitable[None] | None:
+        if attempt == 0:
+            return None
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # An adapter without native async ran the blocking retry loop in
+            # a worker thread.
+            self.acquire()
+            return None
+        return self.aacquire()
+
+    def on_retry(self, exc: BaseException, is_throttle: bool, retry_after: float | None) -> None:
+        if self.controller is None:
+            return
+        self.controller.on_retry(exc, is_throttle, retry_after)
+        self.release()
+
+    def release(self) -> None:
+        if self._held:
+            self.controller.release()
+            self._held = False
+
+    def settle(self, response: LLMResponse) -> None:
+        if self.limiter is not None:
+            self.limiter.settle(self.estimated, response)
+        if self.controller is not None:
+            self.controller.on_success()
+
+
+def _resolve_hedge_percentile(entry: Dict[str, Any]) -> float | None:
+    value = entry.get("hedge_after_percentile")
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 < value < 100:
+        raise ValueError(
+            "models.yaml entry hedge_after_percentile must be a number between 0 and 100."
+        )
+    return float(value)
+
+
+def _answer_parses(stop_keys: Sequence[str] | None) -> Callable[[LLMResponse], bool]:
+    """Whether a hedged attempt's answer is a JSON object with ``stop_keys``."""
+
+    def accept(response: LLMResponse) -> bool:
+        payload = salvage_json_object(response.content or "")
+        return payload is not None and all(key in payload for key in stop_keys or ())
+
+    return accept
+
+
+def _resolve_model_call(
+    model_name: str, models_path: Path | None
+) -> tuple[str, str, float, Dict[str, Any]]:
+    """Return ``(provider, model_id, temperature, entry)`` for a models.yaml entry."""
     if models_path is None:
         models_path = rc.config_path("models.yaml")
     config = _load_models_config(models_path)
@@ -115,26 +294,338 @@ def get_model_generator(
         raise ValueError(
             f"models.yaml entry for '{model_name}' is missing provider."
         )
-    model_id = _resolve_model_id(model_name, entry)
-    temperature = _resolve_temperature(entry)
+    return (
+        provider,
+        _resolve_model_id(model_name, entry),
+        _resolve_temperature(entry),
+        entry,
+    )
+
+
+def _adapter_options(adapter: Any, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Optional adapter kwargs, passed only when set (and supported)."""
+    kwargs: Dict[str, Any] = {}
+    if options.get("response_schema") is not None:
+        kwargs["response_schema"] = options["response_schema"]
+    if options.get("static_prefix") and getattr(adapter, "supports_context_cache", False):
+        kwargs["static_prefix"] = options["static_prefix"]
+    return kwargs
+
+
+def _static_prefix(prompt: str) -> str | None:
+    """The template prefix of a compiled prompt (see ``oracle_utils``)."""
+    prefix = getattr(prompt, "static_prefix", None)
+    if prefix and prompt.startswith(prefix):
+        return prefix
+    return None
+
+
+def _batch_target_for(
+    model_name: str, provider: str, model_id: str, entry: Dict[str, Any]
+) -> BatchTarget | None:
+    """Where the model's batch jobs go, or ``None`` without ``batch_mode``."""
+    if not _resolve_flag(entry, "batch_mode"):
+        return None
+    endpoint = entry.get("batch_endpoint")
+    if endpoint is not None and (not isinstance(endpoint, str) or not endpoint.strip()):
+        raise ValueError("models.yaml entry batch_endpoint must be a URL string.")
+    return BatchTarget(model_name, provider, model_id, endpoint)
+
+
+def _cache_lookup(
+    cache: ResponseCache,
+    model_name: str,
+    key: str,
+) -> tuple[int, LLMResponse | None]:
+    """Claim this request's cache slot; return ``(ordinal, hit)``.
+
+    In offline mode a miss raises :class:`ResponseCacheMiss` instead of
+    returning ``None``, so the caller never reaches the provider.
+    """
+    ordinal = cache.next_ordinal(key)
+    hit = cache.get(key, ordinal)
+    if hit is None and cache_mode() == CACHE_OFFLINE:
+        raise ResponseCacheMiss(
+            f"No cached response for {model_name} (key {key[:12]}, ordinal {ordinal}) "
+            "and LLM_RESPONSE_CACHE=offline."
+        )
+    return ordinal, hit
+
+
+def get_model_generator(
+    model_name: str,
+    models_path: Path | None = None,
+) -> Callable[[str, Dict[str, Any] | None, List[str] | None], LLMResponse]:
+    provider, model_id, temperature, entry = _resolve_model_call(model_name, models_path)
+    limiter = _rate_limiter_for(model_name, entry)
+    controller = _concurrency_controller_for(model_name, entry)
+    hedge_after = _resolve_hedge_percentile(entry)
+    max_in_flight = _resolve_positive_int(entry, "max_in_flight", 1)
+    stream = _resolve_flag(entry, "stream_early_stop")
+    structured = _resolve_flag(entry, "structured_output")
+    context_cache = _resolve_flag(entry, "context_cache")
+    batch_target = _batch_target_for(model_name, provider, model_id, entry)
+
+    def _call(
+        prompt: str,
+        payload_inputs: Dict[str, Any],
+        requested_modalities: List[str],
+        options: Dict[str, Any],
+    ) -> LLMResponse:
+        adapter = get_llm_adapter(provider)
+        if stream and hasattr(adapter, "generate_stream"):
+            return adapter.generate_stream(
+                model_id,
+                prompt,
+                payload_inputs,
+                requested_modalities,
+                temperature=temperature,
+                stop_keys=options.get("stop_keys"),
+                **_adapter_options(adapter, options),
+            )
+        return adapter.generate(
+            model_id,
+            prompt,
+            payload_inputs,
+            requested_modalities,
+            temperature=temperature,
+            **_adapter_options(adapter, options),
+        )
+
+    def _live(
+        prompt: str,
+        payload_inputs: Dict[str, Any],
+        requested_modalities: List[str],
+        options: Dict[str, Any],
+        on_start: Callable[[], None] | None = None,
+    ) -> LLMResponse:
+        if limiter is None and controller is None:
+            if on_start is not None:
+                on_start()
+            return _call(prompt, payload_inputs, requested_modalities, options)
+        budget = _AttemptBudget(
+            limiter,
+            controller,
+            estimate_tokens(prompt, payload_inputs) if limiter is not None else 0,
+        )
+        try:
+            budget.acquire()
+            if on_start is not None:
+                on_start()
+            with before_each_attempt(budget.before_attempt), observe_retries(budget.on_retry):
+                response = _call(prompt, payload_inputs, requested_modalities, options)
+        finally:
+            budget.release()
+        budget.settle(response)
+        return response
+
+    def _hedged(
+        prompt: str,
+        payload_inputs: Dict[str, Any],
+        requested_modalities: List[str],
+        options: Dict[str, Any],
+    ) -> LLMResponse:
+        if hedge_after is None:
+            return _live(prompt, payload_inputs, requested_modalities, options)
+        return hedged_call(
+            lambda on_start: _live(
+                prompt, payload_inputs, requested_modalities, options, on_start
+            ),
+            get_latency_tracker(model_name),
+            hedge_after,
+            get_hedge_executor(model_name, max_in_flight),
+            accept=_answer_parses(options["stop_keys"]),
+        )
 
     def generate(
         prompt: str,
         inputs: Dict[str, Any] | None = None,
         modalities: List[str] | None = None,
+        *,
+        stop_keys: Sequence[str] | None = None,
+        response_schema: Dict[str, Any] | None = None,
     ) -> LLMResponse:
+        """Call the model.
+
+        ``stop_keys`` names the JSON fields the caller will read. For models
+        with ``stream_early_stop`` the response is streamed and cut off as
+        soon as those fields (or the whole JSON object) are complete; other
+        models ignore it.
+
+        ``response_schema`` (see ``core.response_schemas``) is passed to the
+        provider as a structured-output constraint for models with
+        ``structured_output``; other models ignore it.
+
+        For models with ``context_cache``, a prompt rendered from a compiled
+        template (``oracle_utils.load_prompt``) has its static prefix
+        registered once as provider-side cached context and only the
+        per-sample remainder is sent with each call.
+
+        For models with ``batch_mode``, calls made inside
+        ``batch_jobs.run_batched`` are collected into a provider batch job
+        (raising ``BatchRequestQueued``) and answered from its results when
+        the slice is replayed.
+        """
         payload_inputs = inputs or {}
         requested_modalities = modalities or infer_modalities(payload_inputs)
+        options: Dict[str, Any] = {
+            "stop_keys": list(stop_keys) if stop_keys else None,
+            "response_schema": response_schema if structured else None,
+            "static_prefix": _static_prefix(prompt) if context_cache else None,
+        }
+        cache = get_response_cache()
+        batch = active_batch_session() if batch_target is not None else None
+        if cache is None and batch is None:
+            return _hedged(prompt, payload_inputs, requested_modalities, options)
+        # A cut-off stream is a different answer from a full completion.
+        key_extra: Dict[str, Any] = {"response_schema": options["response_schema"]}
+        if stream:
+            key_extra["stream_stop_keys"] = options["stop_keys"] or []
+        key = request_key(model_id, temperature, prompt, payload_inputs, **key_extra)
+        if cache is not None:
+            ordinal, hit = _cache_lookup(cache, model_name, key)
+            if hit is not None:
+                return hit
+        response = None
+        if batch is not None:
+            response = batch.resolve(
+                batch_target, key, prompt, payload_inputs, temperature,
+                options["response_schema"],
+            )
+        if response is None:
+            response = _hedged(prompt, payload_inputs, requested_modalities, options)
+        if cache is not None:
+            cache.put(key, ordinal, model_id, response)
+        return response
+
+    return generate
+
+
+def get_async_model_generator(
+    model_name: str,
+    models_path: Path | None = None,
+) -> Callable[[str, Dict[str, Any] | None, List[str] | None], Awaitable[LLMResponse]]:
+    """Coroutine twin of :func:`get_model_generator`.
+
+    The returned ``agenerate(prompt, inputs, modalities)`` awaits the adapter's
+    native ``agenerate`` so many labeling calls can run on one event loop.
+    """
+    provider, model_id, temperature, entry = _resolve_model_call(model_name, models_path)
+    limiter = _rate_limiter_for(model_name, entry)
+    controller = _concurrency_controller_for(model_name, entry)
+    hedge_after = _resolve_hedge_percentile(entry)
+    structured = _resolve_flag(entry, "structured_output")
+    context_cache = _resolve_flag(entry, "context_cache")
+    batch_target = _batch_target_for(model_name, provider, model_id, entry)
+
+    async def _acall(
+        prompt: str,
+        payload_inputs: Dict[str, Any],
+        requested_modalities: List[str],
+        options: Dict[str, Any],
+    ) -> LLMResponse:
         adapter = get_llm_adapter(provider)
-        return adapter.generate(
+        return await adapter.agenerate(
             model_id,
             prompt,
             payload_inputs,
             requested_modalities,
             temperature=temperature,
+            **_adapter_options(adapter, options),
         )
 
-    return generate
+    async def _alive(
+        prompt: str,
+        payload_inputs: Dict[str, Any],
+        requested_modalities: List[str],
+        options: Dict[str, Any],
+        on_start: Callable[[], None] | None = None,
+    ) -> LLMResponse:
+        if limiter is None and controller is None:
+            if on_start is not None:
+                on_start()
+            return await _acall(prompt, payload_inputs, requested_modalities, options)
+        budget = _AttemptBudget(
+            limiter,
+            controller,
+            estimate_tokens(prompt, payload_inputs) if limiter is not None else 0,
+        )
+        try:
+            await budget.aacquire()
+            if on_start is not None:
+                on_start()
+            with before_each_attempt(budget.abefore_attempt), observe_retries(budget.on_retry):
+                response = await _acall(prompt, payload_inputs, requested_modalities, options)
+        finally:
+            budget.release()
+        budget.settle(response)
+        return response
+
+    async def _ahedged(
+        prompt: str,
+        payload_inputs: Dict[str, Any],
+        requested_modalities: List[str],
+        options: Dict[str, Any],
+    ) -> LLMResponse:
+        if hedge_after is None:
+            return await _alive(prompt, payload_inputs, requested_modalities, options)
+        return await ahedged_call(
+            lambda on_start: _alive(
+                prompt, payload_inputs, requested_modalities, options, on_start
+            ),
+            get_latency_tracker(model_name),
+            hedge_after,
+            accept=_answer_parses(options["stop_keys"]),
+        )
+
+    async def agenerate(
+        prompt: str,
+        inputs: Dict[str, Any] | None = None,
+        modalities: List[str] | None = None,
+        *,
+        stop_keys: Sequence[str] | None = None,
+        response_schema: Dict[str, Any] | None = None,
+    ) -> LLMResponse:
+        # ``stop_keys`` is accepted for parity with ``generate``; async calls
+        # always wait for the full completion (it only guides hedging).
+        payload_inputs = inputs or {}
+        requested_modalities = modalities or infer_modalities(payload_inputs)
+        options: Dict[str, Any] = {
+            "stop_keys": list(stop_keys) if stop_keys else None,
+            "response_schema": response_schema if structured else None,
+            "static_prefix": _static_prefix(prompt) if context_cache else None,
+        }
+        cache = get_response_cache()
+        batch = active_batch_session() if batch_target is not None else None
+        if cache is None and batch is None:
+            return await _ahedged(prompt, payload_inputs, requested_modalities, options)
+        key = request_key(
+            model_id, temperature, prompt, payload_inputs,
+            response_schema=options["response_schema"],
+        )
+        if cache is not None:
+            ordinal, hit = _cache_lookup(cache, model_name, key)
+            if hit is not None:
+                return hit
+        response = None
+        if batch is not None:
+            response = batch.resolve(
+                batch_target, key, prompt, payload_inputs, temperature,
+                options["response_schema"],
+            )
+        if response is None:
+            response = await _ahedged(prompt, payload_inputs, requested_modalities, options)
+        if cache is not None:
+            cache.put(key, ordinal, model_id, response)
+        return response
+
+    return agenerate
 
 
-__all__ = ["get_enabled_models", "get_model_generator", "infer_modalities"]
+__all__ = [
+    "get_async_model_generator",
+    "get_enabled_models",
+    "get_model_generator",
+    "get_model_max_in_flight",
+    "infer_modalities",
+]
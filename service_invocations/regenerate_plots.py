@@ -38,6 +38,7 @@ from service_invocations.core.llmaas import (
 )
 from service_invocations.core.plotting import plot_all_for_task
 from service_invocations.core.results_io import (
+    read_results,
     write_llmaas_accuracy,
     write_llmaas_summary,
 )
@@ -50,13 +51,12 @@ _KNOWN_TASKS = (
 
 
 def _read_csv_or_none(path: Path) -> pd.DataFrame | None:
-    if not path.exists():
-        return None
+    # read_results merges a paradigm file's not-yet-compacted journal rows.
     try:
-        df = pd.read_csv(path)
+        df = read_results(path)
     except pd.errors.EmptyDataError:
         return None
-    return df if not df.empty else None
+    return df if df is not None and not df.empty else None
 
 
 def _find_samples_csv(task_dir: Path, task: str) -> Path | None:
@@ -0,0 +1,65 @@
+"""Join several ASR clips into one WAV with audible separators.
+
+Used by the ASR oracle's batching mode; clips are down-mixed to mono, resampled
+to the first clip's rate and joined with silence + beep + silence between them.
+"""
+from __future__ import annotations
+
+import io
+from typing import Any, List, Sequence, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from service_invocations.core.media_cache import read_media
+
+_GAP_SECONDS = 0.4
+_BEEP_SECONDS = 0.15
+_BEEP_HZ = 1000.0
+_BEEP_AMPLITUDE = 0.2
+
+
+def _mono(samples: np.ndarray) -> np.ndarray:
+    return samples.mean(axis=1) if samples.ndim > 1 else samples
+
+
+def _resample(samples: np.ndarray, rate: int, target: int) -> np.ndarray:
+    if rate == target or samples.size == 0:
+        return samples
+    length = max(1, round(samples.size * target / rate))
+    positions = np.linspace(0, samples.size - 1, num=length)
+    return np.interp(positions, np.arange(samples.size), samples)
+
+
+def _separator(rate: int) -> np.ndarray:
+    gap = np.zeros(int(_GAP_SECONDS * rate))
+    t = np.arange(int(_BEEP_SECONDS * rate)) / rate
+    beep = _BEEP_AMPLITUDE * np.sin(2 * np.pi * _BEEP_HZ * t)
+    return np.concatenate([gap, beep, gap])
+
+
+def concat_clips(clips: Sequence[Any]) -> Tuple[bytes, List[float]]:
+    """Return ``(wav_bytes, durations)`` for ``clips`` (paths or bytes).
+
+    ``durations`` are the clips' own lengths in seconds, separators excluded,
+    for splitting the batched call's audio tokens back per clip.
+    """
+    if not clips:
+        raise ValueError("concat_clips needs at least one clip.")
+    decoded = [sf.read(io.BytesIO(read_media(clip)), dtype="float64") for clip in clips]
+    rate = decoded[0][1]
+    separator = _separator(rate)
+    pieces: List[np.ndarray] = []
+    durations: List[float] = []
+    for index, (samples, clip_rate) in enumerate(decoded):
+        mono = _resample(_mono(samples), clip_rate, rate)
+        if index:
+            pieces.append(separator)
+        pieces.append(mono)
+        durations.append(mono.size / rate)
+    buf = io.BytesIO()
+    sf.write(buf, np.clip(np.concatenate(pieces), -1.0, 1.0), rate, format="WAV", subtype="PCM_16")
+    return buf.getvalue(), durations
+
+
+__all__ = ["concat_clips"]
@@ -21,6 +21,7 @@ from service_invocations.core.oracle_utils import (
     resolve_prompt_path as _resolve_prompt_path,
     retry_until_valid as _retry_until_valid,
 )
+from service_invocations.core.response_schemas import human_loop_schema as _human_loop_schema
 from service_invocations.core.results_io import (
     clear_completed_slice,
     load_completed_ids,
@@ -31,6 +32,8 @@ from service_invocations.speech_recognition.wer import word_error_counts
 
 _PARADIGM_NAME = "human_loop"
 _TASK_NAME = "speech_recognition"
+# JSON fields read from each response; lets streaming models stop early.
+_STOP_KEYS = ("llm_transcript", "winner", "scores", "confidence")
 _PROMPTS_ROOT = Path(__file__).parent / "prompts"
 _PARADIGM = "human-loop"
 # Confidence below this routes the sample to a human reviewer (the fallback in
@@ -93,7 +96,7 @@ def human_loop_transcripts(
     services_path: Path | None = None,
     models_path: Path | None = None,
     task_name: str = _TASK_NAME,
-    fresh_run: bool = False,
+    fresh_run: bool | None = None,
 ):
     task_dir = results_dir if results_dir is not None else _DEFAULT_TASK_DIR
     if services_path is None:
@@ -151,6 +154,8 @@ def human_loop_transcripts(
         for sample_id, wav in zip(ids, wav_files)
     ]
 
+    response_schema = _human_loop_schema("llm_transcript", services)
+
     def make_processor(model_name: str):
         generator = get_model_generator(model_name, models_path=models_path)
         tracker = session_tracker()
@@ -180,9 +185,14 @@ def human_loop_transcripts(
             prompt = _load_prompt(prompt_path, service_blocks=service_blocks)
 
             def _invoke_once():
-                resp = generator(prompt, inputs={"audio": wav})
+                resp = generator(
+                    prompt,
+                    inputs={"audio": wav},
+                    stop_keys=_STOP_KEYS,
+                    response_schema=response_schema,
+                )
                 print(resp.content)
-                return resp, _parse_json_payload(resp.content)
+                return resp, _parse_json_payload(resp.content, model=model_name)
 
             on_attempt, total_cost = _make_attempt_recorder(
                 tracker,
@@ -290,6 +300,7 @@ def human_loop_transcripts(
         progress_prompt=prompt_name,
         progress_total=len(samples),
         progress_task_dir=task_dir,
+        models_path=models_path,
     )
 
     return True
@@ -5,8 +5,13 @@ import pandas as pd
 from service_invocations.core.cost_tracker import (
     make_attempt_recorder as _make_attempt_recorder,
     session_tracker,
+    split_response as _split_response,
+)
+from service_invocations.core.llm_adapters import ModelUnavailableError
+from service_invocations.core.model_failover import (
+    partial_failure as _partial_failure,
+    run_with_failover,
 )
-from service_invocations.core.model_failover import run_with_failover
 from service_invocations.core import run_context as rc
 from service_invocations.core.oracle_utils import (
     extract_oracle as _extract_oracle,
@@ -14,19 +19,42 @@ from service_invocations.core.oracle_utils import (
     is_nullish_output as _is_nullish_output,
     load_prompt as _load_prompt,
     normalize_id as _normalize_id,
+    parse_json_payload as _parse_json_payload,
     resolve_prompt_path as _resolve_prompt_path,
     retry_until_valid as _retry_until_valid,
 )
+from service_invocations.core.response_schemas import (
+    oracle_schema as _oracle_schema,
+    segmented_oracle_schema as _segmented_oracle_schema,
+)
 from service_invocations.core.results_io import (
     clear_completed_slice,
     load_completed_ids,
     load_completed_rows,
+    read_results,
     write_oracle,
 )
 from service_invocations.models import get_enabled_models, get_model_generator
+from service_invocations.speech_recognition.audio_batch import concat_clips as _concat_clips
 
 _TASK_NAME = "speech_recognition"
 _PARADIGM_NAME = "oracle"
+# JSON fields read from each response; lets streaming models stop early.
+_STOP_KEYS = ("transcript",)
+_RESPONSE_SCHEMA = _oracle_schema("transcript")
+# Batching (``batch_size`` > 1): several clips are joined into one WAV with a
+# beep between them, and the answer lists one transcript per segment.
+_BATCH_KEY = "transcripts"
+_BATCH_STOP_KEYS = (_BATCH_KEY,)
+_BATCH_SCHEMA = _segmented_oracle_schema(_BATCH_KEY)
+_BATCH_INSTRUCTIONS = (
+    "\n\nBATCH MODE (this overrides the JSON schema above): the audio contains "
+    "{count} separate recordings played one after another, separated by a short "
+    "beep between stretches of silence. Transcribe each recording independently, "
+    "following every rule above, and return ONLY a JSON object of the form "
+    '{{"transcripts": [string|null, ...]}} with exactly {count} entries, in the '
+    "order the recordings are heard. Do not transcribe the beeps."
+)
 
 _PROMPTS_ROOT = Path(__file__).parent / "prompts"
 _PARADIGM = "oracle"
@@ -42,8 +70,20 @@ def generate_oracle_transcripts(
     use_existing: bool = False,
     results_dir: Path | None = None,
     models_path: Path | None = None,
-    fresh_run: bool = False,
+    fresh_run: bool | None = None,
+    batch_size: int = 1,
 ):
+    """Label ``edacc_data`` with each enabled model acting as the oracle.
+
+    ``batch_size`` > 1 joins that many clips into one WAV per request (see
+    ``audio_batch``). The call's audio tokens are split back by clip duration
+    and its text/output tokens evenly, so cost.csv stays per clip and
+    ``compute_cost`` bills each share's audio at the audio rate. If the
+    transcript list is missing or has the wrong length, every clip is
+    transcribed on its own; null entries fall back for just that clip.
+    """
+    if isinstance(batch_size, bool) or not isinstance(batch_size, int) or batch_size < 1:
+        raise ValueError("batch_size must be a positive integer.")
     task_dir = results_dir if results_dir is not None else _DEFAULT_TASK_DIR
     if models_path is None:
         models_path = rc.config_path("models.yaml")
@@ -77,10 +117,13 @@ def generate_oracle_transcripts(
         {"id": row["id"], "audio": row["audio"]}
         for _, row in edacc_data.iterrows()
     ]
+    work_items: list = (
+        samples if batch_size == 1
+        else [samples[i:i + batch_size] for i in range(0, len(samples), batch_size)]
+    )
 
     pending_models: list[str] = []
-    existing_path = task_dir / "oracle.csv"
-    existing_df = pd.read_csv(existing_path) if existing_path.exists() else None
+    existing_df = read_results(task_dir / "oracle.csv")
     for model_name in enabled_models:
         if use_existing and existing_df is not None:
             slice_df = existing_df[
@@ -107,20 +150,8 @@ def generate_oracle_transcripts(
                 f"{len(done_ids)} sample(s) already in CSV — will skip."
             )
 
-        def process(sample: dict) -> dict | None:
-            sample_id = sample["id"]
-            audio_file = sample["audio"]
-            id_key = _normalize_id(sample_id)
-            if id_key in done_ids:
-                return None
-            print(f"LLM Oracle Transcript ({model_name}): {audio_file}")
-
-            def _invoke_once():
-                resp = generator(prompt, inputs={"audio": audio_file})
-                print(resp.content)
-                return resp, _extract_oracle(resp.content, key="transcript")
-
-            on_attempt, total_cost = _make_attempt_recorder(
+        def _recorder(sample_id):
+            return _make_attempt_recorder(
                 tracker,
                 task=_TASK_NAME,
                 paradigm=_PARADIGM_NAME,
@@ -130,14 +161,28 @@ def generate_oracle_transcripts(
                 usable=lambda pair: not _is_nullish_output(pair[1]),
                 models_path=models_path,
             )
-            response, llm_oracle = _retry_until_valid(
+
+        def _transcribe(sample: dict, on_attempt):
+            audio_file = sample["audio"]
+
+            def _invoke_once():
+                resp = generator(
+                    prompt,
+                    inputs={"audio": audio_file},
+                    stop_keys=_STOP_KEYS,
+                    response_schema=_RESPONSE_SCHEMA,
+                )
+                print(resp.content)
+                return resp, _extract_oracle(resp.content, key="transcript", model=model_name)
+
+            return _retry_until_valid(
                 _invoke_once,
                 validate=lambda pair: not _is_nullish_output(pair[1]),
-                description=f"speech_oracle {model_name} sample={sample_id}",
+                description=f"speech_oracle {model_name} sample={sample['id']}",
                 on_attempt=on_attempt,
             )
-            cost = total_cost()
-            done_ids.add(id_key)
+
+        def _row(id_key: str, response, llm_oracle, cost) -> dict:
             return {
                 "id": id_key,
                 "llm_oracle": llm_oracle,
@@ -147,6 +192,67 @@ def generate_oracle_transcripts(
                 "cost_usd": cost,
             }
 
+        def process_one(sample: dict) -> dict | None:
+            sample_id = sample["id"]
+            id_key = _normalize_id(sample_id)
+            if id_key in done_ids:
+                return None
+            print(f"LLM Oracle Transcript ({model_name}): {sample['audio']}")
+            on_attempt, total_cost = _recorder(sample_id)
+            response, llm_oracle = _transcribe(sample, on_attempt)
+            done_ids.add(id_key)
+            return _row(id_key, response, llm_oracle, total_cost())
+
+        def process_batch(batch: list[dict]) -> list[dict]:
+            todo = [s for s in batch if _normalize_id(s["id"]) not in done_ids]
+            if len(todo) <= 1:
+                row = process_one(todo[0]) if todo else None
+                return [row] if row is not None else []
+            print(
+                f"LLM Oracle Transcript ({model_name}): batch of {len(todo)} "
+                f"({todo[0]['id']} .. {todo[-1]['id']})"
+            )
+            wav, durations = _concat_clips([s["audio"] for s in todo])
+            resp = generator(
+                prompt + _BATCH_INSTRUCTIONS.format(count=len(todo)),
+                inputs={"audio": wav, "audio_format": "wav"},
+                stop_keys=_BATCH_STOP_KEYS,
+                response_schema=_BATCH_SCHEMA,
+            )
+            print(resp.content)
+            transcripts = _parse_json_payload(resp.content, model=model_name).get(_BATCH_KEY)
+            if not isinstance(transcripts, list) or len(transcripts) != len(todo):
+                # Segments can't be matched to clips; every clip goes solo.
+                transcripts = ["n/a"] * len(todo)
+            shares = _split_response(resp, [1.0] * len(todo), audio_weights=durations)
+            rows = []
+            fallbacks = []
+            for sample, share, transcript in zip(todo, shares, transcripts):
+                on_attempt, total_cost = _recorder(sample["id"])
+                ok = not _is_nullish_output(transcript)
+                # The batch counts as this clip's first attempt.
+                on_attempt((share, transcript), ok)
+                if ok:
+                    rows.append(_row(_normalize_id(sample["id"]), share, transcript, total_cost()))
+                else:
+                    fallbacks.append((sample, on_attempt, total_cost))
+            done_ids.update(row["id"] for row in rows)
+            for i, (sample, on_attempt, total_cost) in enumerate(fallbacks):
+                try:
+                    response, llm_oracle = _transcribe(sample, on_attempt)
+                except ModelUnavailableError as exc:
+                    # Keep the transcripts already paid for; only the clips
+                    # still without a row are deferred, each on its own.
+                    raise _partial_failure(exc, rows, [s for s, _, _ in fallbacks[i:]])
+                rows.append(_row(_normalize_id(sample["id"]), response, llm_oracle, total_cost()))
+                done_ids.add(rows[-1]["id"])
+            return rows
+
+        def process(item):
+            if isinstance(item, list):
+                return process_batch(item)
+            return process_one(item)
+
         return process
 
     def on_progress(model_name: str, rows: list[dict], is_final: bool) -> None:
@@ -155,17 +261,11 @@ def generate_oracle_transcripts(
             full_slice = load_completed_rows(task_dir, "oracle", prompt_name, model_name)
             if not full_slice.empty:
                 results_by_model[model_name] = full_slice
-            elif rows:
-                results_by_model[model_name] = pd.DataFrame(rows)
-            # else: this model produced no oracle rows (e.g. it was permanently
-            # unavailable). Leave it unregistered rather than storing an empty,
-            # column-less pd.DataFrame([]) — that frame later crashed the metric
-            # layer with KeyError: 'id'.
 
     if pending_models:
-        run_with_failover(
+        pass_rows = run_with_failover(
             models=pending_models,
-            samples=samples,
+            samples=work_items,
             make_processor=make_processor,
             on_progress=on_progress,
             progress_task=_TASK_NAME,
@@ -173,7 +273,16 @@ def generate_oracle_transcripts(
             progress_prompt=prompt_name,
             progress_total=len(samples),
             progress_task_dir=task_dir,
+            models_path=models_path,
         )
+        # on_progress only sees each checkpoint's new rows, so if the slice
+        # could not be read back, fall back to the rows this pass returned.
+        # A model with none (e.g. permanently unavailable) stays unregistered
+        # rather than storing an empty, column-less pd.DataFrame([]) — that
+        # frame later crashed the metric layer with KeyError: 'id'.
+        for model_name, rows in pass_rows.items():
+            if model_name not in results_by_model and rows:
+                results_by_model[model_name] = pd.DataFrame(rows)
 
     if len(enabled_models) > 1:
         return results_by_model
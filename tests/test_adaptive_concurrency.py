@@ -0,0 +1,58 @@
+"""The AIMD control law of the adaptive concurrency gate."""
+from __future__ import annotations
+
+import pytest
+
+from service_invocations.core import adaptive_concurrency
+from service_invocations.core.adaptive_concurrency import AdaptiveConcurrency
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(adaptive_concurrency.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(adaptive_concurrency.AdaptiveConcurrency, "_publish", lambda self: None)
+    return now
+
+
+def test_starts_halfway_and_grows_additively_to_the_ceiling(clock):
+    gate = AdaptiveConcurrency("fake-aimd", 8)
+    assert gate.limit == 4
+    # Each success adds 1 / limit: about one more slot per window of successes.
+    for _ in range(4):
+        gate.on_success()
+    assert gate.limit == 4
+    gate.on_success()
+    assert gate.limit == 5
+    for _ in range(100):
+        gate.on_success()
+    assert gate.limit == 8
+
+
+def test_throttle_halves_once_per_cut_interval(clock, monkeypatch):
+    monkeypatch.setattr(adaptive_concurrency, "_DECREASE_FACTOR", 0.5)
+    monkeypatch.setattr(adaptive_concurrency, "_CUT_INTERVAL", 5.0)
+    gate = AdaptiveConcurrency("fake-aimd", 16)
+    throttle = RuntimeError("429")
+    gate.on_retry(throttle, True, None)
+    gate.on_retry(throttle, True, None)
+    assert gate.limit == 4
+    gate.on_retry(RuntimeError("500"), False, None)
+    clock[0] += 5.0
+    gate.on_retry(throttle, True, 30.0)
+    assert gate.limit == 2
+    clock[0] += 10.0
+    gate.on_retry(throttle, True, None)
+    assert gate.limit == 2
+    clock[0] += 20.0
+    gate.on_retry(throttle, True, None)
+    assert gate.limit == 1
+    assert gate.snapshot()["decreases"] == 3
+
+
+def test_gate_admits_up_to_the_limit(clock):
+    gate = AdaptiveConcurrency("fake-aimd", 4)
+    assert gate._try_enter() and gate._try_enter()
+    assert not gate._try_enter()
+    gate.release()
+    assert gate._try_enter()
@@ -0,0 +1,92 @@
+"""ASR batching: clip concatenation, per-clip cost shares and fallbacks."""
+from __future__ import annotations
+
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import soundfile as sf
+
+from service_invocations.core.cost_tracker import session_tracker
+from service_invocations.core.llm_adapters import LLMResponse
+from service_invocations.speech_recognition import audio_batch, speech_oracle
+
+
+def _clip(path, seconds, rate, channels=1, level=0.1):
+    frames = int(seconds * rate)
+    samples = np.full((frames, channels), level) if channels > 1 else np.full(frames, level)
+    if channels > 1:
+        samples[:, 1] = 2 * level
+    sf.write(path, samples, rate)
+    return path
+
+
+def test_clips_are_resampled_down_mixed_and_timed_without_separators(tmp_path):
+    first = _clip(tmp_path / "a.wav", 1.0, 16000)
+    second = _clip(tmp_path / "b.wav", 0.5, 8000, channels=2, level=0.2)
+
+    wav, durations = audio_batch.concat_clips([first, second])
+    joined, rate = sf.read(io.BytesIO(wav))
+
+    assert rate == 16000
+    assert joined.ndim == 1
+    assert durations == [1.0, 0.5]
+    separator = 2 * audio_batch._GAP_SECONDS + audio_batch._BEEP_SECONDS
+    assert len(joined) == int(round((1.0 + separator + 0.5) * rate))
+    # The stereo clip is averaged to mono: (0.2 + 0.4) / 2.
+    assert abs(joined[-100] - 0.3) < 1e-3
+    assert abs(joined[100] - 0.1) < 1e-3
+
+
+def _run(tmp_path, monkeypatch, model, batch_answer):
+    calls: list[str] = []
+    prompts = []
+
+    def generator(prompt, inputs, **kwargs):
+        prompts.append(prompt)
+        audio = inputs["audio"]
+        if isinstance(audio, bytes):
+            calls.append("batch")
+            return LLMResponse(batch_answer, 10.0, 1000, 30, audio_input_tokens=600)
+        calls.append(audio.stem)
+        return LLMResponse(json.dumps({"transcript": f"solo {audio.stem}"}), 5.0, 300, 10)
+
+    monkeypatch.setattr(speech_oracle, "get_enabled_models", lambda path: [model])
+    monkeypatch.setattr(speech_oracle, "get_model_generator", lambda name, models_path: generator)
+
+    clips = [_clip(tmp_path / f"clip{n}.wav", n, 8000) for n in (1, 2, 3)]
+    data = pd.DataFrame({"id": [1, 2, 3], "audio": clips})
+    result = speech_oracle.generate_oracle_transcripts(
+        data, "asr_service_short", results_dir=tmp_path, models_path=tmp_path / "models.yaml",
+        batch_size=3,
+    )
+    return calls, prompts, dict(zip(result["id"], result["llm_oracle"]))
+
+
+def test_batch_shares_follow_clip_duration_and_a_null_entry_falls_back_alone(
+    tmp_path, monkeypatch
+):
+    model = "fake_audio_batch_model"
+    answer = json.dumps({"transcripts": ["one", None, "three"]})
+    calls, prompts, labels = _run(tmp_path, monkeypatch, model, answer)
+
+    assert calls == ["batch", "clip2"]
+    assert labels == {"0001": "one", "0002": "solo clip2", "0003": "three"}
+    batch_prompt = prompts[0]
+    assert batch_prompt.endswith(speech_oracle._BATCH_INSTRUCTIONS.format(count=3))
+    assert batch_prompt.static_prefix and batch_prompt.startswith(batch_prompt.static_prefix)
+
+    shares = [
+        e for e in session_tracker().entries if e.model == model and e.latency_ms == 10.0
+    ]
+    assert [e.audio_input_tokens for e in shares] == [100, 200, 300]
+    assert sum(e.input_tokens for e in shares) == 1000
+    assert sum(e.output_tokens for e in shares) == 30
+
+
+def test_a_wrong_length_transcript_list_sends_every_clip_solo(tmp_path, monkeypatch):
+    answer = json.dumps({"transcripts": ["one", "two"]})
+    calls, _, labels = _run(tmp_path, monkeypatch, "fake_audio_batch_short_model", answer)
+    assert calls == ["batch", "clip1", "clip2", "clip3"]
+    assert labels == {"0001": "solo clip1", "0002": "solo clip2", "0003": "solo clip3"}
@@ -0,0 +1,154 @@
+"""Batch-job rounds around a paradigm slice."""
+from __future__ import annotations
+
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from service_invocations.core import batch_jobs, batch_standin, cost_tracker
+from service_invocations.core.llm_adapters import LLMResponse, get_llm_adapter
+from service_invocations.core.oracle_utils import is_fresh_run_requested, normalize_id
+from service_invocations.language_translation import language_oracle
+
+
+class _FakeSession:
+    """Queues requests in the first round only; no provider involved."""
+
+    def __init__(self, label, job_dir):
+        self.rounds = 0
+
+    def begin_round(self, collecting):
+        self.rounds += 1
+
+    def end_round(self):
+        return self.rounds == 1
+
+    def submit_and_wait(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_fresh_run_is_passed_to_first_round_only_and_env_untouched(monkeypatch, tmp_path):
+    monkeypatch.setattr(batch_jobs, "BatchSession", _FakeSession)
+    monkeypatch.setattr(batch_jobs, "_job_dir", lambda label: tmp_path)
+    monkeypatch.setenv("LLM_FRESH_RUN", "1")
+    seen = []
+
+    def run(fresh_run):
+        seen.append((fresh_run, os.environ.get("LLM_FRESH_RUN")))
+        return len(seen)
+
+    assert batch_jobs.run_batched("slice", run) == 2
+    assert seen == [(True, "1"), (False, "1")]
+    assert batch_jobs.active_batch_session() is None
+
+
+def test_without_fresh_run_every_round_resumes(monkeypatch, tmp_path):
+    monkeypatch.setattr(batch_jobs, "BatchSession", _FakeSession)
+    monkeypatch.setattr(batch_jobs, "_job_dir", lambda label: tmp_path)
+    monkeypatch.delenv("LLM_FRESH_RUN", raising=False)
+    seen = []
+
+    batch_jobs.run_batched("slice", lambda fresh_run: seen.append(fresh_run))
+
+    assert seen == [False, False]
+
+
+@pytest.fixture
+def batch_slice(monkeypatch, tmp_path):
+    """An MT oracle slice for a batch_mode model served by the stand-in API."""
+    monkeypatch.setenv("MICROSOFT_PHI_KEY", "k")
+    monkeypatch.setenv("PHI_TARGET_URI", "https://phi.invalid/chat")
+    monkeypatch.setattr(batch_jobs, "_POLL_INTERVAL", 0.05)
+    monkeypatch.setattr(batch_jobs, "_job_dir", lambda label: tmp_path / "jobs")
+    monkeypatch.setattr(cost_tracker, "_SESSION", cost_tracker.CostTracker())
+    asked: dict[str, int] = {}
+
+    def responder(body):
+        text = body["messages"][-1]["content"]
+        sentence = text if isinstance(text, str) else json.dumps(text)
+        word = next(w for w in ("one", "two", "three") if w in sentence)
+        asked[word] = asked.get(word, 0) + 1
+        # The first answer for "two" is unusable, so it is asked again.
+        if word == "two" and asked[word] == 1:
+            return json.dumps({"translation": None})
+        return json.dumps({"translation": f"fr:{word}"})
+
+    server = batch_standin.StandInBatchServer(responder, validate_delay=0.05, run_delay=0.05)
+    with server:
+        models_path = tmp_path / "models.yaml"
+        models_path.write_text(
+            "models:\n  fake_batch_model:\n    enabled: true\n    provider: microsoft\n"
+            "    model_id: fake-batch-1\n    input_per_million_usd: 1.0\n"
+            "    output_per_million_usd: 10.0\n    batch_mode: true\n"
+            f"    batch_endpoint: {server.url}\n    batch_price_factor: 0.5\n",
+            encoding="utf-8",
+        )
+        data = pd.DataFrame({"id": [1, 2, 3], "english": ["one", "two", "three"]})
+
+        def run(fresh_run):
+            return language_oracle.generate_oracle_translations(
+                data, "translation_service_short", results_dir=tmp_path / "results",
+                models_path=models_path, fresh_run=fresh_run,
+            )
+
+        yield run, server, models_path, asked
+
+
+def _labels(result):
+    return dict(zip(result["id"].map(normalize_id), result["llm_oracle"]))
+
+
+def test_batch_rounds_submit_poll_and_replay_through_the_standin(batch_slice, tmp_path):
+    run, server, models_path, asked = batch_slice
+    result = batch_jobs.run_batched("mt-oracle", run)
+
+    assert _labels(result) == {"0001": "fr:one", "0002": "fr:two", "0003": "fr:three"}
+    # Round 1 queues all three; round 2 re-asks "two"; round 3 queues nothing.
+    assert [job["request_counts"]["total"] for job in server.jobs.values()] == [3, 1]
+    assert asked == {"one": 1, "two": 2, "three": 1}
+
+    entries = cost_tracker.session_tracker().entries
+    # Round 3 replays the unusable round-1 answer for "two" before its retry;
+    # the replay is served as cached so it is not billed twice.
+    assert [(e.status, e.cached) for e in entries if e.sample_id == "2"] == [
+        ("failed", False), ("failed", True), ("success", False),
+    ]
+    cost_tracker.session_tracker().write(results_root=tmp_path)
+    cost = pd.read_csv(tmp_path / "cost.csv")
+    billed = cost[~cost["cached"]]
+    assert len(billed) == 4
+    for _, row in billed.iterrows():
+        list_price = (row["input_tokens"] * 1.0 + row["output_tokens"] * 10.0) / 1e6
+        assert row["cost_usd"] == pytest.approx(list_price * 0.5, abs=1e-6)
+
+
+def test_rounds_stop_at_the_cap_and_the_rest_is_called_live(batch_slice, monkeypatch, capsys):
+    run, server, models_path, asked = batch_slice
+    monkeypatch.setattr(batch_jobs, "_MAX_ROUNDS", 1)
+    adapter = get_llm_adapter("microsoft")
+    live = []
+
+    def generate(model, prompt, inputs, modalities, temperature=0.0, **kwargs):
+        live.append(inputs["text"])
+        return LLMResponse(json.dumps({"translation": "fr:two (live)"}), 1.0, 10, 2)
+
+    monkeypatch.setattr(adapter, "generate", generate)
+    result = batch_jobs.run_batched("mt-oracle", run)
+
+    assert len(server.jobs) == 1
+    assert live == ["two"]
+    assert _labels(result) == {"0001": "fr:one", "0002": "fr:two (live)", "0003": "fr:three"}
+    assert "1 batch round(s) done" in capsys.readouterr().err
+
+
+def test_explicit_fresh_run_setting_wins_over_the_env(monkeypatch):
+    monkeypatch.setenv("LLM_FRESH_RUN", "1")
+    assert is_fresh_run_requested() is True
+    assert is_fresh_run_requested(False) is False
+    monkeypatch.setenv("LLM_FRESH_RUN", "0")
+    assert is_fresh_run_requested(True) is True
@@ -0,0 +1,84 @@
+"""Write-behind checkpoints: coalescing, cadence and flush ordering."""
+from __future__ import annotations
+
+import threading
+
+from service_invocations.core import checkpoint_writer, model_failover
+from service_invocations.core.checkpoint_writer import CheckpointWriter
+
+
+def test_pending_checkpoints_for_a_key_are_coalesced_in_order(monkeypatch):
+    monkeypatch.setattr(checkpoint_writer, "_FLUSH_ROWS", 100)
+    monkeypatch.setattr(checkpoint_writer, "_FLUSH_SECONDS", 60.0)
+    writer = CheckpointWriter()
+    written = []
+
+    writer.submit("slice", [1, 2], written.append)
+    writer.submit("slice", [3], written.append)
+    writer.submit("other", ["x"], written.append)
+    assert written == []
+
+    writer.flush("slice")
+    assert written == [[1, 2, 3]]
+    writer.drain()
+    assert written == [[1, 2, 3], ["x"]]
+    stats = writer.snapshot()
+    assert (stats["writes"], stats["coalesced"], stats["queue_depth"]) == (2, 1, 0)
+
+
+def test_a_full_checkpoint_is_written_on_the_writer_thread(monkeypatch):
+    monkeypatch.setattr(checkpoint_writer, "_FLUSH_ROWS", 2)
+    monkeypatch.setattr(checkpoint_writer, "_FLUSH_SECONDS", 60.0)
+    writer = CheckpointWriter()
+    done = threading.Event()
+    threads = []
+
+    def write(rows):
+        threads.append(threading.current_thread().name)
+        done.set()
+
+    writer.submit("slice", [1, 2], write)
+    assert done.wait(5)
+    assert threads == ["checkpoint-writer"]
+
+
+def test_flush_waits_for_a_running_write_before_writing_later_rows(monkeypatch):
+    monkeypatch.setattr(checkpoint_writer, "_FLUSH_ROWS", 1)
+    monkeypatch.setattr(checkpoint_writer, "_FLUSH_SECONDS", 60.0)
+    writer = CheckpointWriter()
+    started, release = threading.Event(), threading.Event()
+    written = []
+
+    def slow_write(rows):
+        started.set()
+        release.wait(5)
+        written.append(rows)
+
+    writer.submit("slice", ["first"], slow_write)
+    assert started.wait(5)
+    # Queued while the first write is still running; a flush must not
+    # overtake it.
+    writer.submit("slice", ["second"], written.append)
+    flusher = threading.Thread(target=writer.flush, args=("slice",))
+    flusher.start()
+    release.set()
+    flusher.join(5)
+    assert written == [["first"], ["second"]]
+
+
+def test_final_progress_call_comes_after_every_mid_pass_checkpoint():
+    calls = []
+
+    def make_processor(name):
+        return lambda item: {"id": item}
+
+    def on_progress(model, rows, is_final):
+        calls.append(([row["id"] for row in rows], is_final))
+
+    model_failover.run_with_failover(
+        models=["fake_checkpoint_model"], samples=list("abcde"),
+        make_processor=make_processor, on_progress=on_progress, checkpoint_every=2,
+    )
+    assert calls[-1][1] is True
+    assert not any(is_final for _, is_final in calls[:-1])
+    assert [row for rows, _ in calls for row in rows] == list("abcde")
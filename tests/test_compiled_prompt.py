@@ -0,0 +1,60 @@
+"""Compiled prompt templates and the static prefix handed to context caches."""
+from __future__ import annotations
+
+import os
+
+from service_invocations import models
+from service_invocations.core import oracle_utils
+from service_invocations.core.llm_adapters import LLMResponse
+
+
+def test_render_fills_slots_and_keeps_the_literal_prefix():
+    compiled = oracle_utils.CompiledPrompt("Rules: be terse.\nText: {text}\nKeep {unknown}.")
+    assert compiled.slots == ("text", "unknown")
+    rendered = compiled.render(text="hi")
+    assert rendered == "Rules: be terse.\nText: hi\nKeep {unknown}."
+    assert rendered.static_prefix == "Rules: be terse.\nText: "
+
+
+def test_templates_are_reread_only_when_the_file_changes(tmp_path):
+    path = tmp_path / "oracle.txt"
+    path.write_text("v1 {text}", encoding="utf-8")
+    first = oracle_utils.compile_prompt(path)
+    assert oracle_utils.compile_prompt(path) is first
+
+    path.write_text("v2 longer {text}", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert oracle_utils.load_prompt(path, text="x") == "v2 longer x"
+
+
+class _CachingAdapter:
+    supports_context_cache = True
+
+    def __init__(self):
+        self.calls = []
+
+    def generate(self, model, prompt, inputs, modalities, temperature=0.0, **kwargs):
+        self.calls.append(kwargs)
+        return LLMResponse('{"translation": "x"}', 1.0, 10, 2)
+
+
+def test_context_cache_models_receive_the_template_prefix(tmp_path, monkeypatch):
+    models_path = tmp_path / "models.yaml"
+    models_path.write_text(
+        "models:\n  fake-cached:\n    provider: fake\n    model_id: fake-1\n"
+        "    context_cache: true\n",
+        encoding="utf-8",
+    )
+    adapter = _CachingAdapter()
+    monkeypatch.setattr(models, "get_llm_adapter", lambda provider: adapter)
+    template = tmp_path / "oracle.txt"
+    template.write_text("Translate to French.\nText: {text}", encoding="utf-8")
+
+    generate = models.get_model_generator("fake-cached", models_path=models_path)
+    generate(oracle_utils.load_prompt(template, text="hello"), {"text": "hello"})
+    generate("a plain string prompt", {"text": "hello"})
+    assert [call.get("static_prefix") for call in adapter.calls] == [
+        "Translate to French.\nText: ",
+        None,
+    ]
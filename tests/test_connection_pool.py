@@ -0,0 +1,85 @@
+"""Keep-alive connection reuse for Phi and the legacy Gemini model cache."""
+from __future__ import annotations
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib import error as url_error
+
+import pytest
+
+from service_invocations.core import llm_adapters
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.server.connections.add(self.client_address)
+        status = 503 if self.path == "/busy" else 200
+        body = f"{len(self.server.connections)}".encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        # Drop the socket without announcing it, as an idle timeout would.
+        self.close_connection = self.path == "/drop"
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.connections = set()
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _pool(server, path="/chat"):
+    host, port = server.server_address
+    return llm_adapters._HTTPConnectionPool(f"http://{host}:{port}{path}", 2, 5.0)
+
+
+def test_sequential_posts_reuse_one_connection(server):
+    pool = _pool(server)
+    assert [pool.post(b"{}", {}) for _ in range(3)] == [b"1", b"1", b"1"]
+
+
+def test_error_status_is_raised_as_http_error_and_keeps_the_connection(server):
+    pool = _pool(server, "/busy")
+    with pytest.raises(url_error.HTTPError) as raised:
+        pool.post(b"{}", {})
+    assert raised.value.code == 503
+    with pytest.raises(url_error.HTTPError):
+        pool.post(b"{}", {})
+    assert len(server.connections) == 1
+
+
+def test_a_dropped_idle_connection_is_replayed_on_a_fresh_one(server):
+    pool = _pool(server, "/drop")
+    assert pool.post(b"{}", {}) == b"1"
+    assert pool.post(b"{}", {}) == b"2"
+
+
+def test_legacy_gemini_models_are_built_once_per_name():
+    built = []
+
+    class _LegacySdk:
+        @staticmethod
+        def GenerativeModel(name):
+            built.append(name)
+            return object()
+
+    adapter = llm_adapters.GeminiAdapter.__new__(llm_adapters.GeminiAdapter)
+    adapter._client = _LegacySdk
+    adapter._legacy_models = {}
+    adapter._legacy_models_lock = threading.Lock()
+    first = adapter._legacy_model("gemini-1.5-flash")
+    assert adapter._legacy_model("gemini-1.5-flash") is first
+    adapter._legacy_model("gemini-1.5-pro")
+    assert built == ["gemini-1.5-flash", "gemini-1.5-pro"]
@@ -0,0 +1,50 @@
+"""Cost attribution: attempt-recorder totals and packed-response shares."""
+from __future__ import annotations
+
+from service_invocations.core.cost_tracker import (
+    CostTracker,
+    make_attempt_recorder,
+    split_response,
+)
+from service_invocations.core.llm_adapters import LLMResponse
+
+
+def test_cache_replays_stay_out_of_the_sample_total(tmp_path):
+    models_path = tmp_path / "models.yaml"
+    models_path.write_text(
+        "models:\n  fake-cached:\n    input_per_million_usd: 1.0\n"
+        "    output_per_million_usd: 10.0\n",
+        encoding="utf-8",
+    )
+    tracker = CostTracker()
+    on_attempt, total_cost = make_attempt_recorder(
+        tracker,
+        task="t",
+        paradigm="oracle",
+        model="fake-cached",
+        sample_id="1",
+        usable=lambda pair: pair[1] != "n/a",
+        models_path=models_path,
+    )
+    on_attempt((LLMResponse("x", 1.0, 1000, 100, cached=True), "n/a"), False)
+    assert total_cost() is None
+    on_attempt((LLMResponse("y", 1.0, 1000, 100), "ok"), True)
+    assert total_cost() == round(tracker.total_usd(), 6) == 0.002
+    assert [e.cached for e in tracker.entries] == [True, False]
+
+
+def test_split_response_apportions_tokens_and_keeps_hedges_on_one_share():
+    hedge = object()
+    response = LLMResponse("x", 42.0, 1000, 10, audio_input_tokens=600, hedges=(hedge,))
+    shares = split_response(response, [1.0, 1.0, 1.0], audio_weights=[1.0, 2.0, 3.0])
+
+    assert sum(s.input_tokens for s in shares) == 1000
+    assert sum(s.output_tokens for s in shares) == 10
+    assert [s.audio_input_tokens for s in shares] == [100, 200, 300]
+    assert all(s.latency_ms == 42.0 for s in shares)
+    assert [len(s.hedges) for s in shares] == [1, 0, 0]
+
+
+def test_split_response_without_usage_gives_unpriced_shares():
+    shares = split_response(LLMResponse("x", 1.0, None, None), [1.0, 1.0])
+    assert [(s.input_tokens, s.output_tokens) for s in shares] == [(None, None)] * 2
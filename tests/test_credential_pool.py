@@ -0,0 +1,66 @@
+"""Credential pool selection when members are benched."""
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from service_invocations.core import credential_pool
+from service_invocations.core.credential_pool import FATAL, THROTTLED, CredentialPool
+
+
+class _Throttle(Exception):
+    pass
+
+
+class _Denied(Exception):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def _no_status_file(monkeypatch):
+    monkeypatch.setattr(credential_pool.rc, "record_key_pool", lambda *a, **k: None)
+
+
+def _pool(members):
+    return CredentialPool(
+        "test",
+        members,
+        classify=lambda exc: THROTTLED if isinstance(exc, _Throttle) else FATAL,
+        retry_after=lambda exc: getattr(exc, "delay", None),
+        strategy="least_loaded",
+    )
+
+
+def test_throttled_member_rotates_to_the_next():
+    pool = _pool([("a", "A"), ("b", "B")])
+    seen = []
+
+    def _first_throttles(value):
+        seen.append(value)
+        if value == "A":
+            raise _Throttle("429")
+        return value
+
+    assert pool.call(_first_throttles) == "B"
+    assert seen == ["A", "B"]
+    assert pool.snapshot()["a"]["state"] == "quarantined"
+
+
+def test_all_benched_uses_soonest_recovery_without_waiting():
+    pool = _pool([("a", "A"), ("b", "B"), ("c", "C")])
+    delays = {"A": 30.0, "B": 5.0}
+
+    def _bench_everyone(value):
+        if value == "C":
+            raise _Denied("403")
+        exc = _Throttle("429")
+        exc.delay = delays[value]
+        raise exc
+
+    with pytest.raises((_Throttle, _Denied)):
+        pool.call(_bench_everyone)
+    assert {s["state"] for s in pool.snapshot().values()} == {"quarantined", "disabled"}
+    started = time.monotonic()
+    assert pool.call(lambda value: value) == "B"
+    assert time.monotonic() - started < 1.0
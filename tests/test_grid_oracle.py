@@ -0,0 +1,129 @@
+"""FER grid mode: tiling, tile-to-id mapping, fallbacks and cost shares."""
+from __future__ import annotations
+
+import io
+import json
+
+import pandas as pd
+import pytest
+from PIL import Image
+
+from service_invocations.core import model_failover
+from service_invocations.core.cost_tracker import session_tracker
+from service_invocations.core.llm_adapters import LLMResponse, ModelUnavailableError
+from service_invocations.emotion_detection import emotion_oracle, image_grid
+
+_COLORS = [(200, 0, 0), (0, 200, 0), (0, 0, 200)]
+
+
+def _scores(happiness: float) -> dict:
+    scores = dict.fromkeys(emotion_oracle._SCORE_KEYS, 0.0)
+    scores["happiness"] = happiness
+    return scores
+
+
+def _faces(tmp_path, sizes):
+    paths = []
+    for index, (size, color) in enumerate(zip(sizes, _COLORS)):
+        path = tmp_path / f"face{index + 1}.png"
+        Image.new("RGB", size, color).save(path)
+        paths.append(path)
+    return paths
+
+
+def test_tiles_are_laid_out_row_major_with_a_numbered_banner(tmp_path):
+    paths = _faces(tmp_path, [(40, 30), (20, 20), (30, 40)])
+    grid = Image.open(io.BytesIO(image_grid.tile_images(paths))).convert("RGB")
+
+    tile_w, tile_h = 40, 40
+    cell_w = tile_w + image_grid._GUTTER
+    cell_h = tile_h + image_grid._BANNER_HEIGHT + image_grid._GUTTER
+    # Three faces make a 2x2 grid, every cell the size of the largest face.
+    assert grid.size == (2 * cell_w + image_grid._GUTTER, 2 * cell_h + image_grid._GUTTER)
+    for index, color in enumerate(_COLORS):
+        left = image_grid._GUTTER + (index % 2) * cell_w
+        top = image_grid._GUTTER + (index // 2) * cell_h
+        center = (left + tile_w // 2, top + image_grid._BANNER_HEIGHT + tile_h // 2)
+        assert grid.getpixel(center) == color
+        banner = grid.crop((left, top, left + tile_w, top + image_grid._BANNER_HEIGHT))
+        assert banner.getextrema()[0][0] < 128, f"tile {index + 1} has no number"
+    empty = grid.crop((
+        image_grid._GUTTER + cell_w, image_grid._GUTTER + cell_h,
+        image_grid._GUTTER + cell_w + tile_w, image_grid._GUTTER + cell_h + tile_h,
+    ))
+    assert empty.getextrema() == ((255, 255), (255, 255), (255, 255))
+
+
+def test_tile_images_rejects_an_empty_grid():
+    with pytest.raises(ValueError):
+        image_grid.tile_images([])
+
+
+def _run(tmp_path, monkeypatch, model, grid_answer, fail_first_fallback=False):
+    calls: list[str] = []
+    prompts = []
+    failing = [fail_first_fallback]
+
+    def generator(prompt, inputs, **kwargs):
+        prompts.append(prompt)
+        image = inputs["image"]
+        if isinstance(image, bytes):
+            calls.append("grid")
+            return LLMResponse(grid_answer, 10.0, 1000, 99)
+        name = image.stem
+        calls.append(name)
+        if failing[0]:
+            failing[0] = False
+            raise ModelUnavailableError(model, RuntimeError("503"))
+        return LLMResponse(json.dumps({"scores": _scores(0.5)}), 5.0, 400, 20)
+
+    monkeypatch.setattr(emotion_oracle, "get_enabled_models", lambda path: [model])
+    monkeypatch.setattr(emotion_oracle, "get_model_generator", lambda name, models_path: generator)
+    monkeypatch.setitem(model_failover._MODEL_COOLDOWN_OVERRIDES, model, 0.0)
+
+    paths = _faces(tmp_path, [(20, 20)] * 3)
+    data = pd.DataFrame({"id": [1, 2, 3], "image": paths})
+    result = emotion_oracle.generate_oracle_emotions(
+        data, "fer_service_short", results_dir=tmp_path, models_path=tmp_path / "models.yaml",
+        grid_size=3,
+    )
+    return calls, prompts, result
+
+
+def _happiness(result) -> dict:
+    return dict(zip(result["id"], (scores["happiness"] for scores in result["llm_oracle"])))
+
+
+def test_tiles_map_back_to_ids_and_a_missing_tile_falls_back_alone(tmp_path, monkeypatch):
+    model = "fake_grid_model"
+    answer = json.dumps({"tiles": {"1": _scores(0.9), "2": None, "3": _scores(0.1)}})
+    calls, prompts, result = _run(tmp_path, monkeypatch, model, answer)
+
+    assert calls == ["grid", "face2"]
+    assert _happiness(result) == {"0001": 0.9, "0002": 0.5, "0003": 0.1}
+    grid_prompt = prompts[0]
+    assert grid_prompt.endswith(emotion_oracle._GRID_INSTRUCTIONS)
+    assert grid_prompt.static_prefix and grid_prompt.startswith(grid_prompt.static_prefix)
+
+    entries = [e for e in session_tracker().entries if e.model == model]
+    grid_shares = [e for e in entries if e.latency_ms == 10.0]
+    assert len(grid_shares) == 3
+    assert sum(e.input_tokens for e in grid_shares) == 1000
+    assert sum(e.output_tokens for e in grid_shares) == 99
+    assert [e.status for e in entries if e.sample_id == "2"] == ["failed", "success"]
+
+
+def test_an_unparseable_grid_answer_falls_back_for_every_face(tmp_path, monkeypatch):
+    calls, _, result = _run(tmp_path, monkeypatch, "fake_grid_garbage_model", "sorry, no")
+    assert calls == ["grid", "face1", "face2", "face3"]
+    assert set(_happiness(result).values()) == {0.5}
+
+
+def test_a_failed_fallback_keeps_the_grid_rows_and_defers_the_rest(tmp_path, monkeypatch):
+    answer = json.dumps({"tiles": {"1": _scores(0.9)}})
+    calls, _, result = _run(
+        tmp_path, monkeypatch, "fake_grid_partial_model", answer, fail_first_fallback=True,
+    )
+    # The grid is sent once; the unfinished faces are retried on their own.
+    assert calls == ["grid", "face2", "face2", "face3"]
+    assert _happiness(result) == {"0001": 0.9, "0002": 0.5, "0003": 0.5}
@@ -0,0 +1,92 @@
+"""Hedged calls: start-based timing, winner choice and loser billing."""
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from service_invocations.core.cost_tracker import CostTracker, make_attempt_recorder
+from service_invocations.core.hedging import LatencyTracker, hedge_bill, hedged_call
+from service_invocations.core.llm_adapters import LLMResponse
+
+
+def _primed(seconds: float) -> LatencyTracker:
+    tracker = LatencyTracker()
+    for _ in range(50):
+        tracker.observe(seconds)
+    return tracker
+
+
+def _response(content: str, input_tokens: int = 100, output_tokens: int = 10) -> LLMResponse:
+    return LLMResponse(content, 1.0, input_tokens, output_tokens)
+
+
+def test_time_queued_before_the_request_does_not_trigger_a_hedge():
+    executor = ThreadPoolExecutor(max_workers=1)
+    release = threading.Event()
+    executor.submit(release.wait)
+    calls = []
+
+    def call(on_start):
+        on_start()
+        calls.append(time.monotonic())
+        time.sleep(0.02)
+        return _response('{"translation": "ok"}')
+
+    threading.Timer(0.3, release.set).start()
+    result = hedged_call(call, _primed(0.1), 95, executor)
+    executor.shutdown()
+    assert result.content == '{"translation": "ok"}'
+    assert len(calls) == 1
+    assert result.hedges == ()
+
+
+def test_rejected_fast_answer_loses_to_a_valid_slow_one():
+    executor = ThreadPoolExecutor(max_workers=2)
+    order = iter(["primary", "hedge"])
+    lock = threading.Lock()
+
+    def call(on_start):
+        with lock:
+            role = next(order)
+        on_start()
+        if role == "primary":
+            time.sleep(0.15)
+            return _response('{"translation": "slow but valid"}')
+        return _response("garbage")
+
+    result = hedged_call(
+        call, _primed(0.02), 95, executor, accept=lambda resp: resp.content.startswith("{")
+    )
+    executor.shutdown()
+    assert result.content == '{"translation": "slow but valid"}'
+    assert len(result.hedges) == 1
+
+
+def test_losers_are_billed_into_the_sample_total(tmp_path):
+    models_path = tmp_path / "models.yaml"
+    models_path.write_text(
+        "models:\n  fake-hedge:\n    input_per_million_usd: 1.0\n"
+        "    output_per_million_usd: 10.0\n",
+        encoding="utf-8",
+    )
+    running = Future()
+    failed = Future()
+    failed.set_exception(RuntimeError("boom"))
+    winner = LLMResponse("ok", 1.0, 1000, 100, hedges=(running, failed))
+    assert hedge_bill(failed, winner) is None
+
+    tracker = CostTracker()
+    on_attempt, total_cost = make_attempt_recorder(
+        tracker,
+        task="t",
+        paradigm="oracle",
+        model="fake-hedge",
+        sample_id="1",
+        usable=lambda pair: True,
+        models_path=models_path,
+    )
+    on_attempt((winner, "ok"), True)
+    assert [e.status for e in tracker.entries] == ["success", "hedged"]
+    assert total_cost() == round(2 * (1000 * 1.0 + 100 * 10.0) / 1e6, 6)
+    assert total_cost() == round(tracker.total_usd(), 6)
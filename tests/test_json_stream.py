@@ -0,0 +1,29 @@
+"""When the streaming JSON scanner may cut an answer short."""
+from __future__ import annotations
+
+from service_invocations.core.json_stream import JsonStopScanner
+
+
+def _feed(scanner, text, size=7):
+    result = None
+    for start in range(0, len(text), size):
+        result = scanner.feed(text[start:start + size])
+    return result
+
+
+def test_an_object_in_leading_prose_does_not_stop_the_stream():
+    text = 'Example format: {"translation": "..."}. Answer: {"translation": "bonjour"}'
+    scanner = JsonStopScanner(["translation"])
+    assert _feed(scanner, text) is None
+    assert scanner.text == text
+
+
+def test_a_fenced_answer_stops_once_the_object_closes():
+    scanner = JsonStopScanner()
+    assert _feed(scanner, '```json\n{"label": {"x": "}"}}\n```') == '{"label": {"x": "}"}}'
+
+
+def test_stop_keys_end_the_answer_before_the_remaining_fields():
+    scanner = JsonStopScanner(["translation"])
+    text = ' {"translation": "a, b", "notes": "long explanation..."}'
+    assert _feed(scanner, text) == '{"translation": "a, b"}'
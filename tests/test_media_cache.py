@@ -0,0 +1,62 @@
+"""Media bytes cache: hits, invalidation on change, and the byte bound."""
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+
+from service_invocations.core import media_cache
+from service_invocations.core.media_cache import MediaCache
+
+
+def test_repeat_reads_hit_and_derive_base64_and_digest(tmp_path):
+    clip = tmp_path / "clip.wav"
+    clip.write_bytes(b"RIFF-audio")
+    cache = MediaCache(max_bytes=1024)
+
+    assert cache.read(clip) == b"RIFF-audio"
+    assert cache.b64(clip) == base64.b64encode(b"RIFF-audio").decode("utf-8")
+    assert cache.digest(str(clip)) == hashlib.sha256(b"RIFF-audio").hexdigest()
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 1, 1)
+    # The base64 string counts toward the bound once it has been built.
+    assert stats["bytes"] == len(b"RIFF-audio") + len(cache.b64(clip))
+
+
+def test_a_rewritten_file_is_read_again(tmp_path):
+    image = tmp_path / "face.png"
+    image.write_bytes(b"old")
+    cache = MediaCache(max_bytes=1024)
+    assert cache.read(image) == b"old"
+
+    image.write_bytes(b"newer")
+    stat = image.stat()
+    os.utime(image, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert cache.read(image) == b"newer"
+
+
+def test_least_recently_used_entries_are_evicted_past_the_bound(tmp_path):
+    paths = []
+    for name in "abc":
+        path = tmp_path / name
+        path.write_bytes(name.encode("utf-8") * 40)
+        paths.append(path)
+    cache = MediaCache(max_bytes=100)
+    cache.read(paths[0])
+    cache.read(paths[1])
+    cache.read(paths[0])
+    cache.read(paths[2])
+
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["bytes"] <= 100
+    cache.read(paths[0])
+    assert cache.stats()["hits"] == 2
+
+
+def test_large_files_read_through_mmap_and_zero_bound_disables(tmp_path, monkeypatch):
+    monkeypatch.setattr(media_cache, "_MMAP_THRESHOLD", 16)
+    big = tmp_path / "big.wav"
+    big.write_bytes(bytes(range(64)))
+    cache = MediaCache(max_bytes=0)
+    assert cache.read(big) == bytes(range(64))
+    assert cache.stats()["entries"] == 0
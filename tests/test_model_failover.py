@@ -0,0 +1,162 @@
+"""The model failover runner: circuit probes, workers and drain passes."""
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from service_invocations.core import model_failover
+from service_invocations.core.circuit_breaker import CLOSED, HALF_OPEN, get_circuit_breaker
+from service_invocations.core.llm_adapters import ModelUnavailableError
+
+
+def _half_open(model: str):
+    breaker = get_circuit_breaker(model)
+    breaker.trip(ModelUnavailableError(model, RuntimeError("503")), 0.0)
+    return breaker
+
+
+def _run(model: str, samples, answered):
+    seen = []
+
+    def make_processor(name):
+        def process(item):
+            seen.append(item)
+            return {"id": item} if item in answered else None
+        return process
+
+    results = model_failover.run_with_failover(
+        models=[model], samples=samples, make_processor=make_processor, cooldown_seconds=0.0,
+    )
+    return seen, results[model]
+
+
+def test_probe_without_a_provider_answer_leaves_the_breaker_half_open():
+    breaker = _half_open("fake_probe_idle_model")
+    seen, rows = _run("fake_probe_idle_model", ["done-1", "done-2"], answered=set())
+    assert seen == ["done-1", "done-2"]
+    assert rows == []
+    assert breaker.state == HALF_OPEN
+    # The probe slot was handed back, so the next caller may probe.
+    assert breaker.allow()
+
+
+def test_probe_closes_the_breaker_on_the_first_real_answer():
+    breaker = _half_open("fake_probe_model")
+    seen, rows = _run("fake_probe_model", ["done", "a", "b"], answered={"a", "b"})
+    assert seen == ["done", "a", "b"]
+    assert [row["id"] for row in rows] == ["a", "b"]
+    assert breaker.state == CLOSED
+
+
+def test_probe_that_raises_hands_the_slot_back():
+    breaker = _half_open("fake_probe_crash_model")
+
+    def make_processor(name):
+        def process(item):
+            raise RuntimeError("bug in the processor")
+        return process
+
+    with pytest.raises(RuntimeError):
+        model_failover.run_with_failover(
+            models=["fake_probe_crash_model"], samples=["a"],
+            make_processor=make_processor, cooldown_seconds=0.0,
+        )
+    assert breaker.state == HALF_OPEN
+
+    seen, rows = _run("fake_probe_crash_model", ["a", "b"], answered={"a", "b"})
+    assert seen == ["a", "b"]
+    assert [row["id"] for row in rows] == ["a", "b"]
+    assert breaker.state == CLOSED
+
+
+def test_parallel_models_run_their_passes_concurrently():
+    models = ["fake_parallel_a", "fake_parallel_b"]
+    # Each model's first sample waits for the other model's to start, which
+    # only happens when the models have their own workers.
+    barrier = threading.Barrier(len(models), timeout=5)
+    finals = []
+
+    def make_processor(name):
+        def process(item):
+            if item == "first":
+                barrier.wait()
+            return {"id": item}
+        return process
+
+    def on_progress(model, rows, is_final):
+        if is_final:
+            finals.append(model)
+
+    results = model_failover.run_with_failover(
+        models=models, samples=["first", "second"], make_processor=make_processor,
+        on_progress=on_progress, parallel_models=True, cooldown_seconds=0.0,
+    )
+    for model in models:
+        assert [row["id"] for row in results[model]] == ["first", "second"]
+    assert sorted(finals) == models
+
+
+def test_in_flight_window_caps_concurrency_and_stops_on_failure():
+    lock = threading.Lock()
+    active = [0]
+    peak = [0]
+    seen = []
+
+    def make_processor(name):
+        def process(item):
+            with lock:
+                seen.append(item)
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            try:
+                if item == "bad":
+                    raise ModelUnavailableError(name, RuntimeError("503"))
+                time.sleep(0.05 if item != "slow" else 0.2)
+                return {"id": item}
+            finally:
+                with lock:
+                    active[0] -= 1
+        return process
+
+    results = model_failover.run_with_failover(
+        models=["fake_window_model"], samples=list("abcdef"),
+        make_processor=make_processor, max_in_flight=2, cooldown_seconds=0.0,
+    )
+    assert peak[0] == 2
+    assert sorted(row["id"] for row in results["fake_window_model"]) == list("abcdef")
+
+    seen.clear()
+    results = model_failover.run_with_failover(
+        models=["fake_window_failing_model"], samples=["slow", "bad", "c", "d"],
+        make_processor=make_processor, max_in_flight=2, max_drain_passes=0,
+        cooldown_seconds=0.0,
+    )
+    # The sample already in flight finishes; nothing new is submitted.
+    assert sorted(seen) == ["bad", "slow"]
+    assert [row["id"] for row in results["fake_window_failing_model"]] == ["slow"]
+
+
+def test_drain_runs_whichever_deferred_model_is_ready_first(monkeypatch):
+    slow, fast = "fake_drain_slow_model", "fake_drain_fast_model"
+    monkeypatch.setitem(model_failover._MODEL_COOLDOWN_OVERRIDES, slow, 0.3)
+    failed = set()
+    calls = []
+
+    def make_processor(name):
+        def process(item):
+            calls.append(name)
+            if name not in failed:
+                failed.add(name)
+                raise ModelUnavailableError(name, RuntimeError("503"))
+            return {"id": item}
+        return process
+
+    results = model_failover.run_with_failover(
+        models=[slow, fast], samples=["a"], make_processor=make_processor,
+        cooldown_seconds=0.0, max_drain_passes=1,
+    )
+    # The slow model is listed first, but the fast one's window elapses first.
+    assert calls == [slow, fast, fast, slow]
+    assert results[slow] == results[fast] == [{"id": "a"}]
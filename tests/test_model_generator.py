@@ -0,0 +1,115 @@
+"""Per-attempt rate-limit and concurrency budgets in the model generator."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from service_invocations import models
+from service_invocations.core import llm_adapters
+from service_invocations.core.llm_adapters import LLMResponse
+
+
+class _SpyLimiter:
+    def __init__(self, events):
+        self.events = events
+
+    def acquire(self, estimated):
+        self.events.append("token")
+
+    async def aacquire(self, estimated):
+        self.events.append("token")
+
+    def settle(self, estimated, response):
+        self.events.append("settle")
+
+
+class _SpyController:
+    def __init__(self, events):
+        self.events = events
+
+    def acquire(self):
+        self.events.append("slot")
+
+    async def aacquire(self):
+        self.events.append("slot")
+
+    def release(self):
+        self.events.append("release")
+
+    def on_retry(self, exc, is_throttle, retry_after):
+        self.events.append("cut" if is_throttle else "error")
+
+    def on_success(self):
+        self.events.append("success")
+
+
+class _FlakyAdapter:
+    """Fails twice with a throttle, then answers; retried by ``_retry_call``."""
+
+    def __init__(self, events):
+        self.events = events
+        self.failures = 2
+
+    def _attempt(self):
+        self.events.append("request")
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("429 too many requests")
+        return LLMResponse('{"answer": 1}', 1.0, 10, 2)
+
+    def generate(self, model, prompt, inputs, modalities, temperature=0.0):
+        return llm_adapters._retry_call(self._attempt, description="fake", model_id=model)
+
+    async def agenerate(self, model, prompt, inputs, modalities, temperature=0.0):
+        async def _attempt():
+            return self._attempt()
+
+        return await llm_adapters._aretry_call(_attempt, description="fake", model_id=model)
+
+
+@pytest.fixture
+def budget_model(monkeypatch, tmp_path):
+    events: list = []
+    models_path = tmp_path / "models.yaml"
+    models_path.write_text(
+        "models:\n  fake-budget:\n    provider: fake\n    model_id: fake-1\n"
+        "    requests_per_minute: 600\n    adaptive_concurrency: true\n"
+        "    max_in_flight: 2\n",
+        encoding="utf-8",
+    )
+    adapter = _FlakyAdapter(events)
+    monkeypatch.setattr(models, "get_llm_adapter", lambda provider: adapter)
+    monkeypatch.setattr(models, "get_rate_limiter", lambda *a, **k: _SpyLimiter(events))
+    monkeypatch.setattr(
+        models, "get_concurrency_controller", lambda *a, **k: _SpyController(events)
+    )
+    monkeypatch.setattr(llm_adapters, "_DEFAULT_BASE_DELAY", 0.0)
+    monkeypatch.setattr(llm_adapters.time, "sleep", lambda seconds: None)
+
+    async def _no_sleep(seconds):
+        return None
+
+    monkeypatch.setattr(llm_adapters.asyncio, "sleep", _no_sleep)
+    return events, models_path
+
+
+_EXPECTED = [
+    "slot", "token", "request", "cut", "release",
+    "slot", "token", "request", "cut", "release",
+    "slot", "token", "request", "release", "settle", "success",
+]
+
+
+def test_every_retry_takes_its_own_token_and_slot(budget_model):
+    events, models_path = budget_model
+    generate = models.get_model_generator("fake-budget", models_path=models_path)
+    assert generate("prompt").content == '{"answer": 1}'
+    assert events == _EXPECTED
+
+
+def test_async_retries_take_their_own_token_and_slot(budget_model):
+    events, models_path = budget_model
+    agenerate = models.get_async_model_generator("fake-budget", models_path=models_path)
+    assert asyncio.run(agenerate("prompt")).content == '{"answer": 1}'
+    assert events == _EXPECTED
@@ -0,0 +1,46 @@
+"""Salvage parsing of messy model responses."""
+from __future__ import annotations
+
+import pytest
+
+from service_invocations.core.oracle_utils import salvage_json_object
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        ('{"llm_oracle": "bonjour"}', {"llm_oracle": "bonjour"}),
+        ('Here you go: {"llm_oracle": "bonjour"} Hope it helps.', {"llm_oracle": "bonjour"}),
+        ('{"llm_oracle": "a"} wait, fixing: {"llm_oracle": "b"}', {"llm_oracle": "b"}),
+        ('{"llm_oracle": "x", "scores": [1, 2,],}', {"llm_oracle": "x", "scores": [1, 2]}),
+        ("{'llm_oracle': 'x', 'ok': True, 'why': None}", {"llm_oracle": "x", "ok": True, "why": None}),
+    ],
+)
+def test_salvage_recovers_common_shapes(content, expected):
+    assert salvage_json_object(content) == expected
+
+
+def test_salvage_keeps_literal_words_inside_values():
+    assert salvage_json_object('{"translation": "None of the True believers came.",}') == {
+        "translation": "None of the True believers came.",
+    }
+    assert salvage_json_object("{'translation': 'False None True', 'ok': False,}") == {
+        "translation": "False None True",
+        "ok": False,
+    }
+
+
+def test_salvage_keeps_apostrophes_and_quotes_inside_values():
+    assert salvage_json_object("""{'translation': "l'homme", 'ok': True,}""") == {
+        "translation": "l'homme",
+        "ok": True,
+    }
+    assert salvage_json_object("""{'translation': 'say "hi"', 'ok': None}""") == {
+        "translation": 'say "hi"',
+        "ok": None,
+    }
+
+
+def test_salvage_gives_up_on_garbage():
+    assert salvage_json_object("no object here") is None
+    assert salvage_json_object("{not: json at all") is None
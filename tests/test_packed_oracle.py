@@ -0,0 +1,93 @@
+"""Packed oracle requests keep their paid-for rows when a fallback fails."""
+from __future__ import annotations
+
+import json
+
+import pandas as pd
+
+from service_invocations.core import model_failover
+from service_invocations.core.llm_adapters import LLMResponse, ModelUnavailableError
+from service_invocations.language_translation import language_oracle
+
+
+def test_pack_failure_keeps_finished_rows_and_defers_only_the_rest(tmp_path, monkeypatch):
+    model = "fake_pack_model"
+    calls: list[str] = []
+    fail_next_fallback = [True]
+
+    def generator(prompt, inputs, **kwargs):
+        text = inputs["text"]
+        if text.startswith("[1]"):
+            calls.append("pack")
+            answer = {"translations": {"1": "un", "2": None, "3": None}}
+        else:
+            calls.append(text)
+            if fail_next_fallback[0]:
+                fail_next_fallback[0] = False
+                raise ModelUnavailableError(model, RuntimeError("503"))
+            answer = {"translation": f"fr:{text}"}
+        return LLMResponse(json.dumps(answer), 10.0, 30, 9)
+
+    monkeypatch.setattr(language_oracle, "get_enabled_models", lambda path: [model])
+    monkeypatch.setattr(language_oracle, "get_model_generator", lambda name, models_path: generator)
+    monkeypatch.setitem(model_failover._MODEL_COOLDOWN_OVERRIDES, model, 0.0)
+
+    data = pd.DataFrame({"id": [1, 2, 3], "english": ["one", "two", "three"]})
+    result = language_oracle.generate_oracle_translations(
+        data, "translation_service_short", results_dir=tmp_path, models_path=tmp_path / "models.yaml",
+        pack_size=3,
+    )
+
+    # The pack is sent once; the failed fallback and the one behind it are
+    # retried on their own instead of re-sending the whole pack.
+    assert calls == ["pack", "two", "two", "three"]
+    labels = dict(zip(result["id"], result["llm_oracle"]))
+    assert labels == {"0001": "un", "0002": "fr:two", "0003": "fr:three"}
+
+
+def test_partial_failure_rows_are_collected_and_unfinished_requeued():
+    attempts: list[object] = []
+
+    def make_processor(model):
+        def process(item):
+            attempts.append(item)
+            if isinstance(item, list):
+                rows = [{"id": item[0]}]
+                raise model_failover.partial_failure(
+                    ModelUnavailableError(model, RuntimeError("503")), rows, item[1:],
+                )
+            return {"id": item}
+        return process
+
+    results = model_failover.run_with_failover(
+        models=["fake_partial_model"],
+        samples=[["a", "b", "c"], "d"],
+        make_processor=make_processor,
+        cooldown_seconds=0.0,
+    )
+
+    assert sorted(row["id"] for row in results["fake_partial_model"]) == ["a", "b", "c", "d"]
+    assert attempts == [["a", "b", "c"], "b", "c", "d"]
+
+
+def test_pack_prompt_keeps_the_template_static_prefix(tmp_path, monkeypatch):
+    model = "fake_pack_prefix_model"
+    prompts = []
+
+    def generator(prompt, inputs, **kwargs):
+        prompts.append(prompt)
+        return LLMResponse(json.dumps({"translations": {"1": "un", "2": "deux"}}), 10.0, 30, 9)
+
+    monkeypatch.setattr(language_oracle, "get_enabled_models", lambda path: [model])
+    monkeypatch.setattr(language_oracle, "get_model_generator", lambda name, models_path: generator)
+
+    data = pd.DataFrame({"id": [1, 2], "english": ["one", "two"]})
+    language_oracle.generate_oracle_translations(
+        data, "translation_service_short", results_dir=tmp_path, models_path=tmp_path / "models.yaml",
+        pack_size=2,
+    )
+
+    (pack_prompt,) = prompts
+    assert pack_prompt.endswith(language_oracle._PACK_INSTRUCTIONS)
+    assert pack_prompt.static_prefix
+    assert pack_prompt.startswith(pack_prompt.static_prefix)
@@ -0,0 +1,74 @@
+"""Phi agenerate over httpx, against a mock transport (no network)."""
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from service_invocations.core import llm_adapters
+
+
+def _answer(text: str) -> httpx.Response:
+    return httpx.Response(200, json={
+        "choices": [{"message": {"content": text}}],
+        "usage": {"prompt_tokens": 7, "completion_tokens": 3},
+    })
+
+
+@pytest.fixture
+def phi(monkeypatch):
+    monkeypatch.setenv("MICROSOFT_PHI_KEY", "k")
+    monkeypatch.setenv("PHI_TARGET_URI", "https://phi.invalid/chat")
+
+    async def _no_sleep(seconds):
+        return None
+
+    monkeypatch.setattr(llm_adapters.asyncio, "sleep", _no_sleep)
+    replies = []
+    requests = []
+
+    def handler(request):
+        requests.append(json.loads(request.content))
+        return replies.pop(0)
+
+    adapter = llm_adapters.MicrosoftPhiAdapter()
+    monkeypatch.setattr(
+        adapter, "_async_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    return adapter, replies, requests
+
+
+def _agenerate(adapter, text="hi"):
+    return adapter.agenerate("phi-test", "Translate.", {"text": text}, ["text"])
+
+
+def test_concurrent_calls_share_one_event_loop(phi):
+    adapter, replies, requests = phi
+    replies.extend(_answer(f'{{"translation": "{n}"}}') for n in range(3))
+
+    async def _all():
+        return await asyncio.gather(*(_agenerate(adapter, str(n)) for n in range(3)))
+
+    responses = asyncio.run(_all())
+    assert len(requests) == 3
+    assert sorted(json.loads(r.content)["translation"] for r in responses) == ["0", "1", "2"]
+    assert all((r.input_tokens, r.output_tokens) == (7, 3) for r in responses)
+
+
+def test_retryable_status_is_retried_like_the_blocking_path(phi):
+    adapter, replies, requests = phi
+    replies.extend([httpx.Response(503), _answer('{"translation": "hallo"}')])
+    response = asyncio.run(_agenerate(adapter))
+    assert json.loads(response.content) == {"translation": "hallo"}
+    assert len(requests) == 2
+
+
+def test_content_filter_rejection_gives_an_empty_response(phi):
+    adapter, replies, requests = phi
+    replies.append(httpx.Response(400, text='{"error": {"code": "content_filter"}}'))
+    response = asyncio.run(_agenerate(adapter))
+    assert response.content == ""
+    assert len(requests) == 1
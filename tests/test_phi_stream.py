@@ -0,0 +1,89 @@
+"""Phi SSE parsing, against a canned event stream (no network)."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from service_invocations.core import llm_adapters
+
+
+class _FakeLines:
+    def __init__(self, lines):
+        self._lines = iter(lines)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._lines)
+
+    def close(self):
+        pass
+
+
+class _FakePool:
+    def __init__(self, streams):
+        self.streams = streams
+
+    def stream(self, body, headers):
+        return _FakeLines(self.streams.pop(0))
+
+
+def _event(payload) -> bytes:
+    return f"data: {json.dumps(payload)}\n".encode("utf-8")
+
+
+def _delta(text: str) -> bytes:
+    return _event({"choices": [{"delta": {"content": text}}]})
+
+
+@pytest.fixture
+def phi(monkeypatch):
+    monkeypatch.setenv("MICROSOFT_PHI_KEY", "k")
+    monkeypatch.setenv("PHI_TARGET_URI", "https://phi.invalid/chat")
+    monkeypatch.setattr(llm_adapters, "_DEFAULT_BASE_DELAY", 0.0)
+    pool = _FakePool([])
+    monkeypatch.setattr(llm_adapters, "_connection_pool_for", lambda uri: pool)
+    return llm_adapters.MicrosoftPhiAdapter(), pool
+
+
+def _generate(adapter):
+    return adapter.generate_stream(
+        "phi-test", "Translate.", {"text": "hi"}, ["text"], stop_keys=["translation"],
+    )
+
+
+def test_non_json_events_are_skipped_and_done_ends_the_stream(phi):
+    adapter, pool = phi
+    pool.streams.append([
+        b": keep-alive\n",
+        b"data: ping\n",
+        _delta('{"translation": '),
+        _delta('"hallo"}'),
+        _event({"choices": [], "usage": {"prompt_tokens": 7, "completion_tokens": 3}}),
+        b"data: [DONE]\n",
+        b"data: not reached\n",
+    ])
+    response = _generate(adapter)
+    assert json.loads(response.content) == {"translation": "hallo"}
+
+
+def test_retryable_error_event_is_retried(phi, monkeypatch):
+    adapter, pool = phi
+    monkeypatch.setattr(llm_adapters.time, "sleep", lambda seconds: None)
+    pool.streams.extend([
+        [_event({"error": {"code": "429", "message": "Too many requests"}})],
+        [_delta('{"translation": "hallo"}'), b"data: [DONE]\n"],
+    ])
+    assert json.loads(_generate(adapter).content) == {"translation": "hallo"}
+    assert pool.streams == []
+
+
+def test_content_filter_error_event_gives_an_empty_response(phi):
+    adapter, pool = phi
+    pool.streams.append([
+        _event({"error": {"code": "content_filter", "message": "filtered"}}),
+    ])
+    response = _generate(adapter)
+    assert response.content == ""
@@ -0,0 +1,57 @@
+"""Token buckets and per-model limiters, on a fake clock."""
+from __future__ import annotations
+
+import pytest
+
+from service_invocations.core import rate_limiter
+from service_invocations.core.llm_adapters import LLMResponse
+from service_invocations.core.rate_limiter import RateLimiter, TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_bucket_admits_a_full_window_then_waits_at_the_refill_rate(clock):
+    bucket = TokenBucket(60)  # one token per second
+    assert [bucket.reserve(1) for _ in range(60)] == [0.0] * 60
+    assert bucket.reserve(1) == pytest.approx(1.0)
+    assert bucket.reserve(1) == pytest.approx(2.0)
+    clock[0] += 2.0
+    assert bucket.available == pytest.approx(0.0)
+
+
+def test_bucket_caps_an_oversized_request_at_one_window(clock):
+    bucket = TokenBucket(60)
+    assert bucket.reserve(10_000) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+
+
+def test_adjust_refunds_and_never_overfills(clock):
+    bucket = TokenBucket(60)
+    bucket.reserve(30)
+    bucket.adjust(-10)
+    assert bucket.available == pytest.approx(40.0)
+    bucket.adjust(-1000)
+    assert bucket.available == pytest.approx(60.0)
+
+
+def test_settle_reconciles_the_token_estimate(clock, monkeypatch):
+    monkeypatch.setattr(rate_limiter, "_HEADROOM", 1.0)
+    limiter = RateLimiter("fake-limited", requests_per_minute=600, tokens_per_minute=6000)
+    assert limiter.acquire(1000) == 0.0
+    limiter.settle(1000, LLMResponse("x", 1.0, 100, 50))
+    assert limiter._tokens.available == pytest.approx(6000 - 150)
+    # A response without usage leaves the estimate standing.
+    limiter.acquire(500)
+    limiter.settle(500, LLMResponse("x", 1.0, None, None))
+    assert limiter._tokens.available == pytest.approx(6000 - 650)
+
+
+def test_estimate_counts_text_and_media():
+    assert rate_limiter.estimate_tokens("a" * 40, {"text": "b" * 40}) == 20
+    assert rate_limiter.estimate_tokens("", {"audio": b"\0" * 5000}) == 5
+    assert rate_limiter.estimate_tokens("", {"image": "face.png"}) == rate_limiter._IMAGE_TOKENS
@@ -0,0 +1,38 @@
+"""Structured-output schemas and their JSON Schema form."""
+from __future__ import annotations
+
+from service_invocations.core.llm_adapters import MicrosoftPhiAdapter
+from service_invocations.core.response_schemas import (
+    judge_schema,
+    oracle_schema,
+    to_json_schema,
+)
+
+
+def test_fer_oracle_schema_requires_every_nullable_score():
+    schema = oracle_schema("emotion", score_keys=["happy", "sad"])
+    scores = schema["properties"]["emotion"]
+    assert schema["required"] == ["emotion"]
+    assert scores["required"] == ["happy", "sad"]
+    assert scores["properties"]["happy"] == {"type": "number", "nullable": True}
+
+
+def test_json_schema_form_spells_nulls_as_types_and_closes_objects():
+    converted = to_json_schema(judge_schema("transcript", ["svc_a"], confidence=True))
+    assert converted["additionalProperties"] is False
+    assert converted["properties"]["winner"] == {"type": ["string", "null"]}
+    assert converted["properties"]["confidence"] == {"type": ["number", "null"]}
+    scores = converted["properties"]["scores"]
+    assert scores["additionalProperties"] is False
+    assert scores["properties"]["svc_a"] == {"type": ["number", "null"]}
+    assert "nullable" not in str(converted)
+
+
+def test_phi_payload_sends_the_schema_as_response_format():
+    schema = oracle_schema("translation")
+    payload = MicrosoftPhiAdapter._payload("phi-test", "Translate.", {}, 0.0, schema)
+    assert payload["response_format"] == {
+        "type": "json_schema",
+        "json_schema": {"name": "response", "schema": to_json_schema(schema)},
+    }
+    assert "response_format" not in MicrosoftPhiAdapter._payload("phi-test", "x", {}, 0.0)
@@ -0,0 +1,136 @@
+"""results_io journal, SQLite backend and the readers built on them."""
+from __future__ import annotations
+
+import pandas as pd
+
+from service_invocations.core import results_io
+from service_invocations.language_translation.language_human_loop import (
+    _load_human_comet_lookup,
+)
+
+
+def _accuracy_rows():
+    return [
+        {"id": "0001", "human_comet": 0.8, "llm_comet": 0.7},
+        {"id": "0002", "human_comet": 0.4, "llm_comet": 0.5},
+    ]
+
+
+def test_human_comet_lookup_reads_sqlite_backend(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_RESULTS_BACKEND", "sqlite")
+    results_io.write_accuracy(tmp_path, "language_translation", "p", "m", [
+        {**row, "service": "deepl"} for row in _accuracy_rows()
+    ])
+
+    assert not (tmp_path / "accuracy.csv").exists()
+    assert _load_human_comet_lookup(tmp_path) == {
+        "0001": {"deepl": 0.8},
+        "0002": {"deepl": 0.4},
+    }
+
+
+def _oracle(task_dir, rows):
+    results_io.write_oracle(task_dir, "language_translation", "p", "m", rows)
+
+
+def test_journal_rows_are_merged_on_read_and_folded_by_compaction(tmp_path, monkeypatch):
+    monkeypatch.delenv("LLM_RESULTS_BACKEND", raising=False)
+    _oracle(tmp_path, [{"id": "0001", "llm_oracle": "a"}, {"id": "0002", "llm_oracle": "b"}])
+    _oracle(tmp_path, [{"id": "0002", "llm_oracle": "b2"}])
+
+    journal = tmp_path / "oracle.journal.jsonl"
+    assert journal.exists()
+    merged = results_io.read_results(tmp_path / "oracle.csv")
+    assert sorted(merged["llm_oracle"]) == ["a", "b2"]
+
+    assert results_io.compact_results(tmp_path, "oracle") == 3
+    assert not journal.exists()
+    on_disk = pd.read_csv(tmp_path / "oracle.csv")
+    assert sorted(on_disk["llm_oracle"]) == ["a", "b2"]
+    assert results_io.load_completed_ids(tmp_path, "oracle", "p", "m") == {"0001", "0002"}
+
+
+def test_sqlite_backend_adopts_existing_csv_and_exports_back(tmp_path, monkeypatch):
+    pd.DataFrame([
+        {"task": "language_translation", "prompt": "p", "model": "m",
+         "id": "0001", "llm_oracle": "from csv"},
+    ]).to_csv(tmp_path / "oracle.csv", index=False)
+    monkeypatch.setenv("LLM_RESULTS_BACKEND", "sqlite")
+
+    _oracle(tmp_path, [{"id": "0002", "llm_oracle": "from sqlite"}])
+
+    assert (tmp_path / "results.sqlite").exists()
+    assert not (tmp_path / "oracle.journal.jsonl").exists()
+    rows = results_io.load_completed_rows(tmp_path, "oracle", "p", "m")
+    assert sorted(rows["llm_oracle"]) == ["from csv", "from sqlite"]
+
+    results_io.compact_results(tmp_path, "oracle")
+    exported = pd.read_csv(tmp_path / "oracle.csv")
+    assert sorted(exported["llm_oracle"]) == ["from csv", "from sqlite"]
+
+
+def test_unchanged_rows_are_not_journaled_again(tmp_path, monkeypatch):
+    monkeypatch.delenv("LLM_RESULTS_BACKEND", raising=False)
+    _oracle(tmp_path, [{"id": "0001", "llm_oracle": "a"}])
+    _oracle(tmp_path, [{"id": "0001", "llm_oracle": "a"}, {"id": "0002", "llm_oracle": "b"}])
+
+    lines = (tmp_path / "oracle.journal.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+
+
+def test_an_interrupted_compaction_is_folded_with_the_live_journal(tmp_path, monkeypatch):
+    monkeypatch.delenv("LLM_RESULTS_BACKEND", raising=False)
+    _oracle(tmp_path, [{"id": "0001", "llm_oracle": "a"}, {"id": "0002", "llm_oracle": "b"}])
+    # A crash mid-compaction leaves the rotated journal behind.
+    journal = tmp_path / "oracle.journal.jsonl"
+    journal.rename(tmp_path / "oracle.journal.compacting.jsonl")
+    _oracle(tmp_path, [{"id": "0002", "llm_oracle": "b2"}])
+
+    assert sorted(results_io.read_results(tmp_path / "oracle.csv")["llm_oracle"]) == ["a", "b2"]
+    assert results_io.compact_results(tmp_path, "oracle") == 3
+    assert not journal.exists()
+    assert not (tmp_path / "oracle.journal.compacting.jsonl").exists()
+    assert sorted(pd.read_csv(tmp_path / "oracle.csv")["llm_oracle"]) == ["a", "b2"]
+
+
+def test_a_long_journal_is_compacted_in_the_background(tmp_path, monkeypatch):
+    monkeypatch.delenv("LLM_RESULTS_BACKEND", raising=False)
+    monkeypatch.setattr(results_io, "_COMPACT_ROWS", 3)
+    _oracle(tmp_path, [{"id": f"000{n}", "llm_oracle": str(n)} for n in range(1, 4)])
+
+    results_io._COMPACTORS[(tmp_path / "oracle.csv").resolve()].join(timeout=5)
+    assert not (tmp_path / "oracle.journal.jsonl").exists()
+    assert len(pd.read_csv(tmp_path / "oracle.csv")) == 3
+
+
+def test_completed_ids_follow_own_writes_without_rereading(tmp_path, monkeypatch):
+    monkeypatch.delenv("LLM_RESULTS_BACKEND", raising=False)
+    _oracle(tmp_path, [{"id": "0001", "llm_oracle": "a"}])
+    assert results_io.load_completed_ids(tmp_path, "oracle", "p", "m") == {"0001"}
+
+    reads = []
+    merged_view = results_io._merged_view
+    monkeypatch.setattr(
+        results_io, "_merged_view", lambda path: reads.append(path) or merged_view(path),
+    )
+    _oracle(tmp_path, [{"id": "0002", "llm_oracle": "b"}])
+    results_io.compact_results(tmp_path, "oracle")
+    assert results_io.load_completed_ids(tmp_path, "oracle", "p", "m") == {"0001", "0002"}
+    assert results_io.completed_count(tmp_path, "oracle", "p", "m") == 2
+
+    results_io.clear_completed_slice(tmp_path, "oracle", "p", ["m"])
+    assert results_io.load_completed_ids(tmp_path, "oracle", "p", "m") == set()
+    assert reads == []
+
+
+def test_completed_ids_reload_after_a_change_made_elsewhere(tmp_path, monkeypatch):
+    monkeypatch.delenv("LLM_RESULTS_BACKEND", raising=False)
+    _oracle(tmp_path, [{"id": "0001", "llm_oracle": "a"}])
+    results_io.compact_results(tmp_path, "oracle")
+    assert results_io.load_completed_ids(tmp_path, "oracle", "p", "m") == {"0001"}
+
+    # Another process appends a row straight to the CSV.
+    csv = tmp_path / "oracle.csv"
+    frame = pd.read_csv(csv)
+    pd.concat([frame, frame.assign(id=2)]).to_csv(csv, index=False)
+    assert results_io.load_completed_ids(tmp_path, "oracle", "p", "m") == {"0001", "0002"}